@@ -0,0 +1,26 @@
+"""job stage
+
+Revision ID: 20261018_0002
+Revises: 20260212_0001
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0002"
+down_revision = "20260212_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    job_stage = sa.Enum("INSTALL", "WAIT_READY", "FINALIZE", name="job_stage")
+    job_stage.create(op.get_bind(), checkfirst=True)
+    op.add_column("provisioning_jobs", sa.Column("stage", job_stage, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("provisioning_jobs", "stage")
+    sa.Enum(name="job_stage").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,23 @@
+"""job stage wait deleted
+
+Revision ID: 20261018_0003
+Revises: 20261018_0002
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261018_0003"
+down_revision = "20261018_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TYPE job_stage ADD VALUE IF NOT EXISTS 'WAIT_DELETED'")
+
+
+def downgrade() -> None:
+    # Postgres cannot drop a value from an enum type; the unused label is harmless.
+    pass
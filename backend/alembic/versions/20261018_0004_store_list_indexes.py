@@ -0,0 +1,35 @@
+"""store list indexes
+
+Revision ID: 20261018_0004
+Revises: 20261018_0003
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0004"
+down_revision = "20261018_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset pagination orders by (created_at, id) descending; each index matches one filter shape of GET /stores.
+    op.create_index("ix_stores_created_id", "stores", ["created_at", "id"])
+    op.create_index(
+        "ix_stores_live_created_id",
+        "stores",
+        ["created_at", "id"],
+        postgresql_where=sa.text("status <> 'DELETED'"),
+    )
+    op.create_index("ix_stores_status_created_id", "stores", ["status", "created_at", "id"])
+    op.create_index("ix_stores_engine_status_created_id", "stores", ["engine", "status", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stores_engine_status_created_id", table_name="stores")
+    op.drop_index("ix_stores_status_created_id", table_name="stores")
+    op.drop_index("ix_stores_live_created_id", table_name="stores")
+    op.drop_index("ix_stores_created_id", table_name="stores")
@@ -0,0 +1,25 @@
+"""store version indexes
+
+Revision ID: 20261018_0005
+Revises: 20261018_0004
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261018_0005"
+down_revision = "20261018_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Back the ETag version lookups: max(stores.updated_at) and max(store_events.id) per store.
+    op.create_index("ix_stores_updated_at", "stores", ["updated_at"])
+    op.create_index("ix_store_events_store_id_id", "store_events", ["store_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_store_events_store_id_id", table_name="store_events")
+    op.drop_index("ix_stores_updated_at", table_name="stores")
@@ -0,0 +1,25 @@
+"""store sync index
+
+Revision ID: 20261018_0006
+Revises: 20261018_0005
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261018_0006"
+down_revision = "20261018_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Delta sync walks (updated_at, id) in order; the composite index also still serves max(updated_at).
+    op.create_index("ix_stores_updated_id", "stores", ["updated_at", "id"])
+    op.drop_index("ix_stores_updated_at", table_name="stores")
+
+
+def downgrade() -> None:
+    op.create_index("ix_stores_updated_at", "stores", ["updated_at"])
+    op.drop_index("ix_stores_updated_id", table_name="stores")
@@ -0,0 +1,77 @@
+"""store status counts
+
+Revision ID: 20261018_0007
+Revises: 20261018_0006
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261018_0007"
+down_revision = "20261018_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "store_status_counts",
+        sa.Column("status", postgresql.ENUM(name="store_status", create_type=False), primary_key=True, nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Block writers while seeding so no transition lands between the snapshot and the triggers.
+    op.execute("LOCK TABLE stores IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        """
+        INSERT INTO store_status_counts (status, count)
+        SELECT s.status, count(stores.id)
+        FROM unnest(enum_range(NULL::store_status)) AS s(status)
+        LEFT JOIN stores ON stores.status = s.status
+        GROUP BY s.status
+        """
+    )
+    # One UPDATE touches both rows of a transition; rows are locked in index order, so opposite
+    # transitions (QUEUED -> PROVISIONING and back) cannot deadlock on the counters.
+    op.execute(
+        """
+        CREATE FUNCTION store_status_counts_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE store_status_counts SET count = count + 1 WHERE status = NEW.status;
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE store_status_counts SET count = count - 1 WHERE status = OLD.status;
+            ELSE
+                UPDATE store_status_counts
+                SET count = count + CASE WHEN status = NEW.status THEN 1 ELSE -1 END
+                WHERE status IN (OLD.status, NEW.status);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER stores_status_counts_insert_delete
+        AFTER INSERT OR DELETE ON stores
+        FOR EACH ROW EXECUTE FUNCTION store_status_counts_apply()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER stores_status_counts_update
+        AFTER UPDATE OF status ON stores
+        FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status)
+        EXECUTE FUNCTION store_status_counts_apply()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS stores_status_counts_update ON stores")
+    op.execute("DROP TRIGGER IF EXISTS stores_status_counts_insert_delete ON stores")
+    op.execute("DROP FUNCTION IF EXISTS store_status_counts_apply()")
+    op.drop_table("store_status_counts")
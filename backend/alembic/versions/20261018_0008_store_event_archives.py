@@ -0,0 +1,38 @@
+"""store event archives
+
+Revision ID: 20261018_0008
+Revises: 20261018_0007
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261018_0008"
+down_revision = "20261018_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "store_event_archives",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("store_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("stores.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("first_event_id", sa.Integer(), nullable=False),
+        sa.Column("last_event_id", sa.Integer(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_store_event_archives_store_first", "store_event_archives", ["store_id", "first_event_id"])
+    # The retention job scans store_events by age.
+    op.create_index("ix_store_events_created_at", "store_events", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_store_events_created_at", table_name="store_events")
+    op.drop_index("ix_store_event_archives_store_first", table_name="store_event_archives")
+    op.drop_table("store_event_archives")
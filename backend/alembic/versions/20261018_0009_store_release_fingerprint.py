@@ -0,0 +1,23 @@
+"""store release fingerprint
+
+Revision ID: 20261018_0009
+Revises: 20261018_0008
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20261018_0009"
+down_revision = "20261018_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("stores", sa.Column("release_fingerprint", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("stores", "release_fingerprint")
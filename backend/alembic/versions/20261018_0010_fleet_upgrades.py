@@ -0,0 +1,72 @@
+"""fleet upgrades
+
+Revision ID: 20261018_0010
+Revises: 20261018_0009
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261018_0010"
+down_revision = "20261018_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TYPE job_action ADD VALUE IF NOT EXISTS 'UPGRADE'")
+
+    fleet_upgrade_status = sa.Enum("RUNNING", "SUCCEEDED", "HALTED", "CANCELLED", name="fleet_upgrade_status")
+    op.create_table(
+        "fleet_upgrades",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("chart_version", sa.String(length=64), nullable=False),
+        sa.Column("values_patch", postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("status", fleet_upgrade_status, nullable=False),
+        sa.Column("wave_size", sa.Integer(), nullable=False),
+        sa.Column("canary_percent", sa.Integer(), nullable=False),
+        sa.Column("max_failure_percent", sa.Integer(), nullable=False),
+        sa.Column("total_stores", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("waves_started", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("halted_reason", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # At most one upgrade rolls at a time; the API relies on this to reject a second one.
+    op.create_index(
+        "ux_fleet_upgrades_running",
+        "fleet_upgrades",
+        ["status"],
+        unique=True,
+        postgresql_where=sa.text("status = 'RUNNING'"),
+    )
+
+    op.add_column(
+        "provisioning_jobs",
+        sa.Column(
+            "fleet_upgrade_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("fleet_upgrades.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+    )
+    # Progress and wave scheduling group an upgrade's jobs by status.
+    op.create_index(
+        "ix_provisioning_jobs_fleet_upgrade_status",
+        "provisioning_jobs",
+        ["fleet_upgrade_id", "status"],
+        postgresql_where=sa.text("fleet_upgrade_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_provisioning_jobs_fleet_upgrade_status", table_name="provisioning_jobs")
+    op.drop_column("provisioning_jobs", "fleet_upgrade_id")
+    op.drop_index("ux_fleet_upgrades_running", table_name="fleet_upgrades")
+    op.drop_table("fleet_upgrades")
+    sa.Enum(name="fleet_upgrade_status").drop(op.get_bind(), checkfirst=True)
+    # Postgres cannot drop a value from an enum type; the unused 'UPGRADE' job_action label is harmless.
@@ -0,0 +1,34 @@
+"""warm pool store statuses
+
+Revision ID: 20261018_0011
+Revises: 20261018_0010
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261018_0011"
+down_revision = "20261018_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A new enum label cannot be used in the transaction that adds it, and the counter rows below need it.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE store_status ADD VALUE IF NOT EXISTS 'WARMING'")
+        op.execute("ALTER TYPE store_status ADD VALUE IF NOT EXISTS 'WARM'")
+    # The status-count trigger only updates existing rows, so every status needs one before it is used.
+    op.execute(
+        """
+        INSERT INTO store_status_counts (status, count)
+        VALUES ('WARMING', 0), ('WARM', 0)
+        ON CONFLICT (status) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Postgres cannot drop a value from an enum type; the unused labels and their zero counters are harmless.
+    pass
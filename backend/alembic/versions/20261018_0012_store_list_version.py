@@ -0,0 +1,51 @@
+"""store list version counter
+
+Revision ID: 20261018_0012
+Revises: 20261018_0011
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0012"
+down_revision = "20261018_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "store_list_version",
+        sa.Column("id", sa.SmallInteger(), primary_key=True, nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.CheckConstraint("id = 1", name="store_list_version_single_row"),
+    )
+    op.execute("INSERT INTO store_list_version (id, version) VALUES (1, 0)")
+    op.execute(
+        """
+        CREATE FUNCTION store_list_version_bump() RETURNS trigger AS $$
+        BEGIN
+            UPDATE store_list_version SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Deferred to commit: the counter row is the last lock a writer takes and is held only while it commits,
+    # so bumps land in commit order and a transaction that started early cannot leave the version unchanged.
+    op.execute(
+        """
+        CREATE CONSTRAINT TRIGGER stores_list_version
+        AFTER INSERT OR UPDATE OR DELETE ON stores
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION store_list_version_bump()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS stores_list_version ON stores")
+    op.execute("DROP FUNCTION IF EXISTS store_list_version_bump()")
+    op.drop_table("store_list_version")
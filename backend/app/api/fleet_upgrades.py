@@ -0,0 +1,110 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import get_async_db
+from app.models.enums import FleetUpgradeStatus, JobStatus
+from app.models.fleet_upgrade import FleetUpgrade
+from app.schemas.fleet_upgrade import CreateFleetUpgradeRequest, FleetUpgradeProgress, FleetUpgradeResponse
+from app.services.chart_cache import read_chart_version
+from app.services.fleet_upgrade import (
+    FleetUpgradeConflict,
+    fleet_upgrade_progress,
+    start_fleet_upgrade,
+    stop_fleet_upgrade,
+)
+
+router = APIRouter(prefix="/fleet-upgrades", tags=["fleet-upgrades"])
+settings = get_settings()
+
+
+async def _to_response(db: AsyncSession, upgrade: FleetUpgrade) -> FleetUpgradeResponse:
+    progress = await db.run_sync(fleet_upgrade_progress, upgrade)
+    return FleetUpgradeResponse(
+        id=str(upgrade.id),
+        chart_version=upgrade.chart_version,
+        values_patch=upgrade.values_patch,
+        status=upgrade.status,
+        wave_size=upgrade.wave_size,
+        canary_percent=upgrade.canary_percent,
+        max_failure_percent=upgrade.max_failure_percent,
+        total_stores=upgrade.total_stores,
+        waves_started=upgrade.waves_started,
+        halted_reason=upgrade.halted_reason,
+        progress=FleetUpgradeProgress(
+            pending=max(upgrade.total_stores - sum(progress.values()), 0),
+            queued=progress[JobStatus.QUEUED],
+            in_progress=progress[JobStatus.IN_PROGRESS],
+            succeeded=progress[JobStatus.SUCCEEDED],
+            failed=progress[JobStatus.FAILED],
+        ),
+        created_at=upgrade.created_at,
+        updated_at=upgrade.updated_at,
+        completed_at=upgrade.completed_at,
+    )
+
+
+async def _get_upgrade(db: AsyncSession, upgrade_id: str) -> FleetUpgrade:
+    try:
+        parsed_id = uuid.UUID(upgrade_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid fleet upgrade id") from exc
+    upgrade = await db.get(FleetUpgrade, parsed_id)
+    if not upgrade:
+        raise HTTPException(status_code=404, detail="Fleet upgrade not found")
+    return upgrade
+
+
+@router.post("", response_model=FleetUpgradeResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_fleet_upgrade(
+    payload: CreateFleetUpgradeRequest, db: AsyncSession = Depends(get_async_db)
+) -> FleetUpgradeResponse:
+    # Workers install the chart baked into their image, so the target must be the version this release ships.
+    shipped_version = read_chart_version(settings.helm_chart_path)
+    if payload.chart_version != shipped_version:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Chart version {payload.chart_version} is not deployed; workers ship {shipped_version}",
+        )
+
+    try:
+        upgrade = await db.run_sync(
+            start_fleet_upgrade,
+            payload.chart_version,
+            payload.values_patch,
+            payload.wave_size,
+            payload.canary_percent,
+            payload.max_failure_percent,
+        )
+        await db.commit()
+    except (FleetUpgradeConflict, IntegrityError) as exc:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A fleet upgrade is already running") from exc
+    await db.refresh(upgrade)
+    return await _to_response(db, upgrade)
+
+
+@router.get("", response_model=list[FleetUpgradeResponse])
+async def list_fleet_upgrades(db: AsyncSession = Depends(get_async_db)) -> list[FleetUpgradeResponse]:
+    upgrades = (await db.scalars(select(FleetUpgrade).order_by(FleetUpgrade.created_at.desc()).limit(20))).all()
+    return [await _to_response(db, upgrade) for upgrade in upgrades]
+
+
+@router.get("/{upgrade_id}", response_model=FleetUpgradeResponse)
+async def get_fleet_upgrade(upgrade_id: str, db: AsyncSession = Depends(get_async_db)) -> FleetUpgradeResponse:
+    return await _to_response(db, await _get_upgrade(db, upgrade_id))
+
+
+@router.post("/{upgrade_id}/cancel", response_model=FleetUpgradeResponse)
+async def cancel_fleet_upgrade(upgrade_id: str, db: AsyncSession = Depends(get_async_db)) -> FleetUpgradeResponse:
+    upgrade = await _get_upgrade(db, upgrade_id)
+    if upgrade.status != FleetUpgradeStatus.RUNNING:
+        raise HTTPException(status_code=409, detail=f"Fleet upgrade is already {upgrade.status.value}")
+    await db.run_sync(stop_fleet_upgrade, upgrade, FleetUpgradeStatus.CANCELLED, "Cancelled by request")
+    await db.commit()
+    await db.refresh(upgrade)
+    return await _to_response(db, upgrade)
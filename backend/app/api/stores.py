@@ -1,37 +1,57 @@
+import asyncio
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from prometheus_client import Counter
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_async_db
+from app.db.session import engine as db_engine
 from app.models.enums import JobAction, JobStatus, StoreEngine, StoreStatus
 from app.models.provisioning_job import ProvisioningJob
 from app.models.store import Store
 from app.models.store_event import StoreEvent
+from app.models.store_event_archive import StoreEventArchive
 from app.schemas.store import (
+    BatchCreateStoresRequest,
+    BatchDeleteStoresRequest,
+    BatchEnqueueResponse,
+    BatchItemResult,
     CreateStoreRequest,
     EnqueueResponse,
     StoreAdminCredentialsResponse,
+    StoreDeltaResponse,
     StoreDetailResponse,
     StoreEventResponse,
+    StoreListResponse,
     StoreResponse,
+    StoreStreamEvent,
 )
+from app.services.capacity import reserve_store_capacity, store_list_version
+from app.services.etag import compute_etag, conditional_response
+from app.services.event_hub import StoreEventHub
 from app.services.events import log_event
-from app.services.kube import KubeService
-from app.services.rate_limit import RateLimiter
-from app.workers.provisioner import count_active_stores
+from app.services.job_notify import notify_jobs_queued
+from app.services.kube import build_kube_service, decode_secret_value
+from app.services.pagination import count_rows, decode_cursor, encode_cursor
+from app.services.rate_limit import build_rate_limiter
+from app.services.secret_cache import SecretCache
+from app.services.warm_pool import WARM_POOL_STATUSES, claim_warm_store
 
 router = APIRouter(prefix="/stores", tags=["stores"])
 settings = get_settings()
-rate_limiter = RateLimiter(settings.rate_limit_create_delete_per_window, settings.rate_limit_window_seconds)
+rate_limiter = build_rate_limiter(settings, db_engine)
 stores_created_total = Counter("stores_created_total", "Total stores queued for creation")
 stores_deleted_total = Counter("stores_deleted_total", "Total stores queued for deletion")
 api_rate_limited_total = Counter("api_rate_limited_total", "Total API requests rejected by rate limiting")
-kube_service = KubeService(settings.kubectl_binary, settings.kubectl_delete_timeout_seconds)
+kube_service = build_kube_service(settings)
+secret_cache = SecretCache(
+    kube_service.get_secret, settings.secret_cache_ttl_seconds, settings.secret_cache_max_entries
+)
 
 
 def _request_identity(request: Request) -> str:
@@ -43,6 +63,15 @@ def _request_identity(request: Request) -> str:
     return "unknown"
 
 
+async def _enforce_rate_limit(request: Request, action: str) -> int:
+    # The shared backend does a blocking database round trip, so keep it off the event loop.
+    allow, remaining = await asyncio.to_thread(rate_limiter.allow, f"{action}:{_request_identity(request)}")
+    if not allow:
+        api_rate_limited_total.inc()
+        raise HTTPException(status_code=429, detail="Rate limit exceeded. Try again later.")
+    return remaining
+
+
 def _to_store_response(store: Store) -> StoreResponse:
     return StoreResponse(
         id=str(store.id),
@@ -58,12 +87,26 @@ def _to_store_response(store: Store) -> StoreResponse:
     )
 
 
+def _to_event_response(event: StoreEvent) -> StoreEventResponse:
+    return StoreEventResponse(id=event.id, event_type=event.event_type, message=event.message, created_at=event.created_at)
+
+
+def _render_stream_event(event: StoreEvent, store: Store) -> str:
+    return StoreStreamEvent(event=_to_event_response(event), store=_to_store_response(store)).model_dump_json()
+
+
+event_hub = StoreEventHub(
+    SessionLocal,
+    _render_stream_event,
+    poll_seconds=settings.store_events_poll_seconds,
+    hidden_statuses=WARM_POOL_STATUSES,
+    gap_seconds=settings.stores_sync_lag_seconds,
+)
+
+
 @router.post("", response_model=EnqueueResponse, status_code=status.HTTP_202_ACCEPTED)
-def create_store(payload: CreateStoreRequest, request: Request, db: Session = Depends(get_db)) -> EnqueueResponse:
-    allow, remaining = rate_limiter.allow(db, f"create:{_request_identity(request)}")
-    if not allow:
-        api_rate_limited_total.inc()
-        raise HTTPException(status_code=429, detail="Rate limit exceeded. Try again later.")
+async def create_store(payload: CreateStoreRequest, request: Request, db: AsyncSession = Depends(get_async_db)) -> EnqueueResponse:
+    remaining = await _enforce_rate_limit(request, "create")
 
     if payload.engine == StoreEngine.MEDUSA:
         raise HTTPException(
@@ -71,9 +114,25 @@ def create_store(payload: CreateStoreRequest, request: Request, db: Session = De
             detail="Medusa is intentionally disabled for Round 1. Please choose WooCommerce.",
         )
 
-    if count_active_stores(db) >= settings.max_active_stores:
+    if await db.run_sync(reserve_store_capacity, 1, settings.max_active_stores) < 1:
         raise HTTPException(status_code=409, detail="Maximum active store limit reached.")
 
+    if settings.warm_pool_size > 0:
+        claimed = await db.run_sync(
+            claim_warm_store, payload.engine, payload.display_name, settings.worker_max_attempts
+        )
+        if claimed is not None:
+            store, relabel_job = claimed
+            await db.run_sync(notify_jobs_queued, settings.worker_notify_channel)
+            await db.commit()
+            stores_created_total.inc()
+            return EnqueueResponse(
+                store_id=str(store.id),
+                status=store.status,
+                namespace=store.namespace,
+                queued_job_id=str(relabel_job.id),
+            )
+
     store_id = uuid.uuid4()
     namespace = f"store-{store_id}"
     release_name = namespace
@@ -87,7 +146,7 @@ def create_store(payload: CreateStoreRequest, request: Request, db: Session = De
         status=StoreStatus.QUEUED,
     )
     db.add(store)
-    db.flush()
+    await db.flush()
 
     job = ProvisioningJob(
         store_id=store.id,
@@ -97,7 +156,8 @@ def create_store(payload: CreateStoreRequest, request: Request, db: Session = De
     )
     db.add(job)
     log_event(db, store.id, "queued", f"Provisioning queued. Rate remaining: {remaining}")
-    db.commit()
+    await db.run_sync(notify_jobs_queued, settings.worker_notify_channel)
+    await db.commit()
     stores_created_total.inc()
 
     return EnqueueResponse(
@@ -108,36 +168,336 @@ def create_store(payload: CreateStoreRequest, request: Request, db: Session = De
     )
 
 
-@router.get("", response_model=list[StoreResponse])
-def list_stores(db: Session = Depends(get_db)) -> list[StoreResponse]:
-    stores = db.scalars(select(Store).order_by(Store.created_at.desc())).all()
-    return [_to_store_response(s) for s in stores]
+async def _sync_watermark(db: AsyncSession) -> tuple[datetime, uuid.UUID]:
+    # updated_at is stamped at transaction start, so a row can commit with a timestamp older than rows
+    # already visible. Sync cursors trail the database clock by STORES_SYNC_LAG_SECONDS to cover that.
+    now = await db.scalar(select(func.now()))
+    return now - timedelta(seconds=settings.stores_sync_lag_seconds), uuid.UUID(int=0)
+
+
+async def _list_store_changes(
+    db: AsyncSession, since: str, engine: StoreEngine | None, limit: int
+) -> StoreDeltaResponse:
+    try:
+        keyset = decode_cursor(since)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid since cursor") from exc
+
+    # DELETED rows are included: they are the tombstones that tell clients to drop a store. Pool stores are not;
+    # a claimed store first shows up as READY.
+    stmt = select(Store).where(tuple_(Store.updated_at, Store.id) > keyset, Store.status.notin_(WARM_POOL_STATUSES))
+    if engine:
+        stmt = stmt.where(Store.engine == engine)
+    stores = (await db.scalars(stmt.order_by(Store.updated_at, Store.id).limit(limit + 1))).all()
+    page = stores[:limit]
+    has_more = len(stores) > limit
+    next_key = (page[-1].updated_at, page[-1].id) if page else keyset
+    if not has_more:
+        # Pulling back to the watermark re-sends the last few seconds of changes on the next sync instead of
+        # risking a miss; clients apply items as idempotent upserts.
+        next_key = min(next_key, await _sync_watermark(db))
+    return StoreDeltaResponse(
+        items=[_to_store_response(s) for s in page],
+        next_sync_cursor=encode_cursor(*next_key),
+        has_more=has_more,
+    )
+
+
+@router.post(":batch", response_model=BatchEnqueueResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_stores_batch(
+    payload: BatchCreateStoresRequest, request: Request, db: AsyncSession = Depends(get_async_db)
+) -> BatchEnqueueResponse:
+    # A batch is one request to the limiter. Charging per item made any batch larger than the window (15 by
+    # default) fail with 429 forever; MAX_ACTIVE_STORES still bounds how many stores it can create.
+    remaining = await _enforce_rate_limit(request, "create")
+
+    results = [BatchItemResult(index=index) for index in range(len(payload.stores))]
+    candidates = []
+    for index, item in enumerate(payload.stores):
+        if item.engine == StoreEngine.MEDUSA:
+            results[index].error = "Medusa is intentionally disabled for Round 1. Please choose WooCommerce."
+        else:
+            candidates.append(index)
+
+    admitted = candidates[: await db.run_sync(reserve_store_capacity, len(candidates), settings.max_active_stores)]
+    for index in candidates[len(admitted) :]:
+        results[index].error = "Maximum active store limit reached."
+
+    store_rows, job_rows, event_rows = [], [], []
+    for index in admitted:
+        store_id = uuid.uuid4()
+        job_id = uuid.uuid4()
+        namespace = f"store-{store_id}"
+        store_rows.append(
+            {
+                "id": store_id,
+                "engine": payload.stores[index].engine,
+                "display_name": payload.stores[index].display_name,
+                "namespace": namespace,
+                "release_name": namespace,
+                "status": StoreStatus.QUEUED,
+            }
+        )
+        job_rows.append(
+            {
+                "id": job_id,
+                "store_id": store_id,
+                "action": JobAction.PROVISION,
+                "status": JobStatus.QUEUED,
+                "max_attempts": settings.worker_max_attempts,
+            }
+        )
+        event_rows.append(
+            {"store_id": store_id, "event_type": "queued", "message": f"Provisioning queued in batch. Rate remaining: {remaining}"}
+        )
+        results[index] = BatchItemResult(
+            index=index, store_id=str(store_id), status=StoreStatus.QUEUED, namespace=namespace, queued_job_id=str(job_id)
+        )
+
+    if admitted:
+        # Executemany inserts are batched into multi-row INSERT statements by the driver dialect.
+        await db.execute(insert(Store), store_rows)
+        await db.execute(insert(ProvisioningJob), job_rows)
+        await db.execute(insert(StoreEvent), event_rows)
+        await db.run_sync(notify_jobs_queued, settings.worker_notify_channel)
+    await db.commit()
+    stores_created_total.inc(len(admitted))
+    return BatchEnqueueResponse(accepted=len(admitted), rejected=len(results) - len(admitted), results=results)
+
+
+@router.delete(":batch", response_model=BatchEnqueueResponse, status_code=status.HTTP_202_ACCEPTED)
+async def delete_stores_batch(
+    payload: BatchDeleteStoresRequest, request: Request, db: AsyncSession = Depends(get_async_db)
+) -> BatchEnqueueResponse:
+    await _enforce_rate_limit(request, "delete")
+
+    results = [BatchItemResult(index=index) for index in range(len(payload.store_ids))]
+    parsed: dict[int, uuid.UUID] = {}
+    for index, raw_id in enumerate(payload.store_ids):
+        try:
+            parsed[index] = uuid.UUID(raw_id)
+        except ValueError:
+            results[index].error = "Invalid store id"
+
+    stores = {store.id: store for store in await db.scalars(select(Store).where(Store.id.in_(set(parsed.values()))))}
+    already_deleting = {
+        store.id for store in stores.values() if store.status in {StoreStatus.DELETING, StoreStatus.DELETED}
+    }
+    existing_jobs: dict[uuid.UUID, uuid.UUID] = {}
+    if already_deleting:
+        for job_store_id, job_id in await db.execute(
+            select(ProvisioningJob.store_id, ProvisioningJob.id)
+            .where(ProvisioningJob.store_id.in_(already_deleting), ProvisioningJob.action == JobAction.DELETE)
+            .order_by(ProvisioningJob.created_at)
+        ):
+            existing_jobs[job_store_id] = job_id
+
+    to_delete: dict[uuid.UUID, uuid.UUID] = {}
+    for index, store_id in parsed.items():
+        store = stores.get(store_id)
+        if store is None:
+            results[index].error = "Store not found"
+            continue
+        job_id = existing_jobs.get(store_id) or to_delete.get(store_id)
+        if job_id is None:
+            job_id = to_delete[store_id] = uuid.uuid4()
+        results[index] = BatchItemResult(
+            index=index,
+            store_id=str(store_id),
+            status=StoreStatus.DELETING,
+            namespace=store.namespace,
+            queued_job_id=str(job_id),
+        )
+
+    if to_delete:
+        store_ids = list(to_delete)
+        await db.execute(
+            update(Store).where(Store.id.in_(store_ids)).values(status=StoreStatus.DELETING),
+            execution_options={"synchronize_session": False},
+        )
+        # Cancel queued provision retries once teardown is requested to avoid stale queue work.
+        await db.execute(
+            update(ProvisioningJob)
+            .where(
+                ProvisioningJob.store_id.in_(store_ids),
+                ProvisioningJob.action == JobAction.PROVISION,
+                ProvisioningJob.status == JobStatus.QUEUED,
+            )
+            .values(
+                status=JobStatus.FAILED,
+                error_message="provision_cancelled_delete_requested",
+                completed_at=datetime.now(timezone.utc),
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        await db.execute(
+            insert(ProvisioningJob),
+            [
+                {
+                    "id": job_id,
+                    "store_id": store_id,
+                    "action": JobAction.DELETE,
+                    "status": JobStatus.QUEUED,
+                    "max_attempts": settings.worker_max_attempts,
+                }
+                for store_id, job_id in to_delete.items()
+            ],
+        )
+        await db.execute(
+            insert(StoreEvent),
+            [{"store_id": store_id, "event_type": "delete_queued", "message": "Teardown queued in batch"} for store_id in store_ids],
+        )
+        await db.run_sync(notify_jobs_queued, settings.worker_notify_channel)
+    await db.commit()
+    for store_id in to_delete:
+        secret_cache.invalidate_namespace(stores[store_id].namespace)
+    stores_deleted_total.inc(len(to_delete))
+    accepted = sum(1 for result in results if result.error is None)
+    return BatchEnqueueResponse(accepted=accepted, rejected=len(results) - accepted, results=results)
+
+
+@router.get("", response_model=StoreListResponse | StoreDeltaResponse)
+async def list_stores(
+    request: Request,
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    since: str | None = None,
+    status_filter: list[StoreStatus] | None = Query(default=None, alias="status"),
+    engine: StoreEngine | None = None,
+    include_deleted: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+) -> StoreListResponse | StoreDeltaResponse | Response:
+    keyset = None
+    if cursor:
+        try:
+            keyset = decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+    version = await db.run_sync(store_list_version)
+    not_modified = conditional_response(request, response, compute_etag(request.url.query, *version))
+    if not_modified:
+        return not_modified
+    if since:
+        return await _list_store_changes(db, since, engine, limit)
+
+    stmt = select(Store)
+    # DELETED stores are tombstones and warm pool stores are unassigned; both are only listed when asked for.
+    if status_filter:
+        stmt = stmt.where(Store.status.in_(status_filter))
+    elif not include_deleted:
+        stmt = stmt.where(Store.status.notin_([StoreStatus.DELETED, *WARM_POOL_STATUSES]))
+    else:
+        stmt = stmt.where(Store.status.notin_(WARM_POOL_STATUSES))
+    if engine:
+        stmt = stmt.where(Store.engine == engine)
+    total, total_is_estimate = await db.run_sync(count_rows, stmt, settings.stores_exact_count_threshold)
+
+    if keyset:
+        stmt = stmt.where(tuple_(Store.created_at, Store.id) < keyset)
+
+    stores = (await db.scalars(stmt.order_by(Store.created_at.desc(), Store.id.desc()).limit(limit + 1))).all()
+    page = stores[:limit]
+    next_cursor = encode_cursor(page[-1].created_at, page[-1].id) if len(stores) > limit else None
+    return StoreListResponse(
+        items=[_to_store_response(s) for s in page],
+        next_cursor=next_cursor,
+        total=total,
+        total_is_estimate=total_is_estimate,
+        sync_cursor=encode_cursor(*await _sync_watermark(db)),
+    )
+
+
+@router.get("/events")
+async def stream_store_events(last_event_id: str | None = Header(default=None)) -> StreamingResponse:
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID") from exc
+
+    async def stream():
+        yield "retry: 3000\n\n"
+        async for message in event_hub.subscribe(resume_from, settings.store_events_heartbeat_seconds):
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            event_id, data = message
+            yield f"id: {event_id}\nevent: store\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{store_id}", response_model=StoreDetailResponse)
-def get_store(store_id: str, db: Session = Depends(get_db)) -> StoreDetailResponse:
+async def get_store(
+    store_id: str, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+) -> StoreDetailResponse | Response:
     try:
         parsed_id = uuid.UUID(store_id)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail="Invalid store id") from exc
 
-    store = db.get(Store, parsed_id)
+    version = (
+        await db.execute(
+            select(
+                Store.updated_at,
+                select(func.max(StoreEvent.id)).where(StoreEvent.store_id == parsed_id).scalar_subquery(),
+            ).where(Store.id == parsed_id)
+        )
+    ).one_or_none()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Store not found")
+    not_modified = conditional_response(request, response, compute_etag(parsed_id, *version))
+    if not_modified:
+        return not_modified
+
+    store = await db.get(Store, parsed_id)
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
 
-    events = db.scalars(
-        select(StoreEvent).where(StoreEvent.store_id == store.id).order_by(StoreEvent.created_at.desc()).limit(50)
+    events = (
+        await db.scalars(
+            select(StoreEvent).where(StoreEvent.store_id == store.id).order_by(StoreEvent.created_at.desc()).limit(50)
+        )
     ).all()
 
     base = _to_store_response(store)
     return StoreDetailResponse(
         **base.model_dump(),
-        events=[StoreEventResponse(id=e.id, event_type=e.event_type, message=e.message, created_at=e.created_at) for e in events],
+        events=[_to_event_response(e) for e in events],
+    )
+
+
+@router.get("/{store_id}/events/archive")
+async def export_archived_store_events(store_id: str, db: AsyncSession = Depends(get_async_db)) -> Response:
+    try:
+        parsed_id = uuid.UUID(store_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid store id") from exc
+    if await db.get(Store, parsed_id) is None:
+        raise HTTPException(status_code=404, detail="Store not found")
+
+    payloads = (
+        await db.scalars(
+            select(StoreEventArchive.payload)
+            .where(StoreEventArchive.store_id == parsed_id)
+            .order_by(StoreEventArchive.first_event_id)
+        )
+    ).all()
+    # Each archive row is a complete gzip member; concatenated they form one valid .ndjson.gz file.
+    return Response(
+        content=b"".join(payloads),
+        media_type="application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="store-{parsed_id}-events.ndjson.gz"'},
     )
 
 
 @router.get("/{store_id}/admin-credentials", response_model=StoreAdminCredentialsResponse)
-def get_store_admin_credentials(store_id: str, db: Session = Depends(get_db)) -> StoreAdminCredentialsResponse:
+async def get_store_admin_credentials(store_id: str, db: AsyncSession = Depends(get_async_db)) -> StoreAdminCredentialsResponse:
     if settings.environment.lower() not in {"local", "dev", "development"}:
         raise HTTPException(status_code=403, detail="Admin credentials endpoint is disabled outside local/dev environments.")
 
@@ -146,7 +506,7 @@ def get_store_admin_credentials(store_id: str, db: Session = Depends(get_db)) ->
     except ValueError as exc:
         raise HTTPException(status_code=400, detail="Invalid store id") from exc
 
-    store = db.get(Store, parsed_id)
+    store = await db.get(Store, parsed_id)
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
 
@@ -154,7 +514,8 @@ def get_store_admin_credentials(store_id: str, db: Session = Depends(get_db)) ->
         raise HTTPException(status_code=409, detail="Store credentials are not available yet.")
 
     try:
-        password = kube_service.read_secret_value(store.namespace, store.release_name, "wordpress-password")
+        secret = await secret_cache.get(store.namespace, store.release_name)
+        password = decode_secret_value(secret, store.release_name, "wordpress-password")
     except RuntimeError as exc:
         raise HTTPException(status_code=503, detail=f"Could not read store credentials: {exc}") from exc
 
@@ -168,23 +529,20 @@ def get_store_admin_credentials(store_id: str, db: Session = Depends(get_db)) ->
 
 
 @router.delete("/{store_id}", response_model=EnqueueResponse, status_code=status.HTTP_202_ACCEPTED)
-def delete_store(store_id: str, request: Request, db: Session = Depends(get_db)) -> EnqueueResponse:
-    allow, _ = rate_limiter.allow(db, f"delete:{_request_identity(request)}")
-    if not allow:
-        api_rate_limited_total.inc()
-        raise HTTPException(status_code=429, detail="Rate limit exceeded. Try again later.")
+async def delete_store(store_id: str, request: Request, db: AsyncSession = Depends(get_async_db)) -> EnqueueResponse:
+    await _enforce_rate_limit(request, "delete")
 
     try:
         parsed_id = uuid.UUID(store_id)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail="Invalid store id") from exc
 
-    store = db.get(Store, parsed_id)
+    store = await db.get(Store, parsed_id)
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
 
     if store.status in {StoreStatus.DELETING, StoreStatus.DELETED}:
-        existing = db.scalar(
+        existing = await db.scalar(
             select(ProvisioningJob)
             .where(ProvisioningJob.store_id == store.id, ProvisioningJob.action == JobAction.DELETE)
             .order_by(ProvisioningJob.created_at.desc())
@@ -202,11 +560,13 @@ def delete_store(store_id: str, request: Request, db: Session = Depends(get_db))
     db.add(store)
 
     # Cancel queued provision retries once teardown is requested to avoid stale queue work.
-    queued_provisions = db.scalars(
-        select(ProvisioningJob).where(
-            ProvisioningJob.store_id == store.id,
-            ProvisioningJob.action == JobAction.PROVISION,
-            ProvisioningJob.status == JobStatus.QUEUED,
+    queued_provisions = (
+        await db.scalars(
+            select(ProvisioningJob).where(
+                ProvisioningJob.store_id == store.id,
+                ProvisioningJob.action == JobAction.PROVISION,
+                ProvisioningJob.status == JobStatus.QUEUED,
+            )
         )
     ).all()
     for queued in queued_provisions:
@@ -222,7 +582,9 @@ def delete_store(store_id: str, request: Request, db: Session = Depends(get_db))
     )
     db.add(job)
     log_event(db, store.id, "delete_queued", "Teardown queued")
-    db.commit()
+    await db.run_sync(notify_jobs_queued, settings.worker_notify_channel)
+    await db.commit()
+    secret_cache.invalidate_namespace(store.namespace)
     stores_deleted_total.inc()
 
     return EnqueueResponse(
@@ -1,13 +1,59 @@
-from sqlalchemy import create_engine
+from prometheus_client import Gauge
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+db_pool_connections = Gauge(
+    "db_pool_connections", "Database pool connections by engine and state", ["engine", "state"]
+)
+
+
+def async_database_url(database_url: str) -> str:
+    # psycopg 3 serves both engines from the same URL; SQLite needs its asyncio driver.
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+
+def pool_options(settings: Settings) -> dict:
+    if make_url(settings.database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+    }
+
+
+def instrument_pool(engine: Engine, name: str) -> None:
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+    # Read at scrape time, so the values cost nothing on the request path.
+    db_pool_connections.labels(engine=name, state="checked_out").set_function(pool.checkedout)
+    db_pool_connections.labels(engine=name, state="idle").set_function(pool.checkedin)
+    db_pool_connections.labels(engine=name, state="overflow").set_function(lambda: max(pool.overflow(), 0))
+    db_pool_connections.labels(engine=name, state="size").set_function(pool.size)
+
+
+engine = create_engine(settings.database_url, pool_pre_ping=True, **pool_options(settings))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
+async_engine = create_async_engine(
+    async_database_url(settings.database_url), pool_pre_ping=True, **pool_options(settings)
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+instrument_pool(engine, "sync")
+instrument_pool(async_engine.sync_engine, "async")
+
 
 def get_db():
     db = SessionLocal()
@@ -15,3 +61,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,6 @@
+from datetime import datetime, timezone
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive timestamps; they are stored in UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
@@ -1,15 +1,23 @@
 import asyncio
+import logging
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from sqlalchemy.exc import SQLAlchemyError
 
+from app.api.fleet_upgrades import router as fleet_upgrades_router
+from app.api.stores import event_hub
 from app.api.stores import router as stores_router
 from app.core.config import get_settings
+from app.db.session import SessionLocal
 from app.schemas.health import HealthResponse
+from app.services.capacity import refresh_store_status_gauge
+from app.services.job_queue import refresh_job_queue_gauge
 from app.workers.provisioner import ProvisioningWorker
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 app = FastAPI(title="Store Provisioning Control Plane", version="0.1.0")
 
@@ -19,9 +27,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 app.include_router(stores_router)
+app.include_router(fleet_upgrades_router)
 
 worker: ProvisioningWorker | None = None
 worker_task: asyncio.Task | None = None
@@ -30,14 +40,18 @@ worker_task: asyncio.Task | None = None
 @app.on_event("startup")
 async def startup_event() -> None:
     global worker, worker_task
+    # With WORKER_EMBEDDED=false this process only serves the API; jobs run in `python -m app.workers`.
+    if not settings.worker_embedded:
+        return
     worker = ProvisioningWorker(settings)
     worker_task = asyncio.create_task(worker.start())
 
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
+    await event_hub.stop()
     if worker:
-        worker.stop()
+        await worker.drain(settings.worker_drain_timeout_seconds)
     if worker_task:
         worker_task.cancel()
 
@@ -49,4 +63,11 @@ def healthz() -> HealthResponse:
 
 @app.get("/metrics")
 def metrics() -> Response:
+    try:
+        with SessionLocal() as db:
+            refresh_store_status_gauge(db)
+            refresh_job_queue_gauge(db)
+    except SQLAlchemyError:
+        # Serve the remaining metrics even when the database is unreachable.
+        logger.exception("Could not refresh store and job counts")
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,7 +1,21 @@
 from app.models.base import Base
+from app.models.fleet_upgrade import FleetUpgrade
 from app.models.provisioning_job import ProvisioningJob
 from app.models.rate_limit_bucket import RateLimitBucket
 from app.models.store import Store
 from app.models.store_event import StoreEvent
+from app.models.store_event_archive import StoreEventArchive
+from app.models.store_list_version import StoreListVersion
+from app.models.store_status_count import StoreStatusCount
 
-__all__ = ["Base", "ProvisioningJob", "RateLimitBucket", "Store", "StoreEvent"]
+__all__ = [
+    "Base",
+    "FleetUpgrade",
+    "ProvisioningJob",
+    "RateLimitBucket",
+    "Store",
+    "StoreEvent",
+    "StoreEventArchive",
+    "StoreListVersion",
+    "StoreStatusCount",
+]
@@ -13,11 +13,14 @@ class StoreStatus(str, enum.Enum):
     FAILED = "FAILED"
     DELETING = "DELETING"
     DELETED = "DELETED"
+    WARMING = "WARMING"
+    WARM = "WARM"
 
 
 class JobAction(str, enum.Enum):
     PROVISION = "PROVISION"
     DELETE = "DELETE"
+    UPGRADE = "UPGRADE"
 
 
 class JobStatus(str, enum.Enum):
@@ -25,3 +28,17 @@ class JobStatus(str, enum.Enum):
     IN_PROGRESS = "IN_PROGRESS"
     SUCCEEDED = "SUCCEEDED"
     FAILED = "FAILED"
+
+
+class JobStage(str, enum.Enum):
+    INSTALL = "INSTALL"
+    WAIT_READY = "WAIT_READY"
+    WAIT_DELETED = "WAIT_DELETED"
+    FINALIZE = "FINALIZE"
+
+
+class FleetUpgradeStatus(str, enum.Enum):
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    HALTED = "HALTED"
+    CANCELLED = "CANCELLED"
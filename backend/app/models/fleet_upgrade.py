@@ -0,0 +1,35 @@
+from datetime import datetime
+import uuid
+
+from sqlalchemy import JSON, DateTime, Enum, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.models.enums import FleetUpgradeStatus
+
+
+class FleetUpgrade(Base):
+    # A rolling upgrade of every READY store to chart_version. Its per-store work is the UPGRADE jobs in
+    # provisioning_jobs that point back here; this row holds the plan and the outcome.
+    __tablename__ = "fleet_upgrades"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    chart_version: Mapped[str] = mapped_column(String(64), nullable=False)
+    values_patch: Mapped[dict] = mapped_column(JSON().with_variant(JSONB, "postgresql"), nullable=False, default=dict)
+    status: Mapped[FleetUpgradeStatus] = mapped_column(
+        Enum(FleetUpgradeStatus, name="fleet_upgrade_status"), nullable=False, default=FleetUpgradeStatus.RUNNING
+    )
+
+    wave_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    canary_percent: Mapped[int] = mapped_column(Integer, nullable=False)
+    max_failure_percent: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_stores: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    waves_started: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    halted_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
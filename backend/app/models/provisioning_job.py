@@ -6,7 +6,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
-from app.models.enums import JobAction, JobStatus
+from app.models.enums import JobAction, JobStage, JobStatus
 
 
 class ProvisioningJob(Base):
@@ -14,9 +14,14 @@ class ProvisioningJob(Base):
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     store_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("stores.id", ondelete="CASCADE"), nullable=False)
+    # Set on UPGRADE jobs enqueued by a fleet upgrade wave.
+    fleet_upgrade_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("fleet_upgrades.id", ondelete="CASCADE"), nullable=True
+    )
 
     action: Mapped[JobAction] = mapped_column(Enum(JobAction, name="job_action"), nullable=False)
     status: Mapped[JobStatus] = mapped_column(Enum(JobStatus, name="job_status"), nullable=False, default=JobStatus.QUEUED)
+    stage: Mapped[JobStage | None] = mapped_column(Enum(JobStage, name="job_stage"), nullable=True)
 
     attempt: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
@@ -22,6 +22,8 @@ class Store(Base):
     status: Mapped[StoreStatus] = mapped_column(Enum(StoreStatus, name="store_status"), nullable=False)
     url: Mapped[str | None] = mapped_column(String(255), nullable=True)
     last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # sha256 of the rendered Helm values and chart digest of the last successful install.
+    release_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
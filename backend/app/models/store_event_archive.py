@@ -0,0 +1,21 @@
+from datetime import datetime
+import uuid
+
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class StoreEventArchive(Base):
+    # One gzip member of NDJSON store events moved out of store_events by the retention job.
+    __tablename__ = "store_event_archives"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    store_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("stores.id", ondelete="CASCADE"), nullable=False)
+    first_event_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_event_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,12 @@
+from sqlalchemy import BigInteger, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class StoreListVersion(Base):
+    # A single row bumped by the stores_list_version trigger (migration 20261018_0012); never written by the app.
+    __tablename__ = "store_list_version"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,13 @@
+from sqlalchemy import Enum, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.models.enums import StoreStatus
+
+
+class StoreStatusCount(Base):
+    # Maintained by the stores_status_counts triggers (migration 20261018_0007); never written by the app.
+    __tablename__ = "store_status_counts"
+
+    status: Mapped[StoreStatus] = mapped_column(Enum(StoreStatus, name="store_status"), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
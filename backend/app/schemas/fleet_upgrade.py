@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.models.enums import FleetUpgradeStatus
+
+
+class CreateFleetUpgradeRequest(BaseModel):
+    chart_version: str = Field(min_length=1, max_length=64)
+    values_patch: dict = Field(default_factory=dict)
+    wave_size: int = Field(default=10, ge=1, le=500)
+    canary_percent: int = Field(default=5, ge=0, le=100)
+    max_failure_percent: int = Field(default=10, ge=0, le=100)
+
+    @field_validator("values_patch")
+    @classmethod
+    def keep_store_identity(cls, patch: dict) -> dict:
+        # Namespace, host and release name are derived from the store id; a patch must not move them.
+        if "store" in patch or "fullnameOverride" in (patch.get("wordpress") or {}):
+            raise ValueError("values_patch cannot override store identity (store.*, wordpress.fullnameOverride)")
+        return patch
+
+
+class FleetUpgradeProgress(BaseModel):
+    pending: int
+    queued: int
+    in_progress: int
+    succeeded: int
+    failed: int
+
+
+class FleetUpgradeResponse(BaseModel):
+    id: str
+    chart_version: str
+    values_patch: dict
+    status: FleetUpgradeStatus
+    wave_size: int
+    canary_percent: int
+    max_failure_percent: int
+    total_stores: int
+    waves_started: int
+    halted_reason: str | None
+    progress: FleetUpgradeProgress
+    created_at: datetime
+    updated_at: datetime
+    completed_at: datetime | None
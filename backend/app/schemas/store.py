@@ -22,6 +22,20 @@ class StoreResponse(BaseModel):
     updated_at: datetime
 
 
+class StoreListResponse(BaseModel):
+    items: list[StoreResponse]
+    next_cursor: str | None
+    total: int
+    total_is_estimate: bool
+    sync_cursor: str
+
+
+class StoreDeltaResponse(BaseModel):
+    items: list[StoreResponse]
+    next_sync_cursor: str
+    has_more: bool
+
+
 class StoreEventResponse(BaseModel):
     id: int
     event_type: str
@@ -29,6 +43,11 @@ class StoreEventResponse(BaseModel):
     created_at: datetime
 
 
+class StoreStreamEvent(BaseModel):
+    event: StoreEventResponse
+    store: StoreResponse
+
+
 class StoreDetailResponse(StoreResponse):
     events: list[StoreEventResponse]
 
@@ -40,6 +59,29 @@ class EnqueueResponse(BaseModel):
     queued_job_id: str
 
 
+class BatchCreateStoresRequest(BaseModel):
+    stores: list[CreateStoreRequest] = Field(min_length=1, max_length=500)
+
+
+class BatchDeleteStoresRequest(BaseModel):
+    store_ids: list[str] = Field(min_length=1, max_length=500)
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    store_id: str | None = None
+    status: StoreStatus | None = None
+    namespace: str | None = None
+    queued_job_id: str | None = None
+    error: str | None = None
+
+
+class BatchEnqueueResponse(BaseModel):
+    accepted: int
+    rejected: int
+    results: list[BatchItemResult]
+
+
 class StoreAdminCredentialsResponse(BaseModel):
     store_id: str
     username: str
@@ -0,0 +1,54 @@
+from prometheus_client import Gauge
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.enums import StoreStatus
+from app.models.store import Store
+from app.models.store_event import StoreEvent
+from app.models.store_list_version import StoreListVersion
+from app.models.store_status_count import StoreStatusCount
+from app.services.locks import STORE_CAPACITY_LOCK_KEY, xact_lock
+
+ACTIVE_STORE_STATUSES = [StoreStatus.QUEUED, StoreStatus.PROVISIONING, StoreStatus.READY, StoreStatus.DELETING]
+
+stores_by_status = Gauge("stores_by_status", "Stores currently in each lifecycle status", ["status"])
+
+
+def store_status_counts(db: Session) -> dict[StoreStatus, int]:
+    # On Postgres the counts come from the trigger-maintained store_status_counts table: one row per status
+    # instead of a scan of stores. Other databases (tests) have no triggers and fall back to GROUP BY.
+    if db.get_bind().dialect.name == "postgresql":
+        rows = db.execute(select(StoreStatusCount.status, StoreStatusCount.count)).all()
+    else:
+        rows = db.execute(select(Store.status, func.count(Store.id)).group_by(Store.status)).all()
+    counts = dict.fromkeys(StoreStatus, 0)
+    counts.update({status: count for status, count in rows})
+    return counts
+
+
+def store_list_version(db: Session) -> tuple:
+    # Changes whenever a write to stores commits. On Postgres a trigger bumps a counter at commit time, in commit
+    # order. Other databases (tests) fall back to the newest updated_at and event id, which a transaction that
+    # commits after a newer one can leave unchanged.
+    if db.get_bind().dialect.name == "postgresql":
+        return (db.scalar(select(StoreListVersion.version)),)
+    latest_event_id = select(func.max(StoreEvent.id)).scalar_subquery()
+    return tuple(db.execute(select(func.max(Store.updated_at), latest_event_id)).one())
+
+
+def count_active_stores(db: Session) -> int:
+    counts = store_status_counts(db)
+    return sum(counts[status] for status in ACTIVE_STORE_STATUSES)
+
+
+def reserve_store_capacity(db: Session, requested: int, max_active: int) -> int:
+    # Returns how many of `requested` new stores fit under max_active. On Postgres the count runs under a
+    # transaction-scoped advisory lock, so concurrent creates on any replica cannot both take the last slots;
+    # the caller must insert its stores and commit in the same transaction.
+    xact_lock(db, STORE_CAPACITY_LOCK_KEY)
+    return max(0, min(requested, max_active - count_active_stores(db)))
+
+
+def refresh_store_status_gauge(db: Session) -> None:
+    for status, count in store_status_counts(db).items():
+        stores_by_status.labels(status=status.value).set(count)
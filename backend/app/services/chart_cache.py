@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+from prometheus_client import Histogram
+
+from app.services.helm import HelmService
+
+logger = logging.getLogger(__name__)
+
+chart_load_duration_seconds = Histogram(
+    "chart_load_duration_seconds",
+    "Time to make the packaged store chart available (source=cache when a verified artifact was reused)",
+    ["source"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+
+def read_chart_version(chart_dir: str | Path) -> str:
+    # Chart.yaml's top-level version key, read without a YAML dependency.
+    match = re.search(r"^version:\s*[\"']?([^\"'\s]+)", (Path(chart_dir) / "Chart.yaml").read_text(), re.MULTILINE)
+    if not match:
+        raise RuntimeError(f"No version in {chart_dir}/Chart.yaml")
+    return match.group(1)
+
+
+def chart_content_hash(chart_dir: Path) -> str:
+    # Covers every file that shapes the release, including Chart.lock, so a dependency bump is a new artifact.
+    digest = hashlib.sha256()
+    for path in sorted(p for p in chart_dir.rglob("*") if p.is_file()):
+        digest.update(str(path.relative_to(chart_dir)).encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def verify_chart_archive(artifact: Path, dependencies: list[str]) -> None:
+    # Reads the whole archive, so a truncated or corrupt file fails here rather than in the middle of an install.
+    try:
+        with tarfile.open(artifact, "r:gz") as archive:
+            names = set()
+            for member in archive:
+                names.add(member.name)
+                if member.isfile():
+                    archive.extractfile(member).read()
+    except (OSError, tarfile.TarError) as exc:
+        raise RuntimeError(f"Chart artifact {artifact} is unreadable: {exc}") from exc
+
+    roots = {name.split("/", 1)[0] for name in names}
+    if len(roots) != 1 or f"{next(iter(roots))}/Chart.yaml" not in names:
+        raise RuntimeError(f"Chart artifact {artifact} has no single chart root")
+    root = next(iter(roots))
+    # Chart.yaml may pin a range, so match vendored archives by dependency name rather than exact version.
+    vendored = {name for name in names if name.startswith(f"{root}/charts/") and name.endswith(".tgz")}
+    missing = [
+        dependency
+        for dependency in dependencies
+        if not any(name.startswith(f"{root}/charts/{dependency}-") for name in vendored)
+    ]
+    if missing:
+        raise RuntimeError(f"Chart artifact {artifact} is missing vendored dependencies: {', '.join(missing)}")
+
+
+class ChartArtifactCache:
+    # Packages the store chart once per content hash into <cache_dir>/<hash>/<name>-<version>.tgz with its
+    # dependencies vendored, so installs load one local archive and never resolve repositories. Dependencies
+    # already present under the chart's charts/ directory are used as-is, which keeps air-gapped clusters working.
+
+    def __init__(self, helm: HelmService, chart_path: str, cache_dir: str):
+        self.helm = helm
+        self.chart_dir = Path(chart_path).resolve()
+        self.cache_dir = Path(cache_dir)
+        self.artifact: Path | None = None
+        self.content_hash: str | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def chart_ref(self) -> str:
+        # Until an artifact is verified, installs use the chart directory as before.
+        return str(self.artifact or self.chart_dir)
+
+    async def digest(self) -> str:
+        if self.content_hash is None:
+            self.content_hash = await asyncio.to_thread(chart_content_hash, self.chart_dir)
+        return self.content_hash
+
+    async def ensure(self) -> Path:
+        async with self._lock:
+            if self.artifact and self.artifact.exists():
+                return self.artifact
+            started = time.perf_counter()
+            artifact_dir = self.cache_dir / (await self.digest())[:32]
+            statuses = await self.helm.dependency_status(str(self.chart_dir))
+            dependencies = [name for name, _version, _status in statuses]
+
+            source = "cache"
+            artifact = await asyncio.to_thread(self._verified_artifact, artifact_dir, dependencies)
+            if artifact is None:
+                source = "package"
+                artifact = await self._package(artifact_dir, dependencies)
+            chart_load_duration_seconds.labels(source=source).observe(time.perf_counter() - started)
+            logger.info("Store chart %s artifact: %s", "reused" if source == "cache" else "packaged", artifact)
+            self.artifact = artifact
+            return artifact
+
+    def _verified_artifact(self, artifact_dir: Path, dependencies: list[str]) -> Path | None:
+        for artifact in artifact_dir.glob("*.tgz"):
+            try:
+                verify_chart_archive(artifact, dependencies)
+                return artifact
+            except RuntimeError:
+                logger.warning("Discarding invalid cached chart artifact %s", artifact, exc_info=True)
+        return None
+
+    async def _package(self, artifact_dir: Path, dependencies: list[str]) -> Path:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Build in a scratch copy so the source tree is never modified and a failed build leaves nothing behind.
+        scratch = Path(tempfile.mkdtemp(prefix=".build-", dir=self.cache_dir))
+        try:
+            chart_copy = scratch / self.chart_dir.name
+            await asyncio.to_thread(shutil.copytree, self.chart_dir, chart_copy)
+            statuses = await self.helm.dependency_status(str(chart_copy))
+            if any(status != "ok" for _name, _version, status in statuses):
+                await self.helm.dependency_build(str(chart_copy))
+            output_dir = scratch / "out"
+            output_dir.mkdir()
+            packaged = Path(await self.helm.package(str(chart_copy), str(output_dir)))
+            await asyncio.to_thread(verify_chart_archive, packaged, dependencies)
+
+            if artifact_dir.exists():
+                await asyncio.to_thread(shutil.rmtree, artifact_dir)
+            # Directory rename is atomic, so concurrent workers sharing cache_dir never see a partial artifact.
+            try:
+                os.replace(output_dir, artifact_dir)
+            except OSError:
+                if self._verified_artifact(artifact_dir, dependencies) is None:
+                    raise
+            return artifact_dir / packaged.name
+        finally:
+            await asyncio.to_thread(shutil.rmtree, scratch, True)
@@ -0,0 +1,25 @@
+import hashlib
+
+from fastapi import Request, Response
+
+
+def compute_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored on both sides.
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Response | None:
+    # Returns a 304 when the client already holds this version; otherwise tags the response being built.
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
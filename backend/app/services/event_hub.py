@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable, Collection
+
+from prometheus_client import Gauge
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.enums import StoreStatus
+from app.models.store import Store
+from app.models.store_event import StoreEvent
+
+logger = logging.getLogger(__name__)
+
+store_event_stream_subscribers = Gauge(
+    "store_event_stream_subscribers", "Clients currently attached to the store event stream"
+)
+
+Renderer = Callable[[StoreEvent, Store], str]
+
+
+class StoreEventHub:
+    # One poller per process reads new store_events rows and fans the rendered messages out to every
+    # subscriber, so the query cost is per change rather than per connected client.
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        render: Renderer,
+        poll_seconds: float = 1.0,
+        batch_size: int = 500,
+        queue_size: int = 1000,
+        hidden_statuses: Collection[StoreStatus] = (),
+        gap_seconds: float = 30.0,
+    ):
+        self.session_factory = session_factory
+        self.render = render
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        # Events of stores currently in these statuses are not sent; the ids are skipped, not replayed later.
+        self.hidden_statuses = list(hidden_statuses)
+        self.gap_seconds = gap_seconds
+        self._subscribers: set[asyncio.Queue] = set()
+        self._last_id: int | None = None
+        # Ids below _last_id that were not there when it moved past them, with the monotonic time they were skipped.
+        self._gaps: dict[int, float] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def subscribe(
+        self, last_event_id: int | None = None, heartbeat_seconds: float = 15.0
+    ) -> AsyncIterator[tuple[int, str] | None]:
+        # Yields (event id, rendered message), or None when nothing happened for heartbeat_seconds.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if self._last_id is None:
+            self._last_id = await asyncio.to_thread(self._max_event_id)
+        # Everything after this point arrives through the queue, everything up to it through the backfill.
+        live_from = self._last_id
+        self._subscribers.add(queue)
+        store_event_stream_subscribers.set(len(self._subscribers))
+        self._ensure_running()
+        try:
+            if last_event_id is not None:
+                cursor = last_event_id
+                while cursor < live_from:
+                    batch = await asyncio.to_thread(self._fetch, cursor, live_from)
+                    if not batch:
+                        break
+                    for message in batch:
+                        yield message
+                    cursor = batch[-1][0]
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            self._subscribers.discard(queue)
+            store_event_stream_subscribers.set(len(self._subscribers))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            try:
+                await self.poll_once()
+            except Exception:
+                logger.exception("Store event poll failed")
+            await asyncio.sleep(self.poll_seconds)
+        # Nobody is listening; the next subscriber restarts polling from the current tail.
+        self._last_id = None
+        self._gaps = {}
+
+    async def poll_once(self) -> None:
+        if self._last_id is None:
+            self._last_id = await asyncio.to_thread(self._max_event_id)
+            return
+        # Event ids are allocated before commit, so a lower id can become visible after a higher one was read.
+        # Skipped ids are asked for again until gap_seconds pass; by then they were rolled back or are hidden.
+        expired = time.monotonic() - self.gap_seconds
+        self._gaps = {event_id: skipped for event_id, skipped in self._gaps.items() if skipped > expired}
+        while True:
+            batch = await asyncio.to_thread(self._fetch, self._last_id, None, list(self._gaps))
+            now = time.monotonic()
+            for message in batch:
+                event_id = message[0]
+                if event_id > self._last_id:
+                    self._gaps.update(dict.fromkeys(range(self._last_id + 1, event_id), now))
+                    self._last_id = event_id
+                else:
+                    self._gaps.pop(event_id, None)
+                self._publish(message)
+            if len(batch) < self.batch_size:
+                return
+
+    def _publish(self, message: tuple[int, str]) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # A client this far behind is cut off; it reconnects with Last-Event-ID and backfills from the DB.
+                self._subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+    def _max_event_id(self) -> int:
+        with self.session_factory() as db:
+            return db.scalar(select(func.max(StoreEvent.id))) or 0
+
+    def _fetch(
+        self, after_id: int, up_to_id: int | None, retry_ids: Collection[int] = ()
+    ) -> list[tuple[int, str]]:
+        newer = StoreEvent.id > after_id
+        if retry_ids:
+            newer = or_(newer, StoreEvent.id.in_(list(retry_ids)))
+        stmt = (
+            select(StoreEvent, Store)
+            .join(Store, Store.id == StoreEvent.store_id)
+            .where(newer)
+            .order_by(StoreEvent.id)
+            .limit(self.batch_size)
+        )
+        if up_to_id is not None:
+            stmt = stmt.where(StoreEvent.id <= up_to_id)
+        if self.hidden_statuses:
+            stmt = stmt.where(Store.status.notin_(self.hidden_statuses))
+        with self.session_factory() as db:
+            return [(event.id, self.render(event, store)) for event, store in db.execute(stmt).all()]
@@ -0,0 +1,69 @@
+import gzip
+import json
+from collections import defaultdict
+from datetime import datetime
+
+from prometheus_client import Counter
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.store_event import StoreEvent
+from app.models.store_event_archive import StoreEventArchive
+from app.services.locks import EVENT_RETENTION_LOCK_KEY, try_xact_lock
+
+store_events_archived_total = Counter(
+    "store_events_archived_total", "Store events moved from store_events into store_event_archives"
+)
+
+
+def encode_archive(events: list[StoreEvent]) -> bytes:
+    lines = (
+        json.dumps(
+            {
+                "id": event.id,
+                "event_type": event.event_type,
+                "message": event.message,
+                "created_at": event.created_at.isoformat(),
+            }
+        )
+        for event in events
+    )
+    return gzip.compress(("\n".join(lines) + "\n").encode())
+
+
+def archive_expired_events(db: Session, cutoff: datetime, batch_size: int = 1000) -> int:
+    # Moves one batch of events older than cutoff into per-store gzip'd NDJSON chunks and deletes them, in one
+    # transaction. Returns how many events moved; callers repeat while a full batch comes back.
+    with db.begin():
+        # Only one worker archives at a time.
+        if not try_xact_lock(db, EVENT_RETENTION_LOCK_KEY):
+            return 0
+        events = db.scalars(
+            select(StoreEvent).where(StoreEvent.created_at < cutoff).order_by(StoreEvent.id).limit(batch_size)
+        ).all()
+        if not events:
+            return 0
+
+        by_store: dict = defaultdict(list)
+        for event in events:
+            by_store[event.store_id].append(event)
+        db.execute(
+            insert(StoreEventArchive),
+            [
+                {
+                    "store_id": store_id,
+                    "first_event_id": store_events[0].id,
+                    "last_event_id": store_events[-1].id,
+                    "event_count": len(store_events),
+                    "payload": encode_archive(store_events),
+                }
+                for store_id, store_events in by_store.items()
+            ],
+        )
+        db.execute(
+            delete(StoreEvent)
+            .where(StoreEvent.id.in_([event.id for event in events]))
+            .execution_options(synchronize_session=False)
+        )
+    store_events_archived_total.inc(len(events))
+    return len(events)
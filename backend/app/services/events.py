@@ -1,7 +1,40 @@
-from sqlalchemy.orm import Session
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.models.store_event import StoreEvent
 
 
 def log_event(db: Session, store_id, event_type: str, message: str) -> None:
     db.add(StoreEvent(store_id=store_id, event_type=event_type, message=message))
+
+
+class BufferedEventWriter:
+    # For events that accompany no status change. Transition events stay on log_event so they commit with
+    # the transition they describe (the event stream, ETags and delta sync rely on that). Everything else is
+    # collected from concurrent jobs and written as one multi-row INSERT per flush.
+
+    def __init__(self, session_factory: sessionmaker, max_pending: int = 10_000):
+        self.session_factory = session_factory
+        self.max_pending = max_pending
+        self._pending: list[dict] = []
+        self._lock = threading.Lock()
+
+    def write(self, store_id: uuid.UUID, event_type: str, message: str) -> None:
+        row = {"store_id": store_id, "event_type": event_type, "message": message, "created_at": datetime.now(timezone.utc)}
+        with self._lock:
+            if len(self._pending) < self.max_pending:
+                self._pending.append(row)
+
+    def flush(self) -> int:
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        with self.session_factory() as db:
+            with db.begin():
+                db.execute(insert(StoreEvent), rows)
+        return len(rows)
@@ -0,0 +1,205 @@
+import math
+import uuid
+from datetime import datetime, timezone
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.enums import FleetUpgradeStatus, JobAction, JobStatus, StoreStatus
+from app.models.fleet_upgrade import FleetUpgrade
+from app.models.provisioning_job import ProvisioningJob
+from app.models.store import Store
+from app.services.job_notify import notify_jobs_queued
+from app.services.locks import FLEET_UPGRADE_LOCK_KEY, try_xact_lock
+
+# Warm pool stores are upgraded too, so a claimed store never serves an older chart than the rest of the fleet.
+UPGRADE_TARGET_STATUSES = [StoreStatus.READY, StoreStatus.WARM]
+
+fleet_upgrade_waves_total = Counter("fleet_upgrade_waves_total", "Fleet upgrade waves enqueued")
+fleet_upgrades_finished_total = Counter(
+    "fleet_upgrades_finished_total", "Fleet upgrades that reached a final status", ["status"]
+)
+fleet_upgrade_stores = Gauge(
+    "fleet_upgrade_stores", "Stores in the running fleet upgrade by state (pending = not yet enqueued)", ["state"]
+)
+
+
+class FleetUpgradeConflict(Exception):
+    pass
+
+
+def deep_merge(base: dict, patch: dict) -> dict:
+    merged = dict(base)
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def current_values_patch(db: Session) -> dict:
+    # Stores provisioned after a fleet upgrade completed get the same patch, so a later install never reverts it.
+    patch = db.scalar(
+        select(FleetUpgrade.values_patch)
+        .where(FleetUpgrade.status == FleetUpgradeStatus.SUCCEEDED)
+        .order_by(FleetUpgrade.completed_at.desc())
+        .limit(1)
+    )
+    return patch or {}
+
+
+def store_values_patch(db: Session, store_id: uuid.UUID) -> dict:
+    # The patch a store should be rendered with: the running upgrade's once that upgrade has reached the store
+    # (a store whose upgrade job failed was rolled back), otherwise the last completed one.
+    patch = db.scalar(
+        select(FleetUpgrade.values_patch)
+        .join(ProvisioningJob, ProvisioningJob.fleet_upgrade_id == FleetUpgrade.id)
+        .where(
+            FleetUpgrade.status == FleetUpgradeStatus.RUNNING,
+            ProvisioningJob.store_id == store_id,
+            ProvisioningJob.status != JobStatus.FAILED,
+        )
+        .limit(1)
+    )
+    return current_values_patch(db) if patch is None else patch
+
+
+def fleet_upgrade_progress(db: Session, upgrade: FleetUpgrade) -> dict[JobStatus, int]:
+    rows = db.execute(
+        select(ProvisioningJob.status, func.count(ProvisioningJob.id))
+        .where(ProvisioningJob.fleet_upgrade_id == upgrade.id)
+        .group_by(ProvisioningJob.status)
+    ).all()
+    counts = dict.fromkeys(JobStatus, 0)
+    counts.update({status: count for status, count in rows})
+    return counts
+
+
+def start_fleet_upgrade(
+    db: Session,
+    chart_version: str,
+    values_patch: dict,
+    wave_size: int,
+    canary_percent: int,
+    max_failure_percent: int,
+) -> FleetUpgrade:
+    # The caller commits. The partial unique index on status = 'RUNNING' backs this check under concurrency.
+    if db.scalar(select(FleetUpgrade.id).where(FleetUpgrade.status == FleetUpgradeStatus.RUNNING)):
+        raise FleetUpgradeConflict("A fleet upgrade is already running")
+    upgrade = FleetUpgrade(
+        id=uuid.uuid4(),
+        chart_version=chart_version,
+        values_patch=values_patch,
+        status=FleetUpgradeStatus.RUNNING,
+        wave_size=wave_size,
+        canary_percent=canary_percent,
+        max_failure_percent=max_failure_percent,
+        total_stores=(
+            db.scalar(select(func.count(Store.id)).where(Store.status.in_(UPGRADE_TARGET_STATUSES))) or 0
+        ),
+        waves_started=0,
+    )
+    db.add(upgrade)
+    return upgrade
+
+
+def stop_fleet_upgrade(db: Session, upgrade: FleetUpgrade, status: FleetUpgradeStatus, reason: str | None) -> None:
+    upgrade.status = status
+    upgrade.halted_reason = reason
+    upgrade.completed_at = datetime.now(timezone.utc)
+    # Jobs already leased finish on their own; queued ones never start.
+    db.execute(
+        update(ProvisioningJob)
+        .where(ProvisioningJob.fleet_upgrade_id == upgrade.id, ProvisioningJob.status == JobStatus.QUEUED)
+        .values(
+            status=JobStatus.FAILED,
+            error_message=f"fleet_upgrade_{status.value.lower()}",
+            completed_at=datetime.now(timezone.utc),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    fleet_upgrades_finished_total.labels(status=status.value).inc()
+
+
+def advance_fleet_upgrades(db: Session, max_attempts: int, notify_channel: str) -> FleetUpgrade | None:
+    # One scheduling pass over the running upgrade, in one transaction: halt it when the failure rate is over
+    # budget, otherwise enqueue the next wave once the current one has finished. Returns the upgrade it looked at.
+    with db.begin():
+        # Only one worker schedules waves at a time.
+        if not try_xact_lock(db, FLEET_UPGRADE_LOCK_KEY):
+            return None
+        upgrade = db.scalar(select(FleetUpgrade).where(FleetUpgrade.status == FleetUpgradeStatus.RUNNING).limit(1))
+        if upgrade is None:
+            return None
+
+        progress = fleet_upgrade_progress(db, upgrade)
+        failed = progress[JobStatus.FAILED]
+        finished = failed + progress[JobStatus.SUCCEEDED]
+        active = progress[JobStatus.QUEUED] + progress[JobStatus.IN_PROGRESS]
+        _set_progress_gauge(upgrade, progress)
+
+        if failed and upgrade.canary_percent > 0 and upgrade.waves_started == 1:
+            stop_fleet_upgrade(db, upgrade, FleetUpgradeStatus.HALTED, f"Canary wave failed on {failed} store(s)")
+            return upgrade
+        # Mid-wave, the jobs still running count as successes: the run halts only once the wave can no longer end
+        # within budget, so one early failure in a large wave does not stop the fleet on a tiny sample.
+        enqueued = finished + active
+        if failed and failed * 100 > upgrade.max_failure_percent * enqueued:
+            stop_fleet_upgrade(
+                db,
+                upgrade,
+                FleetUpgradeStatus.HALTED,
+                f"Failure rate {failed}/{enqueued} exceeds {upgrade.max_failure_percent}%",
+            )
+            return upgrade
+        if active:
+            return upgrade
+
+        if upgrade.waves_started == 0 and upgrade.canary_percent > 0:
+            wave = max(1, math.ceil(upgrade.total_stores * upgrade.canary_percent / 100))
+        else:
+            wave = upgrade.wave_size
+        already_targeted = exists().where(
+            ProvisioningJob.store_id == Store.id, ProvisioningJob.fleet_upgrade_id == upgrade.id
+        )
+        store_ids = list(
+            db.scalars(
+                select(Store.id)
+                .where(Store.status.in_(UPGRADE_TARGET_STATUSES), ~already_targeted)
+                .order_by(Store.created_at, Store.id)
+                .limit(wave)
+            )
+        )
+        if not store_ids:
+            upgrade.status = FleetUpgradeStatus.SUCCEEDED
+            upgrade.completed_at = datetime.now(timezone.utc)
+            fleet_upgrades_finished_total.labels(status=FleetUpgradeStatus.SUCCEEDED.value).inc()
+            return upgrade
+
+        db.execute(
+            insert(ProvisioningJob),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "store_id": store_id,
+                    "fleet_upgrade_id": upgrade.id,
+                    "action": JobAction.UPGRADE,
+                    "status": JobStatus.QUEUED,
+                    "max_attempts": max_attempts,
+                }
+                for store_id in store_ids
+            ],
+        )
+        upgrade.waves_started += 1
+        notify_jobs_queued(db, notify_channel)
+        fleet_upgrade_waves_total.inc()
+        return upgrade
+
+
+def _set_progress_gauge(upgrade: FleetUpgrade, progress: dict[JobStatus, int]) -> None:
+    enqueued = sum(progress.values())
+    fleet_upgrade_stores.labels(state="pending").set(max(upgrade.total_stores - enqueued, 0))
+    for status, count in progress.items():
+        fleet_upgrade_stores.labels(state=status.value.lower()).set(count)
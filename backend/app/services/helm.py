@@ -1,19 +1,30 @@
+import asyncio
+import hashlib
 import json
-import subprocess
+import re
 from pathlib import Path
 
+from app.services.process import run_command
+
+
+def release_fingerprint(values: dict, chart_digest: str) -> str:
+    # Canonical JSON, so key order in the rendered values never changes the fingerprint.
+    payload = json.dumps({"chart": chart_digest, "values": values}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
 
 class HelmService:
     def __init__(self, helm_binary: str = "helm"):
         self.helm_binary = helm_binary
 
-    def upgrade_install(
+    async def upgrade_install(
         self,
         release_name: str,
         namespace: str,
         chart_path: str,
         values: dict,
         timeout_seconds: int,
+        atomic: bool = False,
     ) -> None:
         cmd = [
             self.helm_binary,
@@ -30,33 +41,101 @@ class HelmService:
             "--timeout",
             f"{timeout_seconds}s",
         ]
-        self._run(cmd, stdin_payload=json.dumps(values), timeout_seconds=timeout_seconds + 30)
+        if atomic:
+            # Roll back to the previous revision when the upgrade fails, so the store keeps serving.
+            cmd.append("--atomic")
+        await self._run(cmd, stdin_payload=json.dumps(values), timeout_seconds=timeout_seconds + 30)
 
-    def uninstall(self, release_name: str, namespace: str, timeout_seconds: int) -> None:
+    async def uninstall(self, release_name: str, namespace: str, timeout_seconds: int, wait: bool = True) -> None:
         cmd = [
             self.helm_binary,
             "uninstall",
             release_name,
             "-n",
             namespace,
+            "--timeout",
+            f"{timeout_seconds}s",
+        ]
+        if wait:
+            cmd.append("--wait")
+        await self._run(cmd, timeout_seconds=timeout_seconds + 30)
+
+    async def rollback(self, release_name: str, namespace: str, timeout_seconds: int) -> None:
+        # Without a revision, helm rolls back to the one before the current release.
+        cmd = [
+            self.helm_binary,
+            "rollback",
+            release_name,
+            "-n",
+            namespace,
             "--wait",
             "--timeout",
             f"{timeout_seconds}s",
         ]
-        self._run(cmd, timeout_seconds=timeout_seconds + 30)
+        await self._run(cmd, timeout_seconds=timeout_seconds + 30)
+
+    async def release_status(self, release_name: str, namespace: str) -> str | None:
+        # Helm's status for the release ("deployed", "failed", "pending-upgrade", ...), or None when it cannot be read.
+        # `helm list` prints one small row per release; `helm status -o json` would carry the whole manifest.
+        cmd = [
+            self.helm_binary,
+            "list",
+            "-n",
+            namespace,
+            "--all",
+            "--filter",
+            f"^{re.escape(release_name)}$",
+            "-o",
+            "json",
+        ]
+        try:
+            result = await run_command(cmd, timeout_seconds=60)
+            if result.returncode != 0:
+                return None
+            for item in json.loads(result.stdout or "[]"):
+                if item.get("name") == release_name:
+                    return item.get("status")
+        except Exception:  # noqa: BLE001
+            # Any failure means "unknown", which makes the caller run the upgrade instead of skipping it.
+            return None
+        return None
+
+    async def list_releases(self, name_filter: str | None = None) -> dict[tuple[str, str], str]:
+        # {(namespace, release): status} for every release in every namespace, in any state, from one helm call.
+        # --max 0 lifts the default 256-release page.
+        cmd = [self.helm_binary, "list", "--all-namespaces", "--all", "--max", "0", "-o", "json"]
+        if name_filter:
+            cmd += ["--filter", name_filter]
+        stdout = await self._run(cmd, timeout_seconds=120)
+        return {(item["namespace"], item["name"]): item.get("status", "") for item in json.loads(stdout or "[]")}
+
+    async def dependency_status(self, chart_path: str) -> list[tuple[str, str, str]]:
+        # (name, version, status) per dependency; status "ok" means the archive is already in charts/.
+        stdout = await self._run([self.helm_binary, "dependency", "list", chart_path], timeout_seconds=60)
+        rows = []
+        for line in stdout.splitlines()[1:]:
+            parts = line.split()
+            if len(parts) >= 4:
+                rows.append((parts[0], parts[1], parts[-1]))
+        return rows
+
+    async def dependency_build(self, chart_path: str, timeout_seconds: int = 300) -> None:
+        await self._run([self.helm_binary, "dependency", "build", chart_path], timeout_seconds=timeout_seconds)
+
+    async def package(self, chart_path: str, destination: str) -> str:
+        stdout = await self._run([self.helm_binary, "package", chart_path, "-d", destination], timeout_seconds=120)
+        _prefix, _sep, artifact = stdout.strip().rpartition(": ")
+        if not artifact.endswith(".tgz"):
+            raise RuntimeError(f"Unexpected helm package output: {stdout.strip()}")
+        return artifact
 
-    def _run(self, cmd: list[str], stdin_payload: str | None = None, timeout_seconds: int | None = None) -> None:
+    async def _run(self, cmd: list[str], stdin_payload: str | None = None, timeout_seconds: int | None = None) -> str:
         try:
-            process = subprocess.run(
-                cmd,
-                input=stdin_payload,
-                capture_output=True,
-                text=True,
-                timeout=timeout_seconds,
-            )
-        except subprocess.TimeoutExpired as exc:
+            result = await run_command(cmd, stdin_payload=stdin_payload, timeout_seconds=timeout_seconds)
+        except asyncio.TimeoutError as exc:
             raise RuntimeError(f"Helm command timed out after {timeout_seconds}s: {' '.join(cmd)}") from exc
-        if process.returncode != 0:
-            stderr = process.stderr.strip()
-            stdout = process.stdout.strip()
+        if result.returncode != 0:
+            stderr = result.stderr.strip()
+            stdout = result.stdout.strip()
             raise RuntimeError(f"Helm command failed: {' '.join(cmd)}\nstdout: {stdout}\nstderr: {stderr}")
+        return result.stdout
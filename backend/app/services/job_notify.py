@@ -0,0 +1,50 @@
+import asyncio
+import logging
+
+import psycopg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def notify_jobs_queued(db: Session, channel: str) -> None:
+    # pg_notify is transactional: listeners are only woken once the enqueueing transaction commits.
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(text("SELECT pg_notify(:channel, '')"), {"channel": channel})
+
+
+def listen_dsn(database_url: str) -> str | None:
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        return None
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class JobWakeupListener:
+    def __init__(self, dsn: str, channel: str, wakeup: asyncio.Event, reconnect_seconds: float = 5.0):
+        self.dsn = dsn
+        self.channel = channel
+        self.wakeup = wakeup
+        self.reconnect_seconds = reconnect_seconds
+        self.connected = False
+
+    async def run(self) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(self.dsn, autocommit=True) as conn:
+                    await conn.execute(f'LISTEN "{self.channel}"')
+                    self.connected = True
+                    # Jobs may have been queued while we were disconnected.
+                    self.wakeup.set()
+                    async for _notify in conn.notifies():
+                        self.wakeup.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                logger.warning("Job notification listener disconnected; falling back to polling", exc_info=True)
+            finally:
+                self.connected = False
+            await asyncio.sleep(self.reconnect_seconds)
@@ -0,0 +1,34 @@
+from prometheus_client import Gauge
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.enums import JobAction, JobStatus, StoreEngine
+from app.models.provisioning_job import ProvisioningJob
+from app.models.store import Store
+
+# Terminal statuses only ever grow and would need a scan of the whole job history, so only live work is counted.
+LIVE_JOB_STATUSES = [JobStatus.QUEUED, JobStatus.IN_PROGRESS]
+
+provisioning_jobs_by_status = Gauge(
+    "provisioning_jobs_by_status", "Queued and in-progress provisioning jobs", ["status", "action", "engine"]
+)
+
+
+def job_queue_depth(db: Session) -> dict[tuple[JobStatus, JobAction, StoreEngine], int]:
+    rows = db.execute(
+        select(ProvisioningJob.status, ProvisioningJob.action, Store.engine, func.count(ProvisioningJob.id))
+        .join(Store, Store.id == ProvisioningJob.store_id)
+        .where(ProvisioningJob.status.in_(LIVE_JOB_STATUSES))
+        .group_by(ProvisioningJob.status, ProvisioningJob.action, Store.engine)
+    ).all()
+    # Combinations with no rows are reported as 0 so a drained queue does not keep its last value.
+    depth = {
+        (status, action, engine): 0 for status in LIVE_JOB_STATUSES for action in JobAction for engine in StoreEngine
+    }
+    depth.update({(status, action, engine): count for status, action, engine, count in rows})
+    return depth
+
+
+def refresh_job_queue_gauge(db: Session) -> None:
+    for (status, action, engine), count in job_queue_depth(db).items():
+        provisioning_jobs_by_status.labels(status=status.value, action=action.value, engine=engine.value).set(count)
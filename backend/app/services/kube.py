@@ -1,30 +1,87 @@
+import asyncio
 import base64
 import json
+import logging
 import subprocess
 
+import httpx
+
+from app.core.config import Settings
+from app.services.kube_api import KubeApiClient
+from app.services.process import run_command
+
+logger = logging.getLogger(__name__)
+
 
 class KubeService:
-    def __init__(self, kubectl_binary: str = "kubectl", delete_timeout_seconds: int = 180):
+    def __init__(
+        self,
+        kubectl_binary: str = "kubectl",
+        delete_timeout_seconds: int = 180,
+        api: KubeApiClient | None = None,
+    ):
         self.kubectl_binary = kubectl_binary
         self.delete_timeout_seconds = delete_timeout_seconds
+        self.api = api
 
-    def delete_namespace(self, namespace: str) -> None:
+    async def delete_namespace(self, namespace: str, wait: bool = True) -> None:
+        if self.api:
+            try:
+                if await self.api.delete_namespace(namespace) and wait:
+                    await self.api.wait_namespace_deleted(namespace, self.delete_timeout_seconds)
+                return
+            except httpx.TransportError:
+                logger.warning("Kubernetes API unreachable; deleting namespace %s via kubectl", namespace, exc_info=True)
+        await self._kubectl_delete_namespace(namespace, wait)
+
+    async def list_namespace_names(self) -> set[str]:
+        if self.api:
+            try:
+                names, _resource_version = await self.api.list_namespaces()
+                return names
+            except httpx.TransportError:
+                logger.warning("Kubernetes API unreachable; listing namespaces via kubectl", exc_info=True)
+        cmd = [self.kubectl_binary, "get", "namespaces", "-o", "jsonpath={.items[*].metadata.name}"]
+        try:
+            result = await run_command(cmd, timeout_seconds=60)
+        except asyncio.TimeoutError as exc:
+            raise RuntimeError("kubectl get namespaces timed out") from exc
+        if result.returncode != 0:
+            raise RuntimeError(f"kubectl get namespaces failed\nstderr: {result.stderr.strip()}")
+        return set(result.stdout.split())
+
+    async def _kubectl_delete_namespace(self, namespace: str, wait: bool = True) -> None:
         cmd = [
             self.kubectl_binary,
             "delete",
             "namespace",
             namespace,
             "--ignore-not-found=true",
-            "--wait=true",
+            f"--wait={'true' if wait else 'false'}",
             f"--timeout={self.delete_timeout_seconds}s",
         ]
-        process = subprocess.run(cmd, capture_output=True, text=True)
-        if process.returncode != 0:
-            stderr = process.stderr.strip()
-            stdout = process.stdout.strip()
+        try:
+            # kubectl enforces --timeout itself; the outer bound only guards against a hung client.
+            result = await run_command(cmd, timeout_seconds=self.delete_timeout_seconds + 30)
+        except asyncio.TimeoutError as exc:
+            raise RuntimeError(f"kubectl delete namespace timed out after {self.delete_timeout_seconds}s") from exc
+        if result.returncode != 0:
+            stderr = result.stderr.strip()
+            stdout = result.stdout.strip()
             raise RuntimeError(f"kubectl delete namespace failed\nstdout: {stdout}\nstderr: {stderr}")
 
     def read_secret_value(self, namespace: str, secret_name: str, key: str) -> str:
+        return decode_secret_value(self.get_secret(namespace, secret_name), secret_name, key)
+
+    def get_secret(self, namespace: str, secret_name: str) -> dict:
+        if self.api:
+            try:
+                return self.api.get_secret(namespace, secret_name)
+            except httpx.TransportError:
+                logger.warning("Kubernetes API unreachable; reading secret via kubectl", exc_info=True)
+        return self._kubectl_get_secret(namespace, secret_name)
+
+    def _kubectl_get_secret(self, namespace: str, secret_name: str) -> dict:
         cmd = [self.kubectl_binary, "get", "secret", secret_name, "-n", namespace, "-o", "json"]
         process = subprocess.run(cmd, capture_output=True, text=True)
         if process.returncode != 0:
@@ -33,15 +90,25 @@ class KubeService:
             raise RuntimeError(f"kubectl get secret failed\nstdout: {stdout}\nstderr: {stderr}")
 
         try:
-            payload = json.loads(process.stdout or "{}")
+            return json.loads(process.stdout or "{}")
         except json.JSONDecodeError as exc:
             raise RuntimeError("kubectl get secret returned invalid JSON") from exc
 
-        encoded_value = payload.get("data", {}).get(key)
-        if not encoded_value:
-            raise RuntimeError(f"Secret key '{key}' not found in '{secret_name}'")
 
-        try:
-            return base64.b64decode(encoded_value).decode("utf-8")
-        except Exception as exc:  # noqa: BLE001
-            raise RuntimeError(f"Failed to decode secret '{secret_name}' key '{key}'") from exc
+def decode_secret_value(payload: dict, secret_name: str, key: str) -> str:
+    encoded_value = payload.get("data", {}).get(key)
+    if not encoded_value:
+        raise RuntimeError(f"Secret key '{key}' not found in '{secret_name}'")
+
+    try:
+        return base64.b64decode(encoded_value).decode("utf-8")
+    except Exception as exc:  # noqa: BLE001
+        raise RuntimeError(f"Failed to decode secret '{secret_name}' key '{key}'") from exc
+
+
+def build_kube_service(settings: Settings) -> KubeService:
+    return KubeService(
+        settings.kubectl_binary,
+        settings.kubectl_delete_timeout_seconds,
+        api=KubeApiClient.from_settings(settings),
+    )
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import httpx
+
+from app.core.config import Settings
+
+
+class KubeApiError(RuntimeError):
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class KubeApiClient:
+    TOKEN_REFRESH_SECONDS = 60.0
+
+    def __init__(
+        self,
+        server: str,
+        token_file: str | None = None,
+        verify: str | bool = True,
+        timeout_seconds: float = 10.0,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.server = server.rstrip("/")
+        self.token_file = token_file
+        self._token: str | None = None
+        self._token_read_at = 0.0
+        # Both clients keep connections alive, so calls skip kubeconfig loading, discovery and TLS setup.
+        self._client = httpx.Client(base_url=self.server, verify=verify, timeout=timeout_seconds, transport=transport)
+        self._async_client = httpx.AsyncClient(
+            base_url=self.server, verify=verify, timeout=timeout_seconds, transport=async_transport
+        )
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "KubeApiClient | None":
+        if not settings.kube_api_enabled:
+            return None
+        server = settings.kube_api_server
+        if not server and os.environ.get("KUBERNETES_SERVICE_HOST"):
+            server = f"https://{os.environ['KUBERNETES_SERVICE_HOST']}:{os.environ.get('KUBERNETES_SERVICE_PORT', '443')}"
+        if not server:
+            return None
+        token_file = settings.kube_api_token_file if Path(settings.kube_api_token_file).is_file() else None
+        verify: str | bool = settings.kube_api_ca_file if Path(settings.kube_api_ca_file).is_file() else True
+        return cls(server, token_file=token_file, verify=verify, timeout_seconds=settings.kube_api_timeout_seconds)
+
+    def _headers(self) -> dict[str, str]:
+        if not self.token_file:
+            return {}
+        # Projected service account tokens rotate, so re-read the file periodically.
+        if self._token is None or time.monotonic() - self._token_read_at > self.TOKEN_REFRESH_SECONDS:
+            self._token = Path(self.token_file).read_text().strip()
+            self._token_read_at = time.monotonic()
+        return {"Authorization": f"Bearer {self._token}"}
+
+    def get_secret(self, namespace: str, name: str) -> dict:
+        response = self._client.get(f"/api/v1/namespaces/{namespace}/secrets/{name}", headers=self._headers())
+        if response.status_code != 200:
+            raise KubeApiError(f"get secret {namespace}/{name} failed: {response.text.strip()}", response.status_code)
+        return response.json()
+
+    async def delete_namespace(self, namespace: str) -> bool:
+        response = await self._async_client.delete(f"/api/v1/namespaces/{namespace}", headers=self._headers())
+        if response.status_code == 404:
+            return False
+        if response.status_code not in {200, 202}:
+            raise KubeApiError(f"delete namespace {namespace} failed: {response.text.strip()}", response.status_code)
+        return True
+
+    async def namespace_exists(self, namespace: str) -> bool:
+        response = await self._async_client.get(f"/api/v1/namespaces/{namespace}", headers=self._headers())
+        if response.status_code == 404:
+            return False
+        if response.status_code != 200:
+            raise KubeApiError(f"get namespace {namespace} failed: {response.text.strip()}", response.status_code)
+        return True
+
+    async def list_namespaces(self, field_selector: str | None = None) -> tuple[set[str], str]:
+        params = {"fieldSelector": field_selector} if field_selector else {}
+        response = await self._async_client.get("/api/v1/namespaces", params=params, headers=self._headers())
+        if response.status_code != 200:
+            raise KubeApiError(f"list namespaces failed: {response.text.strip()}", response.status_code)
+        listing = response.json()
+        names = {item["metadata"]["name"] for item in listing.get("items", [])}
+        return names, listing["metadata"]["resourceVersion"]
+
+    async def watch_namespaces(
+        self, resource_version: str, field_selector: str | None = None, timeout_seconds: int = 300
+    ) -> AsyncIterator[tuple[str, str]]:
+        # Yields (event type, namespace name) until the server ends the watch or sends an ERROR event
+        # (for example an expired resourceVersion); callers re-list and resume.
+        params = {"watch": "1", "resourceVersion": resource_version, "timeoutSeconds": str(timeout_seconds)}
+        if field_selector:
+            params["fieldSelector"] = field_selector
+        async with self._async_client.stream(
+            "GET", "/api/v1/namespaces", params=params, headers=self._headers(), timeout=None
+        ) as stream:
+            async for line in stream.aiter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event.get("type") == "ERROR":
+                    return
+                yield event["type"], event.get("object", {}).get("metadata", {}).get("name", "")
+
+    async def wait_namespace_deleted(self, namespace: str, timeout_seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._watch_until_deleted(namespace), timeout=timeout_seconds)
+        except asyncio.TimeoutError as exc:
+            raise KubeApiError(f"namespace {namespace} was not deleted within {timeout_seconds}s") from exc
+
+    async def _watch_until_deleted(self, namespace: str) -> None:
+        field_selector = f"metadata.name={namespace}"
+        while True:
+            names, resource_version = await self.list_namespaces(field_selector)
+            if namespace not in names:
+                return
+            async for event_type, _name in self.watch_namespaces(resource_version, field_selector):
+                if event_type == "DELETED":
+                    return
+
+    def close(self) -> None:
+        self._client.close()
+
+    async def aclose(self) -> None:
+        await self._async_client.aclose()
@@ -0,0 +1,24 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Arbitrary application-wide keys for Postgres transaction-scoped advisory locks, one per piece of work that
+# must not run on two replicas at once. Keep them unique.
+STORE_CAPACITY_LOCK_KEY = 7_301_001
+EVENT_RETENTION_LOCK_KEY = 7_301_002
+FLEET_UPGRADE_LOCK_KEY = 7_301_003
+WARM_POOL_LOCK_KEY = 7_301_004
+RECONCILER_LOCK_KEY = 7_301_005
+
+
+def xact_lock(db: Session, key: int) -> None:
+    # Waits for the lock, which is released when the caller's transaction ends. Other databases (tests) run a
+    # single process and skip it.
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": key})
+
+
+def try_xact_lock(db: Session, key: int) -> bool:
+    # Like xact_lock, but returns False at once when another transaction holds the lock.
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(db.scalar(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": key}))
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+
+from prometheus_client import Gauge
+
+from app.services.kube import KubeService
+
+logger = logging.getLogger(__name__)
+
+terminating_namespaces_tracked = Gauge(
+    "terminating_namespaces_tracked", "Namespaces whose deletion is awaited by the shared teardown watcher"
+)
+
+
+class NamespaceTeardownWatcher:
+    # Tracks every namespace a worker is tearing down with a single watch stream (or, without API
+    # access, a single `kubectl get namespaces` per poll) instead of one blocking wait per job.
+
+    def __init__(self, kube: KubeService, poll_seconds: float = 5.0, watch_timeout_seconds: int = 300):
+        self.kube = kube
+        self.poll_seconds = poll_seconds
+        self.watch_timeout_seconds = watch_timeout_seconds
+        self._waiters: dict[str, set[asyncio.Future]] = {}
+        self._task: asyncio.Task | None = None
+        self._checks: set[asyncio.Task] = set()
+
+    @property
+    def tracked(self) -> int:
+        return len(self._waiters)
+
+    async def wait_for_deletion(self, namespace: str, timeout_seconds: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(namespace, set()).add(future)
+        terminating_namespaces_tracked.set(len(self._waiters))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        elif self.kube.api:
+            # The running watch only reports deletions after its resourceVersion; catch ones that already finished.
+            check = asyncio.create_task(self._check_exists(namespace))
+            self._checks.add(check)
+            check.add_done_callback(self._checks.discard)
+
+        try:
+            await asyncio.wait_for(future, timeout=timeout_seconds)
+        except asyncio.TimeoutError as exc:
+            raise RuntimeError(f"Namespace {namespace} was still terminating after {timeout_seconds}s") from exc
+        finally:
+            waiters = self._waiters.get(namespace)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[namespace]
+            terminating_namespaces_tracked.set(len(self._waiters))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _resolve(self, namespace: str) -> None:
+        for future in self._waiters.pop(namespace, set()):
+            if not future.done():
+                future.set_result(None)
+        terminating_namespaces_tracked.set(len(self._waiters))
+
+    def _resolve_absent(self, present: set[str]) -> None:
+        for namespace in [name for name in self._waiters if name not in present]:
+            self._resolve(namespace)
+
+    async def _check_exists(self, namespace: str) -> None:
+        try:
+            if not await self.kube.api.namespace_exists(namespace):
+                self._resolve(namespace)
+        except Exception:  # noqa: BLE001
+            logger.debug("Namespace existence check failed for %s", namespace, exc_info=True)
+
+    async def _run(self) -> None:
+        while self._waiters:
+            try:
+                if self.kube.api:
+                    await self._watch()
+                else:
+                    await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                logger.warning("Namespace teardown watch failed; retrying", exc_info=True)
+                await asyncio.sleep(self.poll_seconds)
+
+    async def _watch(self) -> None:
+        present, resource_version = await self.kube.api.list_namespaces()
+        self._resolve_absent(present)
+        if not self._waiters:
+            return
+        async for event_type, namespace in self.kube.api.watch_namespaces(
+            resource_version, timeout_seconds=self.watch_timeout_seconds
+        ):
+            if event_type == "DELETED":
+                self._resolve(namespace)
+            if not self._waiters:
+                return
+
+    async def _poll(self) -> None:
+        self._resolve_absent(await self.kube.list_namespace_names())
+        if self._waiters:
+            await asyncio.sleep(self.poll_seconds)
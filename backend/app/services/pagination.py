@@ -0,0 +1,36 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def count_rows(db: Session, stmt: Select, exact_threshold: int) -> tuple[int, bool]:
+    # Returns (total, is_estimate). On Postgres the planner's row estimate answers without touching the
+    # table; it is only replaced by an exact COUNT(*) when small enough for that to be cheap.
+    if db.get_bind().dialect.name == "postgresql":
+        compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+        plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate > exact_threshold:
+            return estimate, True
+
+    total = db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery())) or 0
+    return total, False
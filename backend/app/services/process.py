@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from prometheus_client import Histogram
+
+logger = logging.getLogger(__name__)
+
+command_duration_seconds = Histogram(
+    "command_duration_seconds",
+    "Wall time of external helm/kubectl commands",
+    ["tool", "command", "outcome"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+
+
+@dataclass
+class CommandResult:
+    returncode: int
+    stdout: str
+    stderr: str
+    duration_seconds: float
+
+
+async def run_command(
+    cmd: list[str],
+    stdin_payload: str | None = None,
+    timeout_seconds: float | None = None,
+) -> CommandResult:
+    # Output is drained in fixed-size chunks while the process runs, so single-line JSON of any size is read
+    # whole. On timeout, cancellation or any other error the process is killed and reaped before the error
+    # propagates, so no child outlives its job.
+    tool = os.path.basename(cmd[0])
+    command = cmd[1] if len(cmd) > 1 else ""
+    started = time.perf_counter()
+    outcome = "error"
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE if stdin_payload is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout_chunks: list[bytes] = []
+    stderr_chunks: list[bytes] = []
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                _write_stdin(process, stdin_payload),
+                _drain(process.stdout, stdout_chunks, tool, "stdout"),
+                _drain(process.stderr, stderr_chunks, tool, "stderr"),
+                process.wait(),
+            ),
+            timeout=timeout_seconds,
+        )
+        outcome = "ok" if process.returncode == 0 else "error"
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        await _kill(process)
+        raise
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        await _kill(process)
+        raise
+    except BaseException:
+        await _kill(process)
+        raise
+    finally:
+        command_duration_seconds.labels(tool=tool, command=command, outcome=outcome).observe(
+            time.perf_counter() - started
+        )
+
+    return CommandResult(
+        returncode=process.returncode,
+        stdout=b"".join(stdout_chunks).decode("utf-8", errors="replace"),
+        stderr=b"".join(stderr_chunks).decode("utf-8", errors="replace"),
+        duration_seconds=time.perf_counter() - started,
+    )
+
+
+async def _write_stdin(process: asyncio.subprocess.Process, payload: str | None) -> None:
+    if payload is None or process.stdin is None:
+        return
+    try:
+        process.stdin.write(payload.encode("utf-8"))
+        await process.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+    finally:
+        process.stdin.close()
+
+
+async def _drain(stream: asyncio.StreamReader | None, sink: list[bytes], tool: str, name: str) -> None:
+    # readline() is capped at the stream limit (64 KiB); helm and kubectl JSON output is often one longer line.
+    if stream is None:
+        return
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return
+        sink.append(chunk)
+        logger.debug("%s %s: %d bytes", tool, name, len(chunk))
+
+
+async def _kill(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    await asyncio.shield(process.wait())
@@ -1,33 +1,110 @@
+import threading
+import time
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Engine, case, delete
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
+from app.core.config import Settings
 from app.models.rate_limit_bucket import RateLimitBucket
 
 
-class RateLimiter:
+class RateLimiter(ABC):
+    # allow(key, cost) -> (allowed, remaining). A rejected call consumes nothing and reports 0 remaining.
+
     def __init__(self, max_requests: int, window_seconds: int):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
 
-    def allow(self, db: Session, key: str) -> tuple[bool, int]:
+    @abstractmethod
+    def allow(self, key: str, cost: int = 1) -> tuple[bool, int]: ...
+
+
+class LocalRateLimiter(RateLimiter):
+    # Token bucket per key in process memory: refills max_requests tokens per window, no database I/O.
+    # Limits are per replica, so use DatabaseRateLimiter when the API runs more than one.
+
+    PRUNE_EVERY_CALLS = 1024
+
+    def __init__(self, max_requests: int, window_seconds: int):
+        super().__init__(max_requests, window_seconds)
+        self.refill_per_second = max_requests / window_seconds
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def allow(self, key: str, cost: int = 1) -> tuple[bool, int]:
+        now = time.monotonic()
+        # The async handlers call allow through asyncio.to_thread, so calls arrive on several threads at once;
+        # the lock only guards a few float operations.
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.max_requests, now))
+            tokens = min(self.max_requests, tokens + (now - updated) * self.refill_per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._calls += 1
+            if self._calls % self.PRUNE_EVERY_CALLS == 0:
+                self._prune(now)
+        return allowed, int(tokens) if allowed else 0
+
+    def _prune(self, now: float) -> None:
+        # A bucket idle for a whole window is full again, which is the same as having no entry.
+        idle_before = now - self.window_seconds
+        for key in [key for key, (_tokens, updated) in self._buckets.items() if updated < idle_before]:
+            del self._buckets[key]
+
+
+class DatabaseRateLimiter(RateLimiter):
+    # Fixed window per key shared by every replica. Each check is one INSERT ... ON CONFLICT DO UPDATE on
+    # its own pooled connection, so it neither races with concurrent requests nor commits the caller's session.
+
+    def __init__(self, engine: Engine, max_requests: int, window_seconds: int, purge_interval_seconds: float = 300.0):
+        super().__init__(max_requests, window_seconds)
+        self.engine = engine
+        self.purge_interval_seconds = purge_interval_seconds
+        self._insert = postgresql_insert if engine.dialect.name == "postgresql" else sqlite_insert
+        self._next_purge_at = 0.0
+
+    def allow(self, key: str, cost: int = 1) -> tuple[bool, int]:
+        if cost > self.max_requests:
+            return False, 0
         now = datetime.now(timezone.utc)
-        bucket = db.get(RateLimitBucket, key)
-        if bucket is None:
-            db.add(RateLimitBucket(key=key, count=1, window_started_at=now))
-            db.commit()
-            return True, self.max_requests - 1
-
-        elapsed = now - bucket.window_started_at
-        if elapsed > timedelta(seconds=self.window_seconds):
-            bucket.count = 1
-            bucket.window_started_at = now
-            db.commit()
-            return True, self.max_requests - 1
-
-        if bucket.count >= self.max_requests:
+        window_cutoff = now - timedelta(seconds=self.window_seconds)
+        buckets = RateLimitBucket.__table__
+        expired = buckets.c.window_started_at <= window_cutoff
+        stmt = (
+            self._insert(buckets)
+            .values(key=key, count=cost, window_started_at=now, updated_at=now)
+            .on_conflict_do_update(
+                index_elements=[buckets.c.key],
+                set_={
+                    "count": case((expired, cost), else_=buckets.c.count + cost),
+                    "window_started_at": case((expired, now), else_=buckets.c.window_started_at),
+                    "updated_at": now,
+                },
+                # When this is false the row is left alone and RETURNING yields nothing: the call is rejected.
+                where=expired | (buckets.c.count + cost <= self.max_requests),
+            )
+            .returning(buckets.c.count)
+        )
+        with self.engine.begin() as conn:
+            count = conn.execute(stmt).scalar()
+            if time.monotonic() >= self._next_purge_at:
+                self._next_purge_at = time.monotonic() + self.purge_interval_seconds
+                conn.execute(delete(RateLimitBucket).where(RateLimitBucket.window_started_at < window_cutoff))
+        if count is None:
             return False, 0
+        return True, self.max_requests - count
+
 
-        bucket.count += 1
-        db.commit()
-        return True, self.max_requests - bucket.count
+def build_rate_limiter(settings: Settings, engine: Engine) -> RateLimiter:
+    max_requests = settings.rate_limit_create_delete_per_window
+    if settings.rate_limit_backend == "database":
+        return DatabaseRateLimiter(
+            engine, max_requests, settings.rate_limit_window_seconds, settings.rate_limit_purge_interval_seconds
+        )
+    return LocalRateLimiter(max_requests, settings.rate_limit_window_seconds)
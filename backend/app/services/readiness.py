@@ -1,19 +1,112 @@
+import asyncio
+import random
 import time
+from dataclasses import dataclass
 
 import httpx
+from prometheus_client import Histogram
+
+from app.core.config import Settings
+
+store_time_to_ready_seconds = Histogram(
+    "store_time_to_ready_seconds",
+    "Time from the end of helm install until the store passed its readiness check",
+    ["outcome"],
+    buckets=(1, 2.5, 5, 10, 20, 30, 60, 90, 120, 180, 240, 300, 600),
+)
+
+
+@dataclass(frozen=True)
+class ReadinessCriteria:
+    path: str = "/"
+    status_min: int = 200
+    status_max: int = 499
+    body_marker: str = ""
+
+    def describe_failure(self, response: httpx.Response) -> str | None:
+        if not self.status_min <= response.status_code <= self.status_max:
+            return f"status={response.status_code}"
+        if self.body_marker and self.body_marker not in response.text:
+            return f"body marker {self.body_marker!r} not found"
+        return None
+
+
+# The Store API only answers once WordPress, WooCommerce and the database are all up.
+WOOCOMMERCE_READINESS = ReadinessCriteria(path="/wp-json/wc/store/v1/products", status_min=200, status_max=299)
+
+
+def readiness_criteria_from_settings(settings: Settings) -> ReadinessCriteria:
+    if settings.http_ready_profile == "woocommerce":
+        return WOOCOMMERCE_READINESS
+    return ReadinessCriteria(
+        path=settings.http_ready_path,
+        status_min=settings.http_ready_status_min,
+        status_max=settings.http_ready_status_max,
+        body_marker=settings.http_ready_body_marker,
+    )
 
 
 class ReadinessService:
-    def wait_for_http_ok(self, url: str, timeout_seconds: int, poll_seconds: int) -> None:
-        deadline = time.time() + timeout_seconds
+    def __init__(
+        self,
+        max_connections: int = 100,
+        request_timeout_seconds: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.max_connections = max_connections
+        self.request_timeout_seconds = request_timeout_seconds
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # One pooled client is shared by every pending store, so concurrent waits cost sockets, not threads.
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.request_timeout_seconds,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def wait_until_ready(
+        self,
+        url: str,
+        timeout_seconds: float,
+        criteria: ReadinessCriteria = ReadinessCriteria(),
+        initial_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 15.0,
+    ) -> float:
+        client = self._get_client()
+        probe_url = f"{url.rstrip('/')}{criteria.path}"
+        started = time.monotonic()
+        deadline = started + timeout_seconds
+        backoff_seconds = initial_backoff_seconds
         last_error = "unknown"
-        while time.time() < deadline:
+
+        while True:
             try:
-                response = httpx.get(url, timeout=10.0, follow_redirects=True)
-                if response.status_code < 500:
-                    return
-                last_error = f"status={response.status_code}"
-            except Exception as exc:  # noqa: BLE001
-                last_error = str(exc)
-            time.sleep(poll_seconds)
+                response = await client.get(probe_url)
+                failure = criteria.describe_failure(response)
+                if failure is None:
+                    elapsed = time.monotonic() - started
+                    store_time_to_ready_seconds.labels(outcome="ready").observe(elapsed)
+                    return elapsed
+                last_error = failure
+            except httpx.HTTPError as exc:
+                last_error = str(exc) or type(exc).__name__
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Jitter spreads probes for stores installed in the same wave.
+            await asyncio.sleep(min(remaining, random.uniform(backoff_seconds / 2, backoff_seconds)))
+            backoff_seconds = min(backoff_seconds * 2, max_backoff_seconds)
+
+        store_time_to_ready_seconds.labels(outcome="timeout").observe(time.monotonic() - started)
         raise TimeoutError(f"Store URL did not become ready in time: {last_error}")
@@ -0,0 +1,155 @@
+import logging
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.timestamps import as_utc
+from app.models.enums import JobAction, JobStatus, StoreStatus
+from app.models.provisioning_job import ProvisioningJob
+from app.models.store import Store
+from app.services.events import log_event
+from app.services.job_notify import notify_jobs_queued
+from app.services.locks import RECONCILER_LOCK_KEY, try_xact_lock
+from app.services.warm_pool import WARM_POOL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Store namespaces and releases are both named store-<uuid>; anything else in the cluster is not ours to judge.
+STORE_NAME_PATTERN = re.compile(r"^store-[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+
+DRIFT_KINDS = ("missing_release", "failed_release", "stuck_release", "orphaned", "untracked")
+
+store_drift = Gauge("store_drift", "Stores whose cluster state disagreed with the database on the last pass", ["kind"])
+reconciler_repairs_total = Counter(
+    "reconciler_repairs_total", "Repair and cleanup jobs enqueued by the reconciler", ["kind", "action"]
+)
+reconciler_pass_duration_seconds = Histogram(
+    "reconciler_pass_duration_seconds",
+    "Time for one reconciler pass, cluster listing included",
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+
+@dataclass(frozen=True)
+class Drift:
+    kind: str
+    namespace: str
+    store_id: uuid.UUID | None
+    detail: str
+
+
+def find_drift(
+    stores: list, releases: dict[tuple[str, str], str], namespaces: set[str], cutoff: datetime
+) -> list[Drift]:
+    # `stores` rows carry (id, namespace, release_name, status, updated_at, busy); `releases` maps (namespace, name)
+    # to helm's status. Stores with an active job or a change after `cutoff` are mid-transition and never flagged.
+    drift = []
+    known = set()
+    for store_id, namespace, release_name, status, updated_at, busy in stores:
+        known.add(namespace)
+        if busy or as_utc(updated_at) >= as_utc(cutoff):
+            continue
+        release_status = releases.get((namespace, release_name))
+        if status in {StoreStatus.READY, StoreStatus.WARM}:
+            if release_status is None:
+                drift.append(Drift("missing_release", namespace, store_id, "Helm release not found"))
+            elif release_status == "failed":
+                drift.append(Drift("failed_release", namespace, store_id, "Helm release is failed"))
+            elif release_status != "deployed":
+                # pending-* and uninstalling releases cannot be upgraded over; they need a look from an operator.
+                drift.append(Drift("stuck_release", namespace, store_id, f"Helm release is {release_status}"))
+        elif status in {StoreStatus.DELETING, StoreStatus.DELETED}:
+            if namespace in namespaces or release_status is not None:
+                drift.append(Drift("orphaned", namespace, store_id, "Namespace or release outlived its store"))
+
+    leftovers = {name for name in namespaces if STORE_NAME_PATTERN.match(name)}
+    leftovers.update(namespace for namespace, name in releases if STORE_NAME_PATTERN.match(name))
+    for namespace in sorted(leftovers - known):
+        drift.append(Drift("untracked", namespace, None, "No store row for this namespace"))
+    return drift
+
+
+def reconcile_stores(
+    db: Session,
+    releases: dict[tuple[str, str], str],
+    namespaces: set[str],
+    cutoff: datetime,
+    max_attempts: int,
+    notify_channel: str,
+) -> list[Drift] | None:
+    # One pass over a cluster snapshot taken before `cutoff`: diff it against stores and enqueue a PROVISION job to
+    # reinstall each missing or failed release, or a DELETE job for each orphan. Returns None when another worker
+    # holds the lock.
+    with db.begin():
+        # Only one worker enqueues repairs at a time.
+        if not try_xact_lock(db, RECONCILER_LOCK_KEY):
+            return None
+
+        busy = exists().where(
+            ProvisioningJob.store_id == Store.id,
+            ProvisioningJob.status.in_([JobStatus.QUEUED, JobStatus.IN_PROGRESS]),
+        )
+        columns = (Store.id, Store.namespace, Store.release_name, Store.status, Store.updated_at, busy)
+        stores = list(db.execute(select(*columns).where(Store.status != StoreStatus.DELETED)))
+        # Tombstones pile up over time, so only those whose namespace or release is still around are loaded.
+        live = {row.namespace for row in stores}
+        cluster = {name for name in namespaces if STORE_NAME_PATTERN.match(name)}
+        cluster.update(namespace for namespace, _name in releases)
+        unmatched = cluster - live
+        if unmatched:
+            stores += db.execute(
+                select(*columns).where(Store.status == StoreStatus.DELETED, Store.namespace.in_(unmatched))
+            ).all()
+
+        drift = find_drift(stores, releases, namespaces, cutoff)
+        for kind in DRIFT_KINDS:
+            store_drift.labels(kind=kind).set(sum(1 for item in drift if item.kind == kind))
+        statuses = {row.id: row.status for row in stores}
+        jobs = []
+        for item in drift:
+            if item.kind in {"stuck_release", "untracked"}:
+                logger.warning("Store drift (%s) in %s: %s", item.kind, item.namespace, item.detail)
+                continue
+            action = _repair(db, item, statuses[item.store_id])
+            jobs.append(
+                {
+                    "id": uuid.uuid4(),
+                    "store_id": item.store_id,
+                    "action": action,
+                    "status": JobStatus.QUEUED,
+                    "max_attempts": max_attempts,
+                }
+            )
+            reconciler_repairs_total.labels(kind=item.kind, action=action.value).inc()
+        if jobs:
+            db.execute(insert(ProvisioningJob), jobs)
+            notify_jobs_queued(db, notify_channel)
+        return drift
+
+
+def _repair(db: Session, item: Drift, status: StoreStatus) -> JobAction:
+    # Status changes go through log_event in this transaction, like every other transition.
+    if item.kind == "orphaned":
+        # The store holds cluster resources again until the teardown finishes, so it counts as active meanwhile.
+        if status == StoreStatus.DELETED:
+            _set_status(db, item.store_id, StoreStatus.DELETING)
+        log_event(db, item.store_id, "drift_detected", f"{item.detail}; queued teardown")
+        return JobAction.DELETE
+    if status in WARM_POOL_STATUSES:
+        # A broken pool store is cheaper to replace than to repair; WARMING keeps it from being claimed.
+        _set_status(db, item.store_id, StoreStatus.WARMING)
+        log_event(db, item.store_id, "drift_detected", f"{item.detail}; replacing pool store")
+        return JobAction.DELETE
+    log_event(db, item.store_id, "drift_detected", f"{item.detail}; queued reinstall")
+    return JobAction.PROVISION
+
+
+def _set_status(db: Session, store_id: uuid.UUID, status: StoreStatus) -> None:
+    db.execute(
+        update(Store).where(Store.id == store_id).values(status=status).execution_options(synchronize_session=False)
+    )
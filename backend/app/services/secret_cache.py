@@ -0,0 +1,75 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from prometheus_client import Counter, Gauge
+
+secret_cache_lookups_total = Counter(
+    "secret_cache_lookups_total", "Secret cache lookups by result (hit, miss, coalesced)", ["result"]
+)
+secret_cache_entries = Gauge("secret_cache_entries", "Secrets currently held in the cache")
+
+SecretLoader = Callable[[str, str], dict]
+
+
+class SecretCache:
+    # Read-through cache of Secret data keyed by (namespace, name), bounded by TTL and entry count (LRU).
+    # Concurrent misses for one key share a single load, so a burst of requests costs one API call or
+    # kubectl fork. Failed loads are not cached.
+
+    def __init__(self, loader: SecretLoader, ttl_seconds: float = 300.0, max_entries: int = 1024):
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[float, dict]] = OrderedDict()
+        self._loading: dict[tuple[str, str], asyncio.Task] = {}
+
+    async def get(self, namespace: str, name: str) -> dict:
+        key = (namespace, name)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, payload = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                secret_cache_lookups_total.labels(result="hit").inc()
+                return payload
+            del self._entries[key]
+
+        task = self._loading.get(key)
+        if task is None:
+            secret_cache_lookups_total.labels(result="miss").inc()
+            task = self._loading[key] = asyncio.create_task(self._load(key))
+        else:
+            secret_cache_lookups_total.labels(result="coalesced").inc()
+        # Shielded so one disconnected client does not cancel the load other callers are waiting on.
+        return await asyncio.shield(task)
+
+    def invalidate_namespace(self, namespace: str) -> None:
+        for key in [key for key in self._entries if key[0] == namespace]:
+            del self._entries[key]
+        # A load already in flight still answers its callers but is no longer stored.
+        for key in [key for key in self._loading if key[0] == namespace]:
+            del self._loading[key]
+        secret_cache_entries.set(len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        secret_cache_entries.set(0)
+
+    async def _load(self, key: tuple[str, str]) -> dict:
+        current = asyncio.current_task()
+        try:
+            # Only the data map is kept; metadata such as managedFields is most of a Secret's size.
+            payload = {"data": (await asyncio.to_thread(self.loader, *key)).get("data", {})}
+        finally:
+            stored = self._loading.get(key) is current
+            if stored:
+                del self._loading[key]
+        if stored:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            secret_cache_entries.set(len(self._entries))
+        return payload
@@ -0,0 +1,101 @@
+import uuid
+from datetime import datetime, timezone
+
+from prometheus_client import Counter
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models.enums import JobAction, JobStatus, StoreEngine, StoreStatus
+from app.models.provisioning_job import ProvisioningJob
+from app.models.store import Store
+from app.models.store_event import StoreEvent
+from app.services.capacity import store_status_counts
+from app.services.events import log_event
+from app.services.job_notify import notify_jobs_queued
+from app.services.locks import WARM_POOL_LOCK_KEY, try_xact_lock
+
+# Pool stores are ordinary stores that nobody owns yet: hidden from listings, syncs and the event stream, and not
+# counted against max_active_stores until claimed.
+WARM_POOL_STATUSES = [StoreStatus.WARMING, StoreStatus.WARM]
+
+warm_pool_claims_total = Counter(
+    "warm_pool_claims_total", "Store creations by whether a warm store was claimed (miss = cold provision)", ["result"]
+)
+warm_pool_stores_queued_total = Counter("warm_pool_stores_queued_total", "Stores queued to refill the warm pool")
+
+
+def claim_warm_store(
+    db: Session, engine: StoreEngine, display_name: str | None, max_attempts: int
+) -> tuple[Store, ProvisioningJob] | None:
+    # The caller reserves capacity first, then notifies and commits. SKIP LOCKED lets concurrent creates claim
+    # different stores instead of queueing behind the same row.
+    store = db.scalar(
+        select(Store)
+        .where(Store.status == StoreStatus.WARM, Store.engine == engine)
+        .order_by(Store.created_at, Store.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if store is None:
+        warm_pool_claims_total.labels(result="miss").inc()
+        return None
+    store.status = StoreStatus.READY
+    store.display_name = display_name
+    # The store's age starts when its owner asked for it, not when the pool built it.
+    store.created_at = datetime.now(timezone.utc)
+    log_event(db, store.id, "claimed", "Assigned from the warm pool")
+    # The store serves right away; an UPGRADE job without a fleet upgrade re-renders its values so the site title
+    # follows the display name, as a cold install would have set it.
+    job = ProvisioningJob(
+        id=uuid.uuid4(),
+        store_id=store.id,
+        action=JobAction.UPGRADE,
+        status=JobStatus.QUEUED,
+        max_attempts=max_attempts,
+    )
+    db.add(job)
+    warm_pool_claims_total.labels(result="hit").inc()
+    return store, job
+
+
+def replenish_warm_pool(db: Session, size: int, max_attempts: int, notify_channel: str) -> int:
+    # Queues enough WARMING stores to bring the pool back to `size`. Stores still installing count towards the
+    # pool, so a slow install is never doubled up. Returns how many stores were queued.
+    with db.begin():
+        # Only one worker tops the pool up at a time.
+        if not try_xact_lock(db, WARM_POOL_LOCK_KEY):
+            return 0
+        counts = store_status_counts(db)
+        deficit = size - sum(counts[status] for status in WARM_POOL_STATUSES)
+        if deficit <= 0:
+            return 0
+
+        store_rows, job_rows, event_rows = [], [], []
+        for _ in range(deficit):
+            store_id = uuid.uuid4()
+            namespace = f"store-{store_id}"
+            store_rows.append(
+                {
+                    "id": store_id,
+                    "engine": StoreEngine.WOOCOMMERCE,
+                    "namespace": namespace,
+                    "release_name": namespace,
+                    "status": StoreStatus.WARMING,
+                }
+            )
+            job_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "store_id": store_id,
+                    "action": JobAction.PROVISION,
+                    "status": JobStatus.QUEUED,
+                    "max_attempts": max_attempts,
+                }
+            )
+            event_rows.append({"store_id": store_id, "event_type": "queued", "message": "Queued for the warm pool"})
+        db.execute(insert(Store), store_rows)
+        db.execute(insert(ProvisioningJob), job_rows)
+        db.execute(insert(StoreEvent), event_rows)
+        notify_jobs_queued(db, notify_channel)
+        warm_pool_stores_queued_total.inc(deficit)
+        return deficit
@@ -0,0 +1,15 @@
+import logging
+
+import uvicorn
+
+from app.core.config import get_settings
+
+
+def main() -> None:
+    settings = get_settings()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    uvicorn.run("app.workers.app:app", host=settings.worker_health_host, port=settings.worker_health_port)
+
+
+if __name__ == "__main__":
+    main()
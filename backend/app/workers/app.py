@@ -0,0 +1,41 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.core.config import get_settings
+from app.schemas.health import HealthResponse
+from app.workers.provisioner import ProvisioningWorker
+
+settings = get_settings()
+app = FastAPI(title="Store Provisioning Worker", version="0.1.0")
+
+worker = ProvisioningWorker(settings)
+worker_task: asyncio.Task | None = None
+
+
+@app.on_event("startup")
+async def startup_event() -> None:
+    global worker_task
+    worker_task = asyncio.create_task(worker.start())
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    # uvicorn turns SIGTERM into lifespan shutdown, so this is the graceful drain path.
+    await worker.drain(settings.worker_drain_timeout_seconds)
+    if worker_task:
+        worker_task.cancel()
+
+
+@app.get("/healthz", response_model=HealthResponse)
+def healthz():
+    if worker_task is None or worker_task.done():
+        return JSONResponse(status_code=503, content=HealthResponse(status="worker_stopped").model_dump())
+    return HealthResponse(status="ok")
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,158 +1,662 @@
 import asyncio
+import logging
+from contextlib import contextmanager
+import os
+import socket
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import and_, func, or_, select
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import or_, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import Settings
 from app.db.session import SessionLocal
-from app.models.enums import JobAction, JobStatus, StoreEngine, StoreStatus
+from app.db.timestamps import as_utc
+from app.models.enums import FleetUpgradeStatus, JobAction, JobStage, JobStatus, StoreEngine, StoreStatus
+from app.models.fleet_upgrade import FleetUpgrade
 from app.models.provisioning_job import ProvisioningJob
 from app.models.store import Store
-from app.services.events import log_event
-from app.services.helm import HelmService
-from app.services.kube import KubeService
-from app.services.readiness import ReadinessService
+from app.services.chart_cache import ChartArtifactCache, read_chart_version
+from app.services.event_retention import archive_expired_events
+from app.services.events import BufferedEventWriter, log_event
+from app.services.fleet_upgrade import (
+    UPGRADE_TARGET_STATUSES,
+    advance_fleet_upgrades,
+    deep_merge,
+    store_values_patch,
+)
+from app.services.helm import HelmService, release_fingerprint
+from app.services.job_notify import JobWakeupListener, listen_dsn
+from app.services.kube import build_kube_service
+from app.services.namespace_watcher import NamespaceTeardownWatcher
+from app.services.readiness import ReadinessService, readiness_criteria_from_settings
+from app.services.reconciler import reconcile_stores, reconciler_pass_duration_seconds
+from app.services.warm_pool import WARM_POOL_STATUSES, replenish_warm_pool
+
+logger = logging.getLogger(__name__)
+
+worker_lease_duration_seconds = Histogram(
+    "worker_lease_duration_seconds",
+    "Time spent claiming a batch of queued jobs in one statement",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+worker_jobs_leased_per_tick = Histogram(
+    "worker_jobs_leased_per_tick",
+    "Number of jobs claimed per worker tick",
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64),
+)
+worker_lease_renewals_total = Counter("worker_lease_renewals_total", "Job leases renewed by worker heartbeats")
+worker_leases_lost_total = Counter(
+    "worker_leases_lost_total", "In-flight jobs whose lease was no longer held by this worker at heartbeat time"
+)
+worker_lease_expirations_total = Counter(
+    "worker_lease_expirations_total", "IN_PROGRESS jobs requeued because their lease expired"
+)
+worker_jobs_in_stage = Gauge("worker_jobs_in_stage", "In-flight jobs on this worker by pipeline stage", ["stage"])
+worker_jobs_in_flight = Gauge(
+    "worker_jobs_in_flight", "Jobs currently being processed by this worker", ["action", "engine"]
+)
+worker_job_attempts_total = Counter(
+    "worker_job_attempts_total",
+    "Finished job attempts by attempt number and outcome (succeeded, retried, failed)",
+    ["action", "engine", "attempt", "outcome"],
+)
+job_queue_wait_seconds = Histogram(
+    "job_queue_wait_seconds",
+    "Time from job creation until a worker leased its first attempt",
+    ["action", "engine"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+pipeline_step_duration_seconds = Histogram(
+    "pipeline_step_duration_seconds",
+    "Duration of each provisioning pipeline step",
+    ["step", "action", "engine", "outcome"],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 180, 300, 600, 1200),
+)
+helm_upgrades_skipped_total = Counter(
+    "helm_upgrades_skipped_total", "Installs skipped because the deployed release already matched the rendered values"
+)
+store_provision_duration_seconds = Histogram(
+    "store_provision_duration_seconds",
+    "End-to-end time from store creation until it was marked READY",
+    ["engine"],
+    buckets=(5, 10, 20, 30, 60, 90, 120, 180, 300, 600, 1200, 1800, 3600),
+)
+
+
+def _elapsed_seconds(since: datetime, until: datetime) -> float:
+    return max((as_utc(until) - as_utc(since)).total_seconds(), 0.0)
+
+
+def _commit_reading_values_patch(db: Session, store_id: uuid.UUID) -> dict:
+    # Read before the commit: a query afterwards would open a transaction that stays idle through Helm.
+    values_patch = store_values_patch(db, store_id)
+    db.commit()
+    return values_patch
+
+
+def resolve_worker_id(settings: Settings) -> str:
+    if settings.worker_id:
+        return settings.worker_id
+    # Pods share one config, so derive a per-pod identity for lease ownership.
+    return f"{os.environ.get('POD_NAME') or socket.gethostname()}-{os.getpid()}"
 
 
 class ProvisioningWorker:
     def __init__(self, settings: Settings):
         self.settings = settings
+        self.worker_id = resolve_worker_id(settings)
         self.helm = HelmService(settings.helm_binary)
-        self.kube = KubeService(settings.kubectl_binary, settings.kubectl_delete_timeout_seconds)
-        self.readiness = ReadinessService()
-        self._tasks: set[asyncio.Task] = set()
+        self.chart_cache = ChartArtifactCache(self.helm, settings.helm_chart_path, settings.helm_chart_cache_dir)
+        self.kube = build_kube_service(settings)
+        self.namespace_watcher = NamespaceTeardownWatcher(self.kube, poll_seconds=settings.namespace_watch_poll_seconds)
+        self.readiness = ReadinessService(max_connections=settings.http_ready_max_connections)
+        self.readiness_criteria = readiness_criteria_from_settings(settings)
+        self.event_writer = BufferedEventWriter(SessionLocal)
+        self._tasks: dict[uuid.UUID, asyncio.Task] = {}
+        # Only the install stage counts against worker_max_concurrency; readiness waits have their own budget.
+        self._install_slots: set[uuid.UUID] = set()
+        self._ready_slots = asyncio.Semaphore(settings.worker_readiness_concurrency)
+        # Jobs parked on the teardown watcher cost nothing and are excluded from every budget.
+        self._teardown_waits: set[uuid.UUID] = set()
+        self._background: list[asyncio.Task] = []
         self._running = False
+        self._wakeup = asyncio.Event()
+        self._listener: JobWakeupListener | None = None
+        dsn = listen_dsn(settings.database_url) if settings.worker_listen_enabled else None
+        if dsn:
+            self._listener = JobWakeupListener(dsn, settings.worker_notify_channel, self._wakeup)
 
     async def start(self) -> None:
         self._running = True
-        self._requeue_stale_jobs()
-        while self._running:
-            await self._tick()
-            await asyncio.sleep(self.settings.worker_poll_seconds)
+        await asyncio.to_thread(self._requeue_stale_jobs)
+        # Background tasks outlive the lease loop so heartbeats keep covering jobs while draining.
+        self._background = [
+            asyncio.create_task(self._every(self.settings.worker_heartbeat_seconds, self._renew_leases)),
+            asyncio.create_task(self._every(self.settings.worker_stale_check_seconds, self._requeue_stale_jobs)),
+            asyncio.create_task(self._every(self.settings.store_events_flush_seconds, self.event_writer.flush)),
+            asyncio.create_task(
+                self._every(self.settings.store_events_retention_interval_seconds, self._archive_expired_events)
+            ),
+            asyncio.create_task(self._every(self.settings.fleet_upgrade_poll_seconds, self._advance_fleet_upgrades)),
+            asyncio.create_task(self._every(self.settings.warm_pool_check_seconds, self._replenish_warm_pool)),
+        ]
+        if self.settings.reconciler_interval_seconds > 0:
+            self._background.append(
+                asyncio.create_task(self._every(self.settings.reconciler_interval_seconds, self._reconcile_stores))
+            )
+        if self._listener:
+            self._background.append(asyncio.create_task(self._listener.run()))
+        await self._prepare_chart()
+
+        poll_seconds = self.settings.worker_poll_seconds
+        try:
+            while self._running:
+                leased = await self._tick()
+                poll_seconds = self._next_poll_interval(poll_seconds, leased)
+                await self._wait_for_wakeup(poll_seconds)
+        except asyncio.CancelledError:
+            self._cancel_background()
+            raise
+
+    async def _prepare_chart(self) -> None:
+        if not self.settings.helm_chart_cache_enabled:
+            return
+        try:
+            await self.chart_cache.ensure()
+        except Exception:  # noqa: BLE001
+            # Installs fall back to the chart directory, which is how they ran before the cache existed.
+            logger.exception(
+                "Could not prepare the packaged store chart; installing from %s", self.chart_cache.chart_ref
+            )
 
     def stop(self) -> None:
         self._running = False
+        self._wakeup.set()
+
+    async def drain(self, timeout_seconds: float) -> None:
+        self.stop()
+        pending = list(self._tasks.values())
+        if pending:
+            logger.info("Draining %d in-flight job(s), waiting up to %ss", len(pending), timeout_seconds)
+            _done, unfinished = await asyncio.wait(pending, timeout=timeout_seconds)
+            if unfinished:
+                # Cancelling kills the job's helm/kubectl child, so the lease can be handed back right away.
+                logger.warning("Drain timed out; requeueing %d unfinished job(s)", len(unfinished))
+                unfinished_ids = [job_id for job_id, task in self._tasks.items() if task in unfinished]
+                for task in unfinished:
+                    task.cancel()
+                await asyncio.gather(*unfinished, return_exceptions=True)
+                await asyncio.to_thread(self._release_leases, unfinished_ids)
+        self._cancel_background()
+        try:
+            await asyncio.to_thread(self.event_writer.flush)
+        except Exception:  # noqa: BLE001
+            logger.exception("Could not flush buffered store events during drain")
+        await self.namespace_watcher.stop()
+        await self.readiness.aclose()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def _cancel_background(self) -> None:
+        for task in self._background:
+            task.cancel()
+        self._background = []
+
+    def _next_poll_interval(self, current_seconds: float, leased: int) -> float:
+        base_seconds = self.settings.worker_poll_seconds
+        # Without a live LISTEN connection, polling is the only wakeup source; keep it at the base rate.
+        if leased or not (self._listener and self._listener.connected):
+            return base_seconds
+        return min(max(current_seconds, base_seconds) * 2, self.settings.worker_poll_max_seconds)
+
+    async def _wait_for_wakeup(self, timeout_seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
 
-    async def _tick(self) -> None:
-        self._tasks = {task for task in self._tasks if not task.done()}
-        available_slots = max(0, self.settings.worker_max_concurrency - len(self._tasks))
-
-        for _ in range(available_slots):
-            job_id = self._lease_next_job()
-            if not job_id:
-                break
+    async def _every(self, interval_seconds: float, fn) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                if asyncio.iscoroutinefunction(fn):
+                    await fn()
+                else:
+                    # Plain functions do blocking database work; a pool wait must not stall heartbeats or jobs.
+                    await asyncio.to_thread(fn)
+            except Exception:  # noqa: BLE001
+                logger.exception("Periodic worker task %s failed", fn.__name__)
+
+    async def _tick(self) -> int:
+        install_free = self.settings.worker_max_concurrency - len(self._install_slots)
+        busy = len(self._tasks) - len(self._teardown_waits)
+        total_free = self.settings.worker_max_concurrency + self.settings.worker_readiness_concurrency - busy
+        available_slots = max(0, min(install_free, total_free))
+        if available_slots == 0:
+            return 0
+
+        job_ids = await asyncio.to_thread(self._lease_jobs, available_slots)
+        for job_id in job_ids:
+            self._install_slots.add(job_id)
             task = asyncio.create_task(self._run_job(job_id))
-            self._tasks.add(task)
-            task.add_done_callback(self._tasks.discard)
+            self._tasks[job_id] = task
+            task.add_done_callback(lambda _task, job_id=job_id: self._release_slot(job_id))
+        return len(job_ids)
+
+    def _leave_install_stage(self, job_id) -> None:
+        if job_id in self._install_slots:
+            self._install_slots.discard(job_id)
+            # The next install can start while this job waits for readiness.
+            self._wakeup.set()
+
+    def _release_slot(self, job_id) -> None:
+        self._tasks.pop(job_id, None)
+        self._install_slots.discard(job_id)
+        self._teardown_waits.discard(job_id)
+        # A freed slot may be filled immediately instead of after the next poll interval.
+        self._wakeup.set()
+
+    async def _renew_leases(self) -> int:
+        # One batched heartbeat for every in-flight job keeps long Helm installs from looking stale. The ids are
+        # read on the loop, which is the only place _tasks changes.
+        job_ids = list(self._tasks)
+        if not job_ids:
+            return 0
+
+        renewed = await asyncio.to_thread(self._renew_lease_rows, job_ids)
+        worker_lease_renewals_total.inc(renewed)
+        if renewed < len(job_ids):
+            worker_leases_lost_total.inc(len(job_ids) - renewed)
+        return renewed
+
+    def _renew_lease_rows(self, job_ids: list) -> int:
+        stmt = (
+            update(ProvisioningJob)
+            .where(
+                ProvisioningJob.id.in_(job_ids),
+                ProvisioningJob.status == JobStatus.IN_PROGRESS,
+                ProvisioningJob.locked_by == self.worker_id,
+            )
+            .values(locked_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        with SessionLocal() as db:
+            with db.begin():
+                return db.execute(stmt).rowcount
+
+    async def _archive_expired_events(self, max_batches: int = 20) -> int:
+        if self.settings.store_events_retention_days <= 0:
+            return 0
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.settings.store_events_retention_days)
+        batch_size = self.settings.store_events_retention_batch_size
+        archived = 0
+        # Bounded per run so a large backlog is worked off over several intervals, off the event loop.
+        for _ in range(max_batches):
+            moved = await asyncio.to_thread(self._archive_event_batch, cutoff, batch_size)
+            archived += moved
+            if moved < batch_size:
+                break
+        return archived
 
-    def _requeue_stale_jobs(self) -> None:
-        lease_cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.settings.worker_lease_seconds)
+    async def _advance_fleet_upgrades(self) -> None:
+        await asyncio.to_thread(self._advance_fleet_upgrade_waves)
+
+    def _advance_fleet_upgrade_waves(self) -> None:
         with SessionLocal() as db:
-            stale_jobs = db.scalars(
-                select(ProvisioningJob).where(
-                    and_(
-                        ProvisioningJob.status == JobStatus.IN_PROGRESS,
-                        or_(ProvisioningJob.locked_at.is_(None), ProvisioningJob.locked_at < lease_cutoff),
-                    )
-                )
-            ).all()
-            for job in stale_jobs:
-                job.status = JobStatus.QUEUED
-                job.locked_by = None
-                job.locked_at = None
-            db.commit()
+            advance_fleet_upgrades(db, self.settings.worker_max_attempts, self.settings.worker_notify_channel)
+
+    async def _replenish_warm_pool(self) -> int:
+        if self.settings.warm_pool_size <= 0:
+            return 0
+        return await asyncio.to_thread(self._queue_warm_stores)
+
+    def _queue_warm_stores(self) -> int:
+        with SessionLocal() as db:
+            return replenish_warm_pool(
+                db, self.settings.warm_pool_size, self.settings.worker_max_attempts, self.settings.worker_notify_channel
+            )
+
+    async def _reconcile_stores(self) -> int:
+        started = time.perf_counter()
+        # Rows changed after this point may be newer than the snapshot below.
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.settings.reconciler_grace_seconds)
+        releases = await self.helm.list_releases(name_filter="^store-")
+        namespaces = await self.kube.list_namespace_names()
+        drift = await asyncio.to_thread(self._reconcile_snapshot, releases, namespaces, cutoff)
+        reconciler_pass_duration_seconds.observe(time.perf_counter() - started)
+        return len(drift or [])
+
+    def _reconcile_snapshot(self, releases: dict, namespaces: set[str], cutoff: datetime):
+        with SessionLocal() as db:
+            return reconcile_stores(
+                db,
+                releases,
+                namespaces,
+                cutoff,
+                self.settings.worker_max_attempts,
+                self.settings.worker_notify_channel,
+            )
 
-    def _lease_next_job(self):
-        now = datetime.now(timezone.utc)
+    def _archive_event_batch(self, cutoff: datetime, batch_size: int) -> int:
+        with SessionLocal() as db:
+            return archive_expired_events(db, cutoff, batch_size)
+
+    def _release_leases(self, job_ids: list) -> int:
+        if not job_ids:
+            return 0
+        stmt = (
+            update(ProvisioningJob)
+            .where(
+                ProvisioningJob.id.in_(job_ids),
+                ProvisioningJob.status == JobStatus.IN_PROGRESS,
+                ProvisioningJob.locked_by == self.worker_id,
+            )
+            .values(status=JobStatus.QUEUED, locked_by=None, locked_at=None)
+            .execution_options(synchronize_session=False)
+        )
         with SessionLocal() as db:
             with db.begin():
-                job = db.scalar(
-                    select(ProvisioningJob)
-                    .where(ProvisioningJob.status == JobStatus.QUEUED)
-                    .order_by(ProvisioningJob.created_at.asc())
-                    .with_for_update(skip_locked=True)
-                    .limit(1)
-                )
-                if not job:
-                    return None
-                job.status = JobStatus.IN_PROGRESS
-                job.locked_by = self.settings.worker_id
-                job.locked_at = now
-                job.attempt += 1
-                db.add(job)
-                return job.id
-
-    async def _run_job(self, job_id):
-        await asyncio.to_thread(self._process_job_sync, job_id)
-
-    def _process_job_sync(self, job_id) -> None:
+                return db.execute(stmt).rowcount
+
+    def _requeue_stale_jobs(self) -> int:
+        lease_cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.settings.worker_lease_seconds)
+        stmt = (
+            update(ProvisioningJob)
+            .where(
+                ProvisioningJob.status == JobStatus.IN_PROGRESS,
+                or_(ProvisioningJob.locked_at.is_(None), ProvisioningJob.locked_at < lease_cutoff),
+            )
+            .values(status=JobStatus.QUEUED, locked_by=None, locked_at=None)
+            .execution_options(synchronize_session=False)
+        )
         with SessionLocal() as db:
-            job = db.get(ProvisioningJob, job_id)
-            if not job:
-                return
+            with db.begin():
+                expired = db.execute(stmt).rowcount
+
+        worker_lease_expirations_total.inc(expired)
+        return expired
+
+    def _lease_jobs(self, limit: int) -> list:
+        # Claim up to `limit` jobs in a single UPDATE ... RETURNING round-trip; SKIP LOCKED
+        # keeps concurrent workers from blocking on each other's candidate rows.
+        candidates = (
+            select(ProvisioningJob.id)
+            .where(ProvisioningJob.status == JobStatus.QUEUED)
+            .order_by(ProvisioningJob.created_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(ProvisioningJob)
+            .where(ProvisioningJob.id.in_(candidates))
+            .values(
+                status=JobStatus.IN_PROGRESS,
+                locked_by=self.worker_id,
+                locked_at=datetime.now(timezone.utc),
+                attempt=ProvisioningJob.attempt + 1,
+            )
+            .returning(ProvisioningJob.id)
+            .execution_options(synchronize_session=False)
+        )
 
-            store = db.get(Store, job.store_id)
-            if not store:
-                job.status = JobStatus.FAILED
-                job.error_message = "store_not_found"
-                db.commit()
-                return
+        started = time.perf_counter()
+        with SessionLocal() as db:
+            with db.begin():
+                job_ids = list(db.scalars(stmt))
+        worker_lease_duration_seconds.observe(time.perf_counter() - started)
+        worker_jobs_leased_per_tick.observe(len(job_ids))
+        return job_ids
 
-            # If teardown was requested, any pending/leased provision job becomes a no-op.
-            if job.action == JobAction.PROVISION and store.status in {StoreStatus.DELETING, StoreStatus.DELETED}:
-                job.status = JobStatus.SUCCEEDED
-                job.error_message = "provision_skipped_store_teardown_requested"
-                job.completed_at = datetime.now(timezone.utc)
-                db.commit()
-                return
+    async def _run_job(self, job_id) -> None:
+        # Helm and kubectl run as asyncio subprocesses, so a job holds no executor thread while it waits.
+        await self._process_job(job_id)
 
-            # Delete is idempotent; if already deleted, mark job complete.
-            if job.action == JobAction.DELETE and store.status == StoreStatus.DELETED:
-                job.status = JobStatus.SUCCEEDED
-                job.completed_at = datetime.now(timezone.utc)
-                db.commit()
+    async def _process_job(self, job_id) -> None:
+        # Database work runs on a thread; only the Helm, kubectl and readiness awaits stay on the event loop.
+        with SessionLocal() as db:
+            started = await asyncio.to_thread(self._start_job, db, job_id)
+            if started is None:
                 return
+            job, store, upgrade = started
 
+            action = job.action.value
+            engine = store.engine.value
+            in_flight = worker_jobs_in_flight.labels(action=action, engine=engine)
+            in_flight.inc()
             try:
                 if job.action == JobAction.PROVISION:
-                    self._provision_store(db, store)
-                    job.status = JobStatus.SUCCEEDED
-                    job.completed_at = datetime.now(timezone.utc)
+                    await self._provision_store(db, store, job)
                 elif job.action == JobAction.DELETE:
-                    self._delete_store(db, store)
-                    job.status = JobStatus.SUCCEEDED
-                    job.completed_at = datetime.now(timezone.utc)
+                    await self._delete_store(db, store, job)
+                elif job.action == JobAction.UPGRADE:
+                    await self._upgrade_store(db, store, job, upgrade)
                 else:
                     raise RuntimeError(f"Unknown action: {job.action}")
-                db.commit()
+                job.status = JobStatus.SUCCEEDED
+                job.completed_at = datetime.now(timezone.utc)
+                await asyncio.to_thread(db.commit)
+                outcome = "succeeded"
             except Exception as exc:  # noqa: BLE001
-                store.last_error = str(exc)
-                job.error_message = str(exc)
-                if job.attempt >= job.max_attempts:
-                    job.status = JobStatus.FAILED
-                    store.status = StoreStatus.FAILED if job.action == JobAction.PROVISION else StoreStatus.DELETING
-                else:
-                    job.status = JobStatus.QUEUED
-                    job.locked_by = None
-                    job.locked_at = None
-                    store.status = StoreStatus.QUEUED if job.action == JobAction.PROVISION else StoreStatus.DELETING
-                log_event(db, store.id, "failed", str(exc))
+                outcome = await asyncio.to_thread(self._record_failure, db, store, job, exc)
+            finally:
+                in_flight.dec()
+            worker_job_attempts_total.labels(
+                action=action, engine=engine, attempt=str(job.attempt), outcome=outcome
+            ).inc()
+
+    def _start_job(self, db: Session, job_id) -> tuple[ProvisioningJob, Store, FleetUpgrade | None] | None:
+        # Returns None when there is nothing to run: the job or store is gone, or the job was settled as a no-op.
+        job = db.get(ProvisioningJob, job_id)
+        if not job:
+            return None
+
+        store = db.get(Store, job.store_id)
+        if not store:
+            job.status = JobStatus.FAILED
+            job.error_message = "store_not_found"
+            db.commit()
+            return None
+
+        # If teardown was requested, any pending/leased provision job becomes a no-op.
+        if job.action == JobAction.PROVISION and store.status in {StoreStatus.DELETING, StoreStatus.DELETED}:
+            job.status = JobStatus.SUCCEEDED
+            job.error_message = "provision_skipped_store_teardown_requested"
+            job.completed_at = datetime.now(timezone.utc)
+            db.commit()
+            return None
+
+        # Fleet upgrades only touch serving and warm stores, and stop touching them once the upgrade is halted.
+        # An UPGRADE job without a fleet upgrade re-applies the store's current values (a warm pool claim).
+        upgrade = None
+        if job.action == JobAction.UPGRADE:
+            upgrade = db.get(FleetUpgrade, job.fleet_upgrade_id) if job.fleet_upgrade_id else None
+            skip_reason = None
+            if job.fleet_upgrade_id and (upgrade is None or upgrade.status != FleetUpgradeStatus.RUNNING):
+                skip_reason = "upgrade_skipped_fleet_upgrade_stopped"
+            elif store.status not in UPGRADE_TARGET_STATUSES:
+                skip_reason = "upgrade_skipped_store_not_ready"
+            if skip_reason:
+                job.status = JobStatus.SUCCEEDED
+                job.error_message = skip_reason
+                job.completed_at = datetime.now(timezone.utc)
                 db.commit()
+                return None
+
+        # Delete is idempotent; if already deleted, mark job complete.
+        if job.action == JobAction.DELETE and store.status == StoreStatus.DELETED:
+            job.status = JobStatus.SUCCEEDED
+            job.completed_at = datetime.now(timezone.utc)
+            db.commit()
+            return None
 
-    def _provision_store(self, db: Session, store: Store) -> None:
+        if job.attempt == 1 and job.locked_at is not None:
+            job_queue_wait_seconds.labels(action=job.action.value, engine=store.engine.value).observe(
+                _elapsed_seconds(job.created_at, job.locked_at)
+            )
+        # End the read transaction before any await: a job resumed at WAIT_READY or WAIT_DELETED goes
+        # straight into a long wait, and an open transaction would pin a pooled connection through it.
+        db.commit()
+        return job, store, upgrade
+
+    def _record_failure(self, db: Session, store: Store, job: ProvisioningJob, exc: Exception) -> str:
+        store.last_error = str(exc)
+        job.error_message = str(exc)
+        if job.attempt >= job.max_attempts:
+            job.status = JobStatus.FAILED
+            outcome = "failed"
+        else:
+            job.status = JobStatus.QUEUED
+            job.locked_by = None
+            job.locked_at = None
+            outcome = "retried"
+        if job.action == JobAction.PROVISION and store.status == StoreStatus.WARMING:
+            # Nobody is waiting on a pool store; one that will not install is torn down and replaced.
+            if job.status == JobStatus.FAILED:
+                db.add(
+                    ProvisioningJob(
+                        store_id=store.id,
+                        action=JobAction.DELETE,
+                        status=JobStatus.QUEUED,
+                        max_attempts=self.settings.worker_max_attempts,
+                    )
+                )
+        elif job.action == JobAction.PROVISION:
+            store.status = StoreStatus.FAILED if job.status == JobStatus.FAILED else StoreStatus.QUEUED
+        elif job.action == JobAction.DELETE and store.status not in WARM_POOL_STATUSES:
+            store.status = StoreStatus.DELETING
+        # A failed upgrade was rolled back, by helm --atomic or after a failed readiness check, so the store
+        # keeps its status.
+        log_event(db, store.id, "failed", str(exc))
+        db.commit()
+        return outcome
+
+    async def _provision_store(self, db: Session, store: Store, job: ProvisioningJob) -> None:
         if store.engine == StoreEngine.MEDUSA:
             raise RuntimeError("Medusa is not enabled in Round 1")
 
+        store_host = self._build_store_host(str(store.id))
+        # A job requeued after its install finished resumes at the readiness wait.
+        if job.stage in {None, JobStage.INSTALL}:
+            await self._install_stage(db, store, job, store_host)
+        self._leave_install_stage(job.id)
+
+        url = f"http://{store_host}"
+        engine = store.engine.value
+        warming = store.status == StoreStatus.WARMING
+        with self._in_stage(JobStage.WAIT_READY):
+            async with self._ready_slots:
+                try:
+                    with self._timed_step("readiness_wait", JobAction.PROVISION, engine):
+                        await self.readiness.wait_until_ready(
+                            url=url,
+                            timeout_seconds=self.settings.http_ready_timeout_seconds,
+                            criteria=self.readiness_criteria,
+                            initial_backoff_seconds=self.settings.http_ready_backoff_initial_seconds,
+                            max_backoff_seconds=self.settings.http_ready_backoff_max_seconds,
+                        )
+                except Exception as exc:  # noqa: BLE001
+                    # A pool store is handed out as ready without another check, so it must pass this one.
+                    if warming:
+                        raise
+                    # Local ingress networking can be flaky in laptop runtimes; keep event visibility and continue.
+                    self.event_writer.write(
+                        store.id, "readiness_warning", f"HTTP check did not pass before timeout: {exc}"
+                    )
+
+        job.stage = JobStage.FINALIZE
+        # A store that already had a URL is being reinstalled by the reconciler, not created.
+        first_install = store.url is None
+        store.url = url
+        store.last_error = None
+        db.add(store)
+        if warming:
+            store.status = StoreStatus.WARM
+            log_event(db, store.id, "warm", f"Store is installed and waiting in the warm pool at {url}")
+            return
+        store.status = StoreStatus.READY
+        log_event(db, store.id, "ready", f"Store is ready at {url}")
+        if first_install:
+            store_provision_duration_seconds.labels(engine=engine).observe(
+                _elapsed_seconds(store.created_at, datetime.now(timezone.utc))
+            )
+
+    async def _install_stage(self, db: Session, store: Store, job: ProvisioningJob, store_host: str) -> None:
         # Persist intermediate state early so UI does not remain stuck on QUEUED
         # while Helm work is running in the background.
-        store.status = StoreStatus.PROVISIONING
+        job.stage = JobStage.INSTALL
+        if store.status != StoreStatus.WARMING:
+            store.status = StoreStatus.PROVISIONING
         db.add(store)
         log_event(db, store.id, "install_started", "Starting Helm provisioning")
-        db.commit()
+        values_patch = await asyncio.to_thread(_commit_reading_values_patch, db, store.id)
+
+        values = deep_merge(self._render_values(store, store_host), values_patch)
+        await self._apply_release(db, store, values, JobAction.PROVISION)
+
+        job.stage = JobStage.WAIT_READY
+        await asyncio.to_thread(db.commit)
+
+    async def _upgrade_store(
+        self, db: Session, store: Store, job: ProvisioningJob, upgrade: FleetUpgrade | None
+    ) -> None:
+        if upgrade is not None:
+            chart_version = read_chart_version(self.chart_cache.chart_dir)
+            if chart_version != upgrade.chart_version:
+                raise RuntimeError(f"Worker chart is {chart_version}, fleet upgrade targets {upgrade.chart_version}")
+            target = f"chart {upgrade.chart_version}"
+        else:
+            target = "current store settings"
+
+        job.stage = JobStage.INSTALL
+        log_event(db, store.id, "upgrade_started", f"Upgrading to {target}")
+        if upgrade is not None:
+            values_patch = upgrade.values_patch
+            await asyncio.to_thread(db.commit)
+        else:
+            values_patch = await asyncio.to_thread(_commit_reading_values_patch, db, store.id)
 
         store_host = self._build_store_host(str(store.id))
-        values = {
+        values = deep_merge(self._render_values(store, store_host), values_patch)
+        await self._apply_release(db, store, values, JobAction.UPGRADE, atomic=True)
+        self._leave_install_stage(job.id)
+
+        # Unlike a first install, an upgrade that leaves the store unreachable is a failure: it counts against the
+        # fleet upgrade's failure budget.
+        job.stage = JobStage.WAIT_READY
+        await asyncio.to_thread(db.commit)
+        try:
+            with self._in_stage(JobStage.WAIT_READY):
+                async with self._ready_slots:
+                    with self._timed_step("readiness_wait", JobAction.UPGRADE, store.engine.value):
+                        await self.readiness.wait_until_ready(
+                            url=f"http://{store_host}",
+                            timeout_seconds=self.settings.http_ready_timeout_seconds,
+                            criteria=self.readiness_criteria,
+                            initial_backoff_seconds=self.settings.http_ready_backoff_initial_seconds,
+                            max_backoff_seconds=self.settings.http_ready_backoff_max_seconds,
+                        )
+        except Exception:
+            # --atomic only covers a failed Helm upgrade. A release that deployed but does not serve is rolled
+            # back here, so a failed store upgrade always leaves the previous revision in place.
+            store.release_fingerprint = None
+            await self.helm.rollback(store.release_name, store.namespace, self.settings.helm_timeout_seconds)
+            self.event_writer.write(
+                store.id, "upgrade_rolled_back", "Readiness failed; rolled back to the previous revision"
+            )
+            raise
+
+        job.stage = JobStage.FINALIZE
+        store.last_error = None
+        log_event(db, store.id, "upgraded", f"Upgraded to {target}")
+
+    def _render_values(self, store: Store, store_host: str) -> dict:
+        return {
             "store": {
                 "id": str(store.id),
                 "namespace": store.namespace,
@@ -164,49 +668,98 @@ class ProvisioningWorker:
                 "ingress": self._build_store_ingress_values(store_host),
             },
         }
-        self.helm.upgrade_install(
-            release_name=store.release_name,
-            namespace=store.namespace,
-            chart_path=self.settings.helm_chart_path,
-            values=values,
-            timeout_seconds=self.settings.helm_timeout_seconds,
-        )
 
-        url = f"http://{store_host}"
-        try:
-            self.readiness.wait_for_http_ok(
-                url=url,
-                timeout_seconds=self.settings.http_ready_timeout_seconds,
-                poll_seconds=self.settings.http_ready_poll_seconds,
+    async def _apply_release(
+        self, db: Session, store: Store, values: dict, action: JobAction, atomic: bool = False
+    ) -> None:
+        fingerprint = release_fingerprint(values, await self.chart_cache.digest())
+        # A retried or re-driven job whose release is already deployed from the same values and chart has nothing to
+        # upgrade; skipping it avoids a new revision secret and a full --wait cycle.
+        if store.release_fingerprint == fingerprint and (
+            await self.helm.release_status(store.release_name, store.namespace) == "deployed"
+        ):
+            helm_upgrades_skipped_total.inc()
+            log_event(db, store.id, "install_skipped", "Release already deployed with identical values")
+            return
+        step = "helm_install" if action == JobAction.PROVISION else "helm_upgrade"
+        with self._in_stage(JobStage.INSTALL), self._timed_step(step, action, store.engine.value):
+            await self.helm.upgrade_install(
+                release_name=store.release_name,
+                namespace=store.namespace,
+                chart_path=self.chart_cache.chart_ref,
+                values=values,
+                timeout_seconds=self.settings.helm_timeout_seconds,
+                atomic=atomic,
             )
-        except Exception as exc:  # noqa: BLE001
-            # Local ingress networking can be flaky in laptop runtimes; keep event visibility and continue.
-            log_event(db, store.id, "readiness_warning", f"HTTP check did not pass before timeout: {exc}")
+        store.release_fingerprint = fingerprint
 
-        store.url = url
-        store.status = StoreStatus.READY
-        store.last_error = None
-        db.add(store)
-        log_event(db, store.id, "ready", f"Store is ready at {url}")
-
-    def _delete_store(self, db: Session, store: Store) -> None:
-        # Persist intermediate state early so teardown progress is visible.
-        store.status = StoreStatus.DELETING
-        db.add(store)
-        log_event(db, store.id, "delete_started", "Delete requested")
-        db.commit()
-
-        # Uninstall first; if already absent this should be no-op-ish
+    @contextmanager
+    def _timed_step(self, step: str, action: JobAction, engine: str):
+        started = time.perf_counter()
+        outcome = "error"
         try:
-            self.helm.uninstall(store.release_name, store.namespace, self.settings.helm_timeout_seconds)
-        except RuntimeError:
-            # Namespace delete is authoritative teardown; continue.
-            pass
-
-        self.kube.delete_namespace(store.namespace)
+            yield
+            outcome = "ok"
+        finally:
+            pipeline_step_duration_seconds.labels(
+                step=step, action=action.value, engine=engine, outcome=outcome
+            ).observe(time.perf_counter() - started)
+
+    @contextmanager
+    def _in_stage(self, stage: JobStage):
+        gauge = worker_jobs_in_stage.labels(stage=stage.value)
+        gauge.inc()
+        try:
+            yield
+        finally:
+            gauge.dec()
+
+    async def _delete_store(self, db: Session, store: Store, job: ProvisioningJob) -> None:
+        engine = store.engine.value
+        if job.stage in {None, JobStage.INSTALL}:
+            # Persist intermediate state early so teardown progress is visible.
+            job.stage = JobStage.INSTALL
+            # Pool stores stay hidden while they are torn down.
+            if store.status not in WARM_POOL_STATUSES:
+                store.status = StoreStatus.DELETING
+            db.add(store)
+            log_event(db, store.id, "delete_started", "Delete requested")
+            await asyncio.to_thread(db.commit)
+
+            with self._in_stage(JobStage.INSTALL):
+                # Uninstall first; if already absent this should be no-op-ish
+                try:
+                    with self._timed_step("helm_uninstall", JobAction.DELETE, engine):
+                        await self.helm.uninstall(
+                            store.release_name, store.namespace, self.settings.helm_timeout_seconds, wait=False
+                        )
+                except RuntimeError:
+                    # Namespace delete is authoritative teardown; continue.
+                    pass
+                await self.kube.delete_namespace(store.namespace, wait=False)
+
+            job.stage = JobStage.WAIT_DELETED
+            await asyncio.to_thread(db.commit)
+
+        # Namespace finalization can take minutes; wait on the shared watcher without holding a slot.
+        self._leave_install_stage(job.id)
+        self._teardown_waits.add(job.id)
+        try:
+            # The delete call above returns at once (wait=False), so finalizers dominate this step.
+            with (
+                self._in_stage(JobStage.WAIT_DELETED),
+                self._timed_step("namespace_delete", JobAction.DELETE, engine),
+            ):
+                await self.namespace_watcher.wait_for_deletion(
+                    store.namespace, self.settings.kubectl_delete_timeout_seconds
+                )
+        finally:
+            self._teardown_waits.discard(job.id)
 
+        job.stage = JobStage.FINALIZE
         store.status = StoreStatus.DELETED
         store.url = None
+        store.release_fingerprint = None
         db.add(store)
         log_event(db, store.id, "deleted", "Namespace and release removed")
 
@@ -261,7 +814,3 @@ class ProvisioningWorker:
             "nginx.ingress.kubernetes.io/configuration-snippet": configuration_snippet,
         }
 
-
-def count_active_stores(db: Session) -> int:
-    active_statuses = [StoreStatus.QUEUED, StoreStatus.PROVISIONING, StoreStatus.READY, StoreStatus.DELETING]
-    return db.scalar(select(func.count(Store.id)).where(Store.status.in_(active_statuses))) or 0
@@ -0,0 +1,124 @@
+"""Latency of GET /stores and GET /stores/{id} under concurrent clients.
+
+Run from backend/:
+
+    python -m benchmarks.api_load --concurrency 64 --requests 5000
+
+With no --base-url the API is started in-process on a temporary SQLite file seeded with --stores rows
+(worker disabled). SQLite serializes access, so use that mode to compare code paths, not to size a
+deployment. Point --base-url at an API backed by Postgres for representative numbers and to see the
+DB_POOL_* settings take effect.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_local_api(directory: str, stores: int) -> str:
+    os.environ["DATABASE_URL"] = f"sqlite+pysqlite:///{directory}/platform.db"
+    os.environ["WORKER_EMBEDDED"] = "false"
+    os.environ["KUBE_API_ENABLED"] = "false"
+
+    import uvicorn
+
+    from app.db.session import SessionLocal, engine
+    from app.main import app
+    from app.models import Base
+    from app.models.enums import StoreEngine, StoreStatus
+    from app.models.store import Store
+    from app.services.events import log_event
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        for _ in range(stores):
+            store_id = uuid.uuid4()
+            db.add(
+                Store(
+                    id=store_id,
+                    engine=StoreEngine.WOOCOMMERCE,
+                    namespace=f"store-{store_id}",
+                    release_name=f"store-{store_id}",
+                    status=StoreStatus.READY,
+                )
+            )
+            log_event(db, store_id, "ready", "seeded")
+        db.commit()
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def _run(base_url: str, concurrency: int, requests: int, detail_ratio: float) -> None:
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        store_ids = [item["id"] for item in (await client.get("/stores", params={"limit": 200})).json()["items"]]
+        latencies: dict[str, list[float]] = {"list": [], "detail": []}
+        errors = 0
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                if store_ids and random.random() < detail_ratio:
+                    kind, path = "detail", f"/stores/{random.choice(store_ids)}"
+                else:
+                    kind, path = "list", "/stores"
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies[kind].append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    print(f"{requests} requests, concurrency {concurrency}: {requests / elapsed:.0f} req/s, errors={errors}")
+    for kind, samples in latencies.items():
+        if not samples:
+            continue
+        samples.sort()
+        p99 = samples[max(int(len(samples) * 0.99) - 1, 0)]
+        print(
+            f"{kind:<7} n={len(samples):<6} p50={statistics.median(samples):8.2f}ms  "
+            f"p95={samples[int(len(samples) * 0.95) - 1]:8.2f}ms  p99={p99:8.2f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--detail-ratio", type=float, default=0.5)
+    parser.add_argument("--stores", type=int, default=500, help="rows to seed in local mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        base_url = args.base_url or _start_local_api(directory, args.stores)
+        asyncio.run(_run(base_url, args.concurrency, args.requests, args.detail_ratio))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Per-call latency of KubeService.read_secret_value: persistent API client vs kubectl subprocess.
+
+Run from backend/:
+
+    python -m benchmarks.kube_latency --calls 200
+
+By default both paths hit local fakes. The kubectl path uses a stub script, so its numbers are a
+lower bound on the fork/exec cost alone. Pass --kubectl with a real binary (plus --namespace and
+--secret) to include kubeconfig loading and API discovery against a live cluster.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from app.services.kube import KubeService
+from app.services.kube_api import KubeApiClient
+from tests.fake_kube_api import FakeKubeApiServer
+
+SECRET = {"data": {"wordpress-password": "c2VjcmV0MTIz"}}
+
+
+def _measure(label: str, fn, calls: int) -> None:
+    fn()  # warm up connection pools and page cache
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<22} mean={statistics.mean(samples):8.3f}ms  p50={samples[len(samples) // 2]:8.3f}ms  p95={p95:8.3f}ms")
+
+
+def _stub_kubectl(directory: str) -> str:
+    path = os.path.join(directory, "kubectl")
+    with open(path, "w") as handle:
+        handle.write(f"#!{sys.executable}\nimport json\nprint(json.dumps({SECRET!r}))\n")
+    os.chmod(path, 0o755)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--kubectl", default="", help="real kubectl binary; defaults to a local stub")
+    parser.add_argument("--namespace", default="store-bench")
+    parser.add_argument("--secret", default="store-bench")
+    args = parser.parse_args()
+
+    with FakeKubeApiServer() as server, tempfile.TemporaryDirectory() as directory:
+        server.secrets[(args.namespace, args.secret)] = SECRET
+        api_service = KubeService(api=KubeApiClient(server.url))
+        cli_service = KubeService(kubectl_binary=args.kubectl or _stub_kubectl(directory))
+
+        print(f"{args.calls} calls each")
+        _measure(
+            "api client (pooled)",
+            lambda: api_service.read_secret_value(args.namespace, args.secret, "wordpress-password"),
+            args.calls,
+        )
+        _measure(
+            "kubectl subprocess",
+            lambda: cli_service.read_secret_value(args.namespace, args.secret, "wordpress-password"),
+            args.calls,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Throughput of rate limit checks under concurrent callers.
+
+Run from backend/:
+
+    python -m benchmarks.rate_limit_throughput --threads 16 --calls 20000
+
+Compares the in-process token bucket, the single-statement upsert backend, and the previous
+read-then-commit check on a request session. The database paths default to a temporary SQLite file;
+pass --database-url with a Postgres URL to measure the multi-replica setup (rate_limit_buckets is
+created if missing).
+"""
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import sessionmaker
+
+from app.models.rate_limit_bucket import RateLimitBucket
+from app.services.rate_limit import DatabaseRateLimiter, LocalRateLimiter
+
+
+def _read_then_commit(factory, max_requests: int, window_seconds: int):
+    # The check this module replaced: db.get, mutate, commit, with no protection against concurrent callers.
+    def allow(key: str) -> tuple[bool, int]:
+        now = datetime.now(timezone.utc)
+        with factory() as db:
+            bucket = db.get(RateLimitBucket, key)
+            if bucket is None:
+                db.add(RateLimitBucket(key=key, count=1, window_started_at=now))
+                db.commit()
+                return True, max_requests - 1
+            if now - bucket.window_started_at.replace(tzinfo=timezone.utc) > timedelta(seconds=window_seconds):
+                bucket.count = 1
+                bucket.window_started_at = now
+                db.commit()
+                return True, max_requests - 1
+            if bucket.count >= max_requests:
+                return False, 0
+            bucket.count += 1
+            db.commit()
+            return True, max_requests - bucket.count
+
+    return allow
+
+
+def _measure(label: str, allow, threads: int, calls: int, keys: int) -> None:
+    def check(index: int) -> bool | None:
+        try:
+            return allow(f"create:10.0.{index % keys}.1")[0]
+        except DBAPIError:
+            return None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(check, range(calls)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<22} {calls / elapsed:10.0f} checks/s  allowed={results.count(True)}  errors={results.count(None)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=64, help="distinct client identities")
+    parser.add_argument("--limit", type=int, default=15, help="requests allowed per key per window")
+    parser.add_argument("--database-url", default="")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.database_url or f"sqlite+pysqlite:///{directory}/limits.db"
+        engine = create_engine(url, pool_size=args.threads, connect_args={} if args.database_url else {"timeout": 60})
+        RateLimitBucket.__table__.create(engine, checkfirst=True)
+        factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+        print(f"{args.calls} checks over {args.keys} keys from {args.threads} threads, limit {args.limit}/key")
+        print(f"expected allowed={min(args.calls, args.keys * args.limit)}")
+        _measure("local token bucket", LocalRateLimiter(args.limit, 3600).allow, args.threads, args.calls, args.keys)
+        for label, allow in (
+            ("database upsert", DatabaseRateLimiter(engine, args.limit, 3600).allow),
+            ("read-then-commit", _read_then_commit(factory, args.limit, 3600)),
+        ):
+            with engine.begin() as conn:
+                conn.execute(delete(RateLimitBucket))
+            _measure(label, allow, args.threads, args.calls, args.keys)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base
+
+
+@pytest.fixture
+def session_factory() -> sessionmaker:
+    # One in-memory database shared across threads, so code under test may use asyncio.to_thread.
+    engine = create_engine("sqlite+pysqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture
+def worker_session_factory(session_factory, monkeypatch) -> sessionmaker:
+    monkeypatch.setattr("app.workers.provisioner.SessionLocal", session_factory)
+    return session_factory
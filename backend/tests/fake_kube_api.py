@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeKubeApiServer:
+    # Implements just enough of the core/v1 API for KubeApiClient: secrets, namespace delete, list and watch.
+
+    def __init__(self, namespace_delete_delay_seconds: float = 0.05):
+        self.secrets: dict[tuple[str, str], dict] = {}
+        self.namespaces: set[str] = set()
+        self.namespace_delete_delay_seconds = namespace_delete_delay_seconds
+        self.requests: list[tuple[str, str]] = []
+        self.connections: set[int] = set()
+        self._resource_version = 1
+        self._deletions: list[tuple[int, str]] = []
+        self._changed = threading.Condition()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeKubeApiServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _finish_namespace_delete(self, namespace: str) -> None:
+        time.sleep(self.namespace_delete_delay_seconds)
+        with self._changed:
+            self.namespaces.discard(namespace)
+            self._resource_version += 1
+            self._deletions.append((self._resource_version, namespace))
+            self._changed.notify_all()
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *_args) -> None:
+                pass
+
+            def _send_json(self, status: int, body: dict) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _track(self) -> list[str]:
+                fake.requests.append((self.command, self.path))
+                fake.connections.add(self.client_address[1])
+                return [part for part in urlparse(self.path).path.split("/") if part]
+
+            def do_GET(self) -> None:
+                parts = self._track()
+                query = parse_qs(urlparse(self.path).query)
+                if len(parts) == 6 and parts[4] == "secrets":
+                    secret = fake.secrets.get((parts[3], parts[5]))
+                    if secret is None:
+                        self._send_json(404, {"kind": "Status", "reason": "NotFound"})
+                    else:
+                        self._send_json(200, secret)
+                    return
+                if len(parts) == 4 and parts[2] == "namespaces":
+                    if parts[3] in fake.namespaces:
+                        self._send_json(200, {"metadata": {"name": parts[3]}})
+                    else:
+                        self._send_json(404, {"kind": "Status", "reason": "NotFound"})
+                    return
+                if parts == ["api", "v1", "namespaces"]:
+                    name = query.get("fieldSelector", [""])[0].removeprefix("metadata.name=")
+                    if query.get("watch") == ["1"]:
+                        self._watch(name, int(query["resourceVersion"][0]), float(query.get("timeoutSeconds", ["5"])[0]))
+                        return
+                    names = [name] if name else sorted(fake.namespaces)
+                    items = [{"metadata": {"name": item}} for item in names if item in fake.namespaces]
+                    self._send_json(200, {"items": items, "metadata": {"resourceVersion": str(fake._resource_version)}})
+                    return
+                self._send_json(404, {"kind": "Status", "reason": "NotFound"})
+
+            def do_DELETE(self) -> None:
+                parts = self._track()
+                if len(parts) == 4 and parts[2] == "namespaces":
+                    name = parts[3]
+                    if name not in fake.namespaces:
+                        self._send_json(404, {"kind": "Status", "reason": "NotFound"})
+                        return
+                    threading.Thread(target=fake._finish_namespace_delete, args=(name,), daemon=True).start()
+                    self._send_json(200, {"metadata": {"name": name}, "status": {"phase": "Terminating"}})
+                    return
+                self._send_json(404, {"kind": "Status", "reason": "NotFound"})
+
+            def _watch(self, name: str, resource_version: int, timeout_seconds: float) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                deadline = time.monotonic() + timeout_seconds
+                while time.monotonic() < deadline:
+                    with fake._changed:
+                        fake._changed.wait_for(lambda: fake._resource_version > resource_version, timeout=0.05)
+                        events = [
+                            (version, deleted)
+                            for version, deleted in fake._deletions
+                            if version > resource_version and (not name or deleted == name)
+                        ]
+                        resource_version = fake._resource_version
+                    for _version, deleted in events:
+                        event = {"type": "DELETED", "object": {"metadata": {"name": deleted}}}
+                        try:
+                            self.wfile.write(json.dumps(event).encode() + b"\n")
+                        except OSError:
+                            return
+                self.close_connection = True
+
+        return Handler
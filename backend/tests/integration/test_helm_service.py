@@ -1,25 +1,94 @@
-from types import SimpleNamespace
+import asyncio
+import json
+import shutil
 
-from app.services.helm import HelmService
+from app.services.helm import HelmService, release_fingerprint
 
 
-def test_upgrade_install_raises_runtime_error_on_failure(monkeypatch):
-    service = HelmService(helm_binary="helm")
-
-    def fake_run(*_args, **_kwargs):
-        return SimpleNamespace(returncode=1, stdout="", stderr="boom")
-
-    monkeypatch.setattr("subprocess.run", fake_run)
+def test_upgrade_install_raises_runtime_error_on_failure():
+    # `false` accepts any arguments and exits 1, standing in for a failing helm binary.
+    service = HelmService(helm_binary=shutil.which("false"))
 
     try:
-        service.upgrade_install(
-            release_name="store-1",
-            namespace="store-1",
-            chart_path="./charts/woocommerce",
-            values={"key": "value"},
-            timeout_seconds=10,
+        asyncio.run(
+            service.upgrade_install(
+                release_name="store-1",
+                namespace="store-1",
+                chart_path="./charts/woocommerce",
+                values={"key": "value"},
+                timeout_seconds=10,
+            )
         )
     except RuntimeError as exc:
         assert "Helm command failed" in str(exc)
     else:
         raise AssertionError("Expected RuntimeError")
+
+
+def test_release_status_is_none_when_helm_cannot_read_release():
+    service = HelmService(helm_binary=shutil.which("false"))
+
+    assert asyncio.run(service.release_status("store-1", "store-1")) is None
+
+
+def test_release_status_reads_the_release_row_from_helm_list(tmp_path):
+    # Real listings carry chart and app metadata; padding pushes the single line past the 64 KiB stream limit.
+    rows = [
+        {"name": "store-1-old", "namespace": "store-1", "status": "failed", "chart": "x" * 70_000},
+        {"name": "store-1", "namespace": "store-1", "status": "deployed", "chart": "woocommerce-0.1.0"},
+    ]
+    (tmp_path / "releases.json").write_text(json.dumps(rows))
+    helm = tmp_path / "helm"
+    helm.write_text(f'#!/bin/sh\necho "$@" > "$0.args"\ncat {tmp_path / "releases.json"}\n')
+    helm.chmod(0o755)
+
+    assert asyncio.run(HelmService(helm_binary=str(helm)).release_status("store-1", "store-1")) == "deployed"
+    args = (tmp_path / "helm.args").read_text().split()
+    assert args[:3] == ["list", "-n", "store-1"] and args[args.index("--filter") + 1] == "^store\\-1$"
+
+
+def test_release_status_is_none_for_unparseable_output(tmp_path):
+    helm = tmp_path / "helm"
+    helm.write_text("#!/bin/sh\necho 'not json'\n")
+    helm.chmod(0o755)
+
+    assert asyncio.run(HelmService(helm_binary=str(helm)).release_status("store-1", "store-1")) is None
+
+
+def test_release_fingerprint_ignores_key_order_but_not_chart_digest():
+    values = {"store": {"id": "1", "host": "a"}, "wordpress": {"fullnameOverride": "store-1"}}
+    reordered = {"wordpress": {"fullnameOverride": "store-1"}, "store": {"host": "a", "id": "1"}}
+
+    assert release_fingerprint(values, "abc") == release_fingerprint(reordered, "abc")
+    assert release_fingerprint(values, "abc") != release_fingerprint(values, "abd")
+
+
+def test_list_releases_reads_every_namespace_in_one_call(tmp_path):
+    helm = tmp_path / "helm"
+    helm.write_text(
+        "#!/bin/sh\n"
+        'echo "$@" > "$0.args"\n'
+        """echo '[{"name":"store-1","namespace":"store-1","status":"deployed"},"""
+        """{"name":"store-2","namespace":"store-2","status":"failed"}]'\n"""
+    )
+    helm.chmod(0o755)
+
+    releases = asyncio.run(HelmService(helm_binary=str(helm)).list_releases(name_filter="^store-"))
+
+    assert releases == {("store-1", "store-1"): "deployed", ("store-2", "store-2"): "failed"}
+    args = (tmp_path / "helm.args").read_text().split()
+    assert args == ["list", "--all-namespaces", "--all", "--max", "0", "-o", "json", "--filter", "^store-"]
+
+
+def test_list_releases_reads_a_listing_larger_than_the_stream_limit(tmp_path):
+    # helm prints the whole listing as one JSON line; a thousand stores is well past 64 KiB.
+    rows = [{"name": f"store-{index}", "namespace": f"store-{index}", "status": "deployed"} for index in range(1000)]
+    (tmp_path / "releases.json").write_text(json.dumps(rows))
+    assert (tmp_path / "releases.json").stat().st_size > 65_536
+    helm = tmp_path / "helm"
+    helm.write_text(f"#!/bin/sh\ncat {tmp_path / 'releases.json'}\n")
+    helm.chmod(0o755)
+
+    releases = asyncio.run(HelmService(helm_binary=str(helm)).list_releases())
+
+    assert len(releases) == 1000 and releases[("store-999", "store-999")] == "deployed"
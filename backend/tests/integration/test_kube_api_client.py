@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+
+from app.services.kube import KubeService
+from app.services.kube_api import KubeApiClient
+from tests.fake_kube_api import FakeKubeApiServer
+
+
+def test_read_secret_value_uses_api_and_reuses_connection():
+    with FakeKubeApiServer() as server:
+        server.secrets[("store-1", "store-1")] = {"data": {"wordpress-password": "c2VjcmV0MTIz"}}
+        service = KubeService(kubectl_binary="kubectl-not-installed", api=KubeApiClient(server.url))
+
+        values = [service.read_secret_value("store-1", "store-1", "wordpress-password") for _ in range(3)]
+
+    assert values == ["secret123"] * 3
+    assert len(server.requests) == 3
+    assert len(server.connections) == 1
+
+
+def test_delete_namespace_waits_for_watch_deleted_event():
+    with FakeKubeApiServer(namespace_delete_delay_seconds=0.1) as server:
+        server.namespaces.add("store-1")
+        service = KubeService(delete_timeout_seconds=5, api=KubeApiClient(server.url))
+
+        asyncio.run(service.delete_namespace("store-1"))
+
+    assert "store-1" not in server.namespaces
+    assert any("watch=1" in path for _method, path in server.requests)
+
+
+def test_delete_missing_namespace_is_a_no_op():
+    with FakeKubeApiServer() as server:
+        service = KubeService(api=KubeApiClient(server.url))
+        asyncio.run(service.delete_namespace("store-missing"))
+
+    assert [method for method, _path in server.requests] == ["DELETE"]
+
+
+def test_falls_back_to_kubectl_when_api_is_unreachable(monkeypatch):
+    def refuse(_request):
+        raise httpx.ConnectError("connection refused")
+
+    api = KubeApiClient("http://127.0.0.1:1", transport=httpx.MockTransport(refuse))
+    service = KubeService(kubectl_binary="kubectl", api=api)
+    monkeypatch.setattr(
+        service, "_kubectl_get_secret", lambda _namespace, _name: {"data": {"wordpress-password": "c2VjcmV0MTIz"}}
+    )
+
+    assert service.read_secret_value("store-1", "store-1", "wordpress-password") == "secret123"
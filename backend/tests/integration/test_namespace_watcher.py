@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.kube import KubeService
+from app.services.kube_api import KubeApiClient
+from app.services.namespace_watcher import NamespaceTeardownWatcher
+from tests.fake_kube_api import FakeKubeApiServer
+
+
+def test_one_watch_stream_completes_every_tracked_teardown():
+    names = [f"store-{index}" for index in range(5)]
+    with FakeKubeApiServer() as server:
+        server.namespaces.update(names)
+        watcher = NamespaceTeardownWatcher(KubeService(api=KubeApiClient(server.url)))
+
+        async def scenario():
+            waits = [asyncio.create_task(watcher.wait_for_deletion(name, timeout_seconds=5)) for name in names]
+            await asyncio.sleep(0.1)
+            for name in names:
+                threading.Thread(target=server._finish_namespace_delete, args=(name,)).start()
+            await asyncio.gather(*waits)
+            await watcher.stop()
+
+        asyncio.run(scenario())
+
+    watches = [path for _method, path in server.requests if "watch=1" in path]
+    assert len(watches) == 1
+    assert watcher.tracked == 0
+
+
+def test_already_deleted_namespace_resolves_immediately():
+    with FakeKubeApiServer() as server:
+        watcher = NamespaceTeardownWatcher(KubeService(api=KubeApiClient(server.url)))
+
+        async def scenario():
+            await watcher.wait_for_deletion("store-gone", timeout_seconds=1)
+            await watcher.stop()
+
+        asyncio.run(scenario())
+
+
+def test_poll_fallback_uses_one_listing_per_interval_and_times_out():
+    listings = []
+    service = KubeService()
+
+    async def list_namespace_names():
+        listings.append(True)
+        return {"store-stuck"}
+
+    service.list_namespace_names = list_namespace_names
+    watcher = NamespaceTeardownWatcher(service, poll_seconds=0.05)
+
+    async def scenario():
+        done = asyncio.create_task(watcher.wait_for_deletion("store-done", timeout_seconds=1))
+        with pytest.raises(RuntimeError, match="still terminating"):
+            await watcher.wait_for_deletion("store-stuck", timeout_seconds=0.2)
+        await done
+        await watcher.stop()
+
+    asyncio.run(scenario())
+
+    assert 1 < len(listings) < 10
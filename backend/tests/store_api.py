@@ -0,0 +1,30 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.fleet_upgrades import router as fleet_upgrades_router
+from app.api.stores import router
+from app.db.session import get_async_db
+from app.models import Base
+
+
+def build_store_api(tmp_path) -> tuple[TestClient, sessionmaker]:
+    # The API runs on aiosqlite while tests seed and inspect the same file through a sync session.
+    path = tmp_path / "stores.db"
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+    Base.metadata.create_all(engine)
+    async_factory = async_sessionmaker(
+        bind=create_async_engine(f"sqlite+aiosqlite:///{path}"), autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_async_db():
+        async with async_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(router)
+    app.include_router(fleet_upgrades_router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return TestClient(app), sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
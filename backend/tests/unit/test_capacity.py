@@ -0,0 +1,47 @@
+import uuid
+
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models import Base
+from app.models.enums import StoreEngine, StoreStatus
+from app.models.store import Store
+from app.services.capacity import count_active_stores, refresh_store_status_gauge, reserve_store_capacity
+
+
+def _session(statuses: list[StoreStatus]) -> Session:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    for store_status in statuses:
+        store_id = uuid.uuid4()
+        db.add(
+            Store(
+                id=store_id,
+                engine=StoreEngine.WOOCOMMERCE,
+                namespace=f"store-{store_id}",
+                release_name=f"store-{store_id}",
+                status=store_status,
+            )
+        )
+    db.commit()
+    return db
+
+
+def test_reserve_capacity_counts_only_active_statuses():
+    db = _session([StoreStatus.READY, StoreStatus.QUEUED, StoreStatus.FAILED, StoreStatus.DELETED])
+
+    assert count_active_stores(db) == 2
+    assert reserve_store_capacity(db, requested=5, max_active=4) == 2
+    assert reserve_store_capacity(db, requested=1, max_active=2) == 0
+
+
+def test_status_gauge_reports_every_status():
+    db = _session([StoreStatus.READY, StoreStatus.READY, StoreStatus.FAILED])
+
+    refresh_store_status_gauge(db)
+
+    assert REGISTRY.get_sample_value("stores_by_status", {"status": "READY"}) == 2
+    assert REGISTRY.get_sample_value("stores_by_status", {"status": "FAILED"}) == 1
+    assert REGISTRY.get_sample_value("stores_by_status", {"status": "DELETING"}) == 0
@@ -0,0 +1,103 @@
+import asyncio
+import sys
+import tarfile
+import textwrap
+from pathlib import Path
+
+from app.services.chart_cache import ChartArtifactCache
+from app.services.helm import HelmService
+
+# Stands in for helm: `dependency list/build` and `package` against a chart with one wordpress dependency.
+FAKE_HELM = textwrap.dedent(
+    """
+    import io, sys, tarfile
+    from pathlib import Path
+
+    args = sys.argv[1:]
+    with open(Path(__file__).with_suffix(".log"), "a") as log:
+        log.write(" ".join(args[:1] if args[0] == "package" else args[:2]) + "\\n")
+
+    def write_tgz(path, root, files):
+        with tarfile.open(path, "w:gz") as archive:
+            for name, data in files.items():
+                info = tarfile.TarInfo(f"{root}/{name}")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+
+    if args[:2] == ["dependency", "list"]:
+        vendored = (Path(args[2]) / "charts" / "wordpress-28.1.7.tgz").exists()
+        print("NAME\\tVERSION\\tREPOSITORY\\tSTATUS")
+        print(f"wordpress\\t28.1.7\\thttps://charts.bitnami.com/bitnami\\t{'ok' if vendored else 'missing'}")
+    elif args[:2] == ["dependency", "build"]:
+        (Path(args[2]) / "charts").mkdir(exist_ok=True)
+        write_tgz(Path(args[2]) / "charts" / "wordpress-28.1.7.tgz", "wordpress", {"Chart.yaml": b"name: wordpress"})
+    elif args[0] == "package":
+        chart = Path(args[1])
+        target = Path(args[3]) / "woocommerce-0.1.0.tgz"
+        with tarfile.open(target, "w:gz") as archive:
+            archive.add(chart, arcname="woocommerce")
+        print(f"Successfully packaged chart and saved it to: {target}")
+    """
+)
+
+
+def _setup(tmp_path: Path) -> tuple[Path, Path]:
+    chart = tmp_path / "woocommerce"
+    (chart / "templates").mkdir(parents=True)
+    (chart / "Chart.yaml").write_text("apiVersion: v2\nname: woocommerce\nversion: 0.1.0\n")
+    (chart / "templates" / "configmap.yaml").write_text("kind: ConfigMap\n")
+    helm = tmp_path / "helm.py"
+    helm.write_text(FAKE_HELM)
+    wrapper = tmp_path / "helm"
+    wrapper.write_text(f"#!/bin/sh\nexec {sys.executable} {helm} \"$@\"\n")
+    wrapper.chmod(0o755)
+    return chart, wrapper
+
+
+def _cache(tmp_path: Path, chart: Path, helm: Path) -> ChartArtifactCache:
+    return ChartArtifactCache(HelmService(str(helm)), str(chart), str(tmp_path / "cache"))
+
+
+def _helm_calls(tmp_path: Path) -> list[str]:
+    return (tmp_path / "helm.log").read_text().splitlines()
+
+
+def test_chart_is_packaged_once_with_vendored_dependencies_and_reused(tmp_path):
+    chart, helm = _setup(tmp_path)
+
+    artifact = asyncio.run(_cache(tmp_path, chart, helm).ensure())
+    reused = _cache(tmp_path, chart, helm)
+    assert asyncio.run(reused.ensure()) == artifact
+
+    with tarfile.open(artifact) as archive:
+        assert "woocommerce/charts/wordpress-28.1.7.tgz" in archive.getnames()
+    assert reused.chart_ref == str(artifact)
+    assert not (chart / "charts").exists()
+    calls = _helm_calls(tmp_path)
+    assert calls.count("dependency build") == 1
+    assert calls.count("package") == 1
+
+
+def test_vendored_chart_packages_without_dependency_build(tmp_path):
+    chart, helm = _setup(tmp_path)
+    (chart / "charts").mkdir()
+    with tarfile.open(chart / "charts" / "wordpress-28.1.7.tgz", "w:gz"):
+        pass
+
+    asyncio.run(_cache(tmp_path, chart, helm).ensure())
+
+    assert "dependency build" not in _helm_calls(tmp_path)
+
+
+def test_corrupt_or_stale_artifacts_are_rebuilt(tmp_path):
+    chart, helm = _setup(tmp_path)
+    first = asyncio.run(_cache(tmp_path, chart, helm).ensure())
+    first.write_bytes(b"truncated")
+
+    rebuilt = asyncio.run(_cache(tmp_path, chart, helm).ensure())
+    with tarfile.open(rebuilt) as archive:
+        assert "woocommerce/Chart.yaml" in archive.getnames()
+
+    (chart / "values.yaml").write_text("replicaCount: 2\n")
+    changed = asyncio.run(_cache(tmp_path, chart, helm).ensure())
+    assert changed.parent != rebuilt.parent
@@ -0,0 +1,69 @@
+import gzip
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from app.models.enums import StoreEngine, StoreStatus
+from app.models.store import Store
+from app.models.store_event import StoreEvent
+from app.services.event_retention import archive_expired_events
+from app.services.events import BufferedEventWriter
+from tests.store_api import build_store_api
+
+
+def _store_with_events(factory, ages_days: list[int]) -> uuid.UUID:
+    store_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    with factory() as db:
+        db.add(
+            Store(
+                id=store_id,
+                engine=StoreEngine.WOOCOMMERCE,
+                namespace=f"store-{store_id}",
+                release_name=f"store-{store_id}",
+                status=StoreStatus.READY,
+            )
+        )
+        db.flush()
+        for index, age in enumerate(ages_days):
+            db.add(StoreEvent(store_id=store_id, event_type=f"e{index}", message="m", created_at=now - timedelta(days=age)))
+        db.commit()
+    return store_id
+
+
+def test_expired_events_move_to_archive_and_export_as_ndjson(tmp_path):
+    client, factory = build_store_api(tmp_path)
+    store_id = _store_with_events(factory, [40, 35, 31, 1])
+    cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+
+    with factory() as db:
+        assert archive_expired_events(db, cutoff, batch_size=2) == 2
+    with factory() as db:
+        assert archive_expired_events(db, cutoff, batch_size=2) == 1
+    with factory() as db:
+        assert archive_expired_events(db, cutoff, batch_size=2) == 0
+        assert db.scalar(select(func.count()).select_from(StoreEvent)) == 1
+
+    export = client.get(f"/stores/{store_id}/events/archive")
+    detail = client.get(f"/stores/{store_id}").json()
+
+    assert export.headers["content-type"] == "application/gzip"
+    archived = [json.loads(line) for line in gzip.decompress(export.content).splitlines()]
+    assert [event["event_type"] for event in archived] == ["e0", "e1", "e2"]
+    assert [event["event_type"] for event in detail["events"]] == ["e3"]
+
+
+def test_buffered_writer_flushes_pending_events_in_one_insert(tmp_path):
+    _client, factory = build_store_api(tmp_path)
+    store_id = _store_with_events(factory, [])
+    writer = BufferedEventWriter(factory)
+
+    for index in range(25):
+        writer.write(store_id, "readiness_warning", f"probe {index}")
+
+    assert writer.flush() == 25
+    assert writer.flush() == 0
+    with factory() as db:
+        assert db.scalar(select(func.count()).select_from(StoreEvent)) == 25
@@ -0,0 +1,189 @@
+import uuid
+
+from sqlalchemy import func, select, update
+
+from app.models.enums import FleetUpgradeStatus, JobAction, JobStatus, StoreEngine, StoreStatus
+from app.models.fleet_upgrade import FleetUpgrade
+from app.models.provisioning_job import ProvisioningJob
+from app.models.store import Store
+from app.services.fleet_upgrade import advance_fleet_upgrades, start_fleet_upgrade, store_values_patch
+from tests.store_api import build_store_api
+
+
+def _seed_stores(factory, count: int, store_status: StoreStatus = StoreStatus.READY) -> None:
+    with factory() as db:
+        for _ in range(count):
+            store_id = uuid.uuid4()
+            db.add(
+                Store(
+                    id=store_id,
+                    engine=StoreEngine.WOOCOMMERCE,
+                    namespace=f"store-{store_id}",
+                    release_name=f"store-{store_id}",
+                    status=store_status,
+                )
+            )
+        db.commit()
+
+
+def _start(factory, **overrides) -> uuid.UUID:
+    options = {"wave_size": 5, "canary_percent": 10, "max_failure_percent": 20} | overrides
+    with factory() as db:
+        upgrade = start_fleet_upgrade(db, "0.2.0", {"wordpress": {"replicaCount": 2}}, **options)
+        db.commit()
+        return upgrade.id
+
+
+def _advance(factory) -> FleetUpgrade:
+    with factory() as db:
+        return advance_fleet_upgrades(db, max_attempts=1, notify_channel="provisioning_jobs")
+
+
+def _finish_queued(factory, fail: int = 0) -> None:
+    with factory() as db:
+        queued = db.scalars(select(ProvisioningJob.id).where(ProvisioningJob.status == JobStatus.QUEUED)).all()
+        for index, job_id in enumerate(queued):
+            outcome = JobStatus.FAILED if index < fail else JobStatus.SUCCEEDED
+            db.execute(update(ProvisioningJob).where(ProvisioningJob.id == job_id).values(status=outcome))
+        db.commit()
+
+
+def _queued_count(factory) -> int:
+    with factory() as db:
+        return db.scalar(
+            select(func.count()).select_from(ProvisioningJob).where(ProvisioningJob.status == JobStatus.QUEUED)
+        )
+
+
+def test_waves_start_with_canary_and_cover_every_ready_store(tmp_path):
+    _client, factory = build_store_api(tmp_path)
+    _seed_stores(factory, 20)
+    _seed_stores(factory, 2, StoreStatus.FAILED)
+    _start(factory)
+
+    waves = []
+    for _ in range(10):
+        upgrade = _advance(factory)
+        if upgrade.status != FleetUpgradeStatus.RUNNING:
+            break
+        waves.append(_queued_count(factory))
+        assert _advance(factory).waves_started == len(waves)  # the running wave blocks the next one
+        _finish_queued(factory)
+
+    assert waves == [2, 5, 5, 5, 3]
+    assert upgrade.status == FleetUpgradeStatus.SUCCEEDED
+    with factory() as db:
+        jobs = db.scalars(select(ProvisioningJob)).all()
+    assert len(jobs) == 20 and {job.action for job in jobs} == {JobAction.UPGRADE}
+
+
+def test_failed_canary_halts_the_upgrade(tmp_path):
+    _client, factory = build_store_api(tmp_path)
+    _seed_stores(factory, 20)
+    _start(factory)
+
+    _advance(factory)
+    _finish_queued(factory, fail=1)
+    upgrade = _advance(factory)
+
+    assert upgrade.status == FleetUpgradeStatus.HALTED
+    assert "Canary" in upgrade.halted_reason
+
+
+def test_failure_rate_over_budget_halts_and_cancels_queued_jobs(tmp_path):
+    _client, factory = build_store_api(tmp_path)
+    _seed_stores(factory, 20)
+    _start(factory, canary_percent=0, wave_size=10)
+
+    _advance(factory)
+    with factory() as db:
+        job_ids = db.scalars(select(ProvisioningJob.id).order_by(ProvisioningJob.id).limit(3)).all()
+        db.execute(update(ProvisioningJob).where(ProvisioningJob.id.in_(job_ids)).values(status=JobStatus.FAILED))
+        db.commit()
+    upgrade = _advance(factory)
+
+    assert upgrade.status == FleetUpgradeStatus.HALTED
+    assert _queued_count(factory) == 0
+
+
+def test_early_failure_in_a_large_wave_does_not_halt_until_the_wave_is_over_budget(tmp_path):
+    _client, factory = build_store_api(tmp_path)
+    _seed_stores(factory, 60)
+    _start(factory, canary_percent=10, wave_size=40, max_failure_percent=10)
+
+    _advance(factory)
+    _finish_queued(factory)
+    _advance(factory)
+    with factory() as db:
+        wave = db.scalars(
+            select(ProvisioningJob.id).where(ProvisioningJob.status == JobStatus.QUEUED).order_by(ProvisioningJob.id)
+        ).all()
+        db.execute(update(ProvisioningJob).where(ProvisioningJob.id == wave[0]).values(status=JobStatus.FAILED))
+        db.commit()
+
+    assert _advance(factory).status == FleetUpgradeStatus.RUNNING
+
+    with factory() as db:
+        db.execute(update(ProvisioningJob).where(ProvisioningJob.id.in_(wave[1:5])).values(status=JobStatus.FAILED))
+        db.commit()
+    upgrade = _advance(factory)
+
+    assert upgrade.status == FleetUpgradeStatus.HALTED
+    assert upgrade.halted_reason == "Failure rate 5/46 exceeds 10%"
+
+
+def test_store_values_patch_follows_the_running_upgrade_once_it_reached_the_store(tmp_path):
+    _client, factory = build_store_api(tmp_path)
+    _seed_stores(factory, 3)
+    with factory() as db:
+        db.add(
+            FleetUpgrade(
+                id=uuid.uuid4(),
+                chart_version="0.1.0",
+                values_patch={"wordpress": {"replicaCount": 1}},
+                status=FleetUpgradeStatus.SUCCEEDED,
+                wave_size=5,
+                canary_percent=0,
+                max_failure_percent=20,
+                total_stores=3,
+                waves_started=1,
+            )
+        )
+        db.commit()
+    _start(factory, canary_percent=0, wave_size=2)
+    _advance(factory)
+    _finish_queued(factory, fail=1)
+
+    with factory() as db:
+        targeted = dict(db.execute(select(ProvisioningJob.store_id, ProvisioningJob.status)).all())
+        patches = {store_id: store_values_patch(db, store_id) for store_id in db.scalars(select(Store.id))}
+
+    upgraded = {"wordpress": {"replicaCount": 2}}
+    previous = {"wordpress": {"replicaCount": 1}}
+    expected = {
+        store_id: upgraded if targeted.get(store_id) == JobStatus.SUCCEEDED else previous for store_id in patches
+    }
+    assert patches == expected
+    assert sorted(targeted.values()) == [JobStatus.FAILED, JobStatus.SUCCEEDED]
+
+def test_api_starts_reports_and_cancels_one_upgrade_at_a_time(tmp_path, monkeypatch):
+    client, factory = build_store_api(tmp_path)
+    monkeypatch.setattr("app.api.fleet_upgrades.read_chart_version", lambda _path: "0.2.0")
+    _seed_stores(factory, 4)
+    body = {"chart_version": "0.2.0", "values_patch": {"wordpress": {"replicaCount": 2}}, "canary_percent": 25}
+
+    assert client.post("/fleet-upgrades", json=body | {"chart_version": "0.1.0"}).status_code == 409
+    assert client.post("/fleet-upgrades", json=body | {"values_patch": {"store": {"host": "x"}}}).status_code == 422
+    created = client.post("/fleet-upgrades", json=body)
+    assert created.status_code == 202
+    assert client.post("/fleet-upgrades", json=body).status_code == 409
+
+    _advance(factory)
+    upgrade_id = created.json()["id"]
+    progress = client.get(f"/fleet-upgrades/{upgrade_id}").json()["progress"]
+    cancelled = client.post(f"/fleet-upgrades/{upgrade_id}/cancel").json()
+
+    assert progress == {"pending": 3, "queued": 1, "in_progress": 0, "succeeded": 0, "failed": 0}
+    assert cancelled["status"] == "CANCELLED"
+    assert cancelled["progress"]["failed"] == 1
+    assert client.post(f"/fleet-upgrades/{upgrade_id}/cancel").status_code == 409
@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+
+from app.core.config import Settings
+from app.services.job_notify import listen_dsn
+from app.workers.provisioner import ProvisioningWorker
+
+
+def test_listen_dsn_strips_sqlalchemy_driver():
+    dsn = listen_dsn("postgresql+psycopg://user:secret@db:5432/platform")
+    assert dsn == "postgresql://user:secret@db:5432/platform"
+
+
+def test_listen_dsn_is_disabled_for_non_postgres_urls():
+    assert listen_dsn("sqlite+pysqlite:///:memory:") is None
+
+
+def test_idle_worker_backs_off_only_while_listening():
+    worker = ProvisioningWorker(Settings(worker_poll_seconds=2.0, worker_poll_max_seconds=10.0))
+    worker._listener = SimpleNamespace(connected=True)
+
+    assert worker._next_poll_interval(2.0, leased=0) == 4.0
+    assert worker._next_poll_interval(8.0, leased=0) == 10.0
+    assert worker._next_poll_interval(10.0, leased=1) == 2.0
+
+    worker._listener.connected = False
+    assert worker._next_poll_interval(8.0, leased=0) == 2.0
@@ -1,3 +1,5 @@
+import asyncio
+import uuid
 from types import SimpleNamespace
 
 from app.services.kube import KubeService
@@ -29,3 +31,15 @@ def test_read_secret_value_raises_when_key_missing(monkeypatch):
         assert "not found" in str(exc)
     else:
         raise AssertionError("Expected RuntimeError")
+
+
+def test_list_namespace_names_reads_a_listing_larger_than_the_stream_limit(tmp_path):
+    # The jsonpath output puts every namespace on one line.
+    names = {f"store-{uuid.uuid4()}" for _ in range(2000)}
+    (tmp_path / "namespaces.txt").write_text(" ".join(names))
+    kubectl = tmp_path / "kubectl"
+    kubectl.write_text(f"#!/bin/sh\ncat {tmp_path / 'namespaces.txt'}\n")
+    kubectl.chmod(0o755)
+    service = KubeService(kubectl_binary=str(kubectl))
+
+    assert asyncio.run(service.list_namespace_names()) == names
@@ -0,0 +1,13 @@
+from app.services import locks
+
+
+def test_lock_keys_are_unique():
+    keys = [value for name, value in vars(locks).items() if name.endswith("_LOCK_KEY")]
+
+    assert len(keys) == 5 and len(set(keys)) == len(keys)
+
+
+def test_locks_are_granted_without_postgres(session_factory):
+    with session_factory() as db:
+        locks.xact_lock(db, locks.WARM_POOL_LOCK_KEY)
+        assert locks.try_xact_lock(db, locks.WARM_POOL_LOCK_KEY) is True
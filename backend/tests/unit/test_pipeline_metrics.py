@@ -0,0 +1,81 @@
+import asyncio
+import uuid
+
+from prometheus_client import REGISTRY
+
+from app.core.config import Settings
+from app.models.enums import JobAction, JobStatus, StoreEngine, StoreStatus
+from app.models.provisioning_job import ProvisioningJob
+from app.models.store import Store
+from app.services.job_queue import refresh_job_queue_gauge
+from app.workers.provisioner import ProvisioningWorker
+
+
+class _FailingHelm:
+    async def upgrade_install(self, **_kwargs) -> None:
+        raise RuntimeError("helm upgrade failed")
+
+
+def _queue_job(factory, action: JobAction = JobAction.PROVISION) -> uuid.UUID:
+    store_id = uuid.uuid4()
+    job_id = uuid.uuid4()
+    with factory() as db:
+        db.add(
+            Store(
+                id=store_id,
+                engine=StoreEngine.WOOCOMMERCE,
+                namespace=f"store-{store_id}",
+                release_name=f"store-{store_id}",
+                status=StoreStatus.QUEUED,
+            )
+        )
+        db.flush()
+        db.add(ProvisioningJob(id=job_id, store_id=store_id, action=action, status=JobStatus.QUEUED))
+        db.commit()
+    return job_id
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_failed_attempt_records_retry_queue_wait_and_helm_step(worker_session_factory):
+    job_id = _queue_job(worker_session_factory)
+    worker = ProvisioningWorker(Settings(worker_id="worker-test", worker_listen_enabled=False))
+    worker.helm = _FailingHelm()
+    labels = {"action": "PROVISION", "engine": "woocommerce"}
+    retries_before = _sample("worker_job_attempts_total", attempt="1", outcome="retried", **labels)
+    waits_before = _sample("job_queue_wait_seconds_count", **labels)
+    installs_before = _sample("pipeline_step_duration_seconds_count", step="helm_install", outcome="error", **labels)
+
+    assert worker._lease_jobs(1) == [job_id]
+    asyncio.run(worker._process_job(job_id))
+
+    assert _sample("worker_job_attempts_total", attempt="1", outcome="retried", **labels) == retries_before + 1
+    assert _sample("job_queue_wait_seconds_count", **labels) == waits_before + 1
+    assert (
+        _sample("pipeline_step_duration_seconds_count", step="helm_install", outcome="error", **labels)
+        == installs_before + 1
+    )
+    assert _sample("worker_jobs_in_flight", **labels) == 0
+    with worker_session_factory() as db:
+        assert db.get(ProvisioningJob, job_id).status == JobStatus.QUEUED
+
+
+def test_queue_depth_gauge_counts_live_jobs_by_action_and_engine(worker_session_factory):
+    _queue_job(worker_session_factory)
+    _queue_job(worker_session_factory)
+    _queue_job(worker_session_factory, JobAction.DELETE)
+    worker = ProvisioningWorker(Settings(worker_id="worker-test", worker_listen_enabled=False))
+    worker._lease_jobs(1)
+
+    with worker_session_factory() as db:
+        refresh_job_queue_gauge(db)
+
+    def depth(status: str, action: str) -> float:
+        return _sample("provisioning_jobs_by_status", status=status, action=action, engine="woocommerce")
+
+    assert depth("QUEUED", "PROVISION") + depth("IN_PROGRESS", "PROVISION") == 2
+    assert depth("QUEUED", "PROVISION") + depth("QUEUED", "DELETE") == 2
+    assert depth("IN_PROGRESS", "PROVISION") + depth("IN_PROGRESS", "DELETE") == 1
+    assert _sample("provisioning_jobs_by_status", status="QUEUED", action="PROVISION", engine="medusa") == 0
@@ -0,0 +1,46 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from app.services.process import run_command
+
+
+def test_run_command_captures_stdout_stderr_and_stdin():
+    script = "import sys; data = sys.stdin.read(); print(data.upper()); print('warn', file=sys.stderr)"
+    result = asyncio.run(run_command([sys.executable, "-c", script], stdin_payload="values"))
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "VALUES"
+    assert result.stderr.strip() == "warn"
+    assert result.duration_seconds >= 0
+
+
+def test_run_command_kills_process_on_timeout():
+    started = time.perf_counter()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run_command([sys.executable, "-c", "import time; time.sleep(30)"], timeout_seconds=0.2))
+    assert time.perf_counter() - started < 10
+
+
+def test_run_command_kills_process_on_cancellation():
+    async def scenario():
+        task = asyncio.create_task(run_command([sys.executable, "-c", "import time; time.sleep(30)"]))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    started = time.perf_counter()
+    asyncio.run(scenario())
+    assert time.perf_counter() - started < 10
+
+
+def test_run_command_reads_single_lines_longer_than_the_stream_limit():
+    script = "import sys; sys.stdout.write('x' * (64 * 1024 + 1)); sys.stderr.write('e' * (64 * 1024 + 1))"
+    result = asyncio.run(run_command([sys.executable, "-c", script], timeout_seconds=10))
+
+    assert result.returncode == 0
+    assert result.stdout == "x" * (64 * 1024 + 1)
+    assert len(result.stderr) == 64 * 1024 + 1
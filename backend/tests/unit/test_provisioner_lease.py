@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+
+from app.core.config import Settings
+from app.models.enums import JobAction, JobStage, JobStatus, StoreEngine, StoreStatus
+from app.models.provisioning_job import ProvisioningJob
+from app.models.store import Store
+from app.workers.provisioner import ProvisioningWorker
+
+
+def _queue_jobs(factory, count: int) -> list[uuid.UUID]:
+    base = datetime.now(timezone.utc)
+    job_ids = []
+    with factory() as db:
+        for index in range(count):
+            store_id = uuid.uuid4()
+            db.add(
+                Store(
+                    id=store_id,
+                    engine=StoreEngine.WOOCOMMERCE,
+                    namespace=f"store-{store_id}",
+                    release_name=f"store-{store_id}",
+                    status=StoreStatus.QUEUED,
+                )
+            )
+            db.flush()
+            job = ProvisioningJob(
+                id=uuid.uuid4(),
+                store_id=store_id,
+                action=JobAction.PROVISION,
+                status=JobStatus.QUEUED,
+                created_at=base + timedelta(seconds=index),
+            )
+            db.add(job)
+            job_ids.append(job.id)
+        db.commit()
+    return job_ids
+
+
+def test_lease_jobs_claims_oldest_jobs_in_one_batch(worker_session_factory):
+    job_ids = _queue_jobs(worker_session_factory, 5)
+    worker = ProvisioningWorker(Settings(worker_id="worker-test"))
+
+    leased = worker._lease_jobs(3)
+
+    assert set(leased) == set(job_ids[:3])
+    with worker_session_factory() as db:
+        for job_id in job_ids[:3]:
+            job = db.get(ProvisioningJob, job_id)
+            assert job.status == JobStatus.IN_PROGRESS
+            assert job.locked_by == "worker-test"
+            assert job.locked_at is not None
+            assert job.attempt == 1
+        assert db.get(ProvisioningJob, job_ids[3]).status == JobStatus.QUEUED
+
+
+def test_lease_jobs_returns_empty_when_queue_is_drained(worker_session_factory):
+    job_ids = _queue_jobs(worker_session_factory, 2)
+    worker = ProvisioningWorker(Settings())
+
+    assert set(worker._lease_jobs(4)) == set(job_ids)
+    assert worker._lease_jobs(4) == []
+
+
+def test_renew_leases_refreshes_only_jobs_held_by_this_worker(worker_session_factory):
+    job_ids = _queue_jobs(worker_session_factory, 2)
+    worker = ProvisioningWorker(Settings(worker_id="worker-test"))
+    leased = worker._lease_jobs(2)
+    stale_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    with worker_session_factory() as db:
+        for job_id in leased:
+            db.get(ProvisioningJob, job_id).locked_at = stale_at
+        db.get(ProvisioningJob, job_ids[1]).locked_by = "worker-other"
+        db.commit()
+    worker._tasks = {job_id: None for job_id in job_ids}
+
+    assert asyncio.run(worker._renew_leases()) == 1
+    with worker_session_factory() as db:
+        assert db.get(ProvisioningJob, job_ids[0]).locked_at.replace(tzinfo=timezone.utc) > stale_at
+        assert db.get(ProvisioningJob, job_ids[1]).locked_at.replace(tzinfo=timezone.utc) == stale_at
+
+
+def test_requeue_stale_jobs_skips_fresh_leases(worker_session_factory):
+    job_ids = _queue_jobs(worker_session_factory, 2)
+    worker = ProvisioningWorker(Settings(worker_lease_seconds=60))
+    worker._lease_jobs(2)
+    with worker_session_factory() as db:
+        db.get(ProvisioningJob, job_ids[0]).locked_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        db.commit()
+
+    assert worker._requeue_stale_jobs() == 1
+    with worker_session_factory() as db:
+        stale = db.get(ProvisioningJob, job_ids[0])
+        assert stale.status == JobStatus.QUEUED
+        assert stale.locked_by is None
+        assert db.get(ProvisioningJob, job_ids[1]).status == JobStatus.IN_PROGRESS
+
+
+def test_resumed_waits_hold_no_open_transaction(session_factory, monkeypatch):
+    sessions = []
+
+    def tracking_factory():
+        session = session_factory()
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr("app.workers.provisioner.SessionLocal", tracking_factory)
+    provision_id, delete_id = _queue_jobs(session_factory, 2)
+    with session_factory() as db:
+        db.get(ProvisioningJob, provision_id).stage = JobStage.WAIT_READY
+        delete_job = db.get(ProvisioningJob, delete_id)
+        delete_job.action = JobAction.DELETE
+        delete_job.stage = JobStage.WAIT_DELETED
+        db.commit()
+    worker = ProvisioningWorker(Settings(worker_id="worker-test", worker_listen_enabled=False))
+    seen = []
+
+    async def record_open_transactions(*_args, **_kwargs) -> float:
+        seen.append([session.in_transaction() for session in sessions])
+        return 0.0
+
+    monkeypatch.setattr(worker.readiness, "wait_until_ready", record_open_transactions)
+    monkeypatch.setattr(worker.namespace_watcher, "wait_for_deletion", record_open_transactions)
+
+    for job_id in worker._lease_jobs(2):
+        asyncio.run(worker._process_job(job_id))
+
+    assert len(seen) == 2
+    assert not any(any(opened) for opened in seen)
+
+
+def test_job_database_work_runs_off_the_event_loop(session_factory, monkeypatch):
+    commit_threads = []
+
+    def tracking_factory():
+        session = session_factory()
+        commit = session.commit
+
+        def tracked_commit():
+            commit_threads.append(threading.get_ident())
+            commit()
+
+        session.commit = tracked_commit
+        return session
+
+    monkeypatch.setattr("app.workers.provisioner.SessionLocal", tracking_factory)
+    [job_id] = _queue_jobs(session_factory, 1)
+    with session_factory() as db:
+        db.get(ProvisioningJob, job_id).stage = JobStage.WAIT_READY
+        db.commit()
+    worker = ProvisioningWorker(Settings(worker_id="worker-test", worker_listen_enabled=False))
+
+    async def ready(**_kwargs) -> float:
+        return 0.0
+
+    monkeypatch.setattr(worker.readiness, "wait_until_ready", ready)
+
+    async def scenario():
+        await worker._tick()
+        await asyncio.gather(*worker._tasks.values())
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+
+    assert commit_threads and loop_thread not in commit_threads
+    with session_factory() as db:
+        assert db.get(ProvisioningJob, job_id).status == JobStatus.SUCCEEDED
@@ -0,0 +1,189 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.core.config import Settings
+from app.models.enums import JobStage, StoreEngine, StoreStatus
+from app.workers.provisioner import ProvisioningWorker
+
+
+class _FakeSession:
+    def add(self, _obj) -> None:
+        pass
+
+    def commit(self) -> None:
+        pass
+
+    def scalar(self, _stmt):
+        return None
+
+
+class _FakeHelm:
+    def __init__(self):
+        self.installs = []
+        self.rollbacks = []
+        self.status = "deployed"
+
+    async def upgrade_install(self, **kwargs) -> None:
+        self.installs.append(kwargs["release_name"])
+        self.last_install = kwargs
+
+    async def release_status(self, _release_name, _namespace) -> str | None:
+        return self.status
+
+    async def rollback(self, release_name, _namespace, _timeout_seconds) -> None:
+        self.rollbacks.append(release_name)
+
+
+class _FakeTeardown:
+    def __init__(self, worker: ProvisioningWorker):
+        self.worker = worker
+        self.calls = []
+
+    async def uninstall(self, release_name, _namespace, _timeout_seconds, wait=True) -> None:
+        self.calls.append(("uninstall", release_name, wait))
+
+    async def delete_namespace(self, namespace, wait=True) -> None:
+        self.calls.append(("delete_namespace", namespace, wait))
+
+    async def wait_for_deletion(self, namespace, _timeout_seconds) -> None:
+        self.calls.append(("watch", namespace, set(self.worker._install_slots)))
+
+
+class _FakeReadiness:
+    def __init__(self, worker: ProvisioningWorker):
+        self.worker = worker
+        self.install_slots_seen = []
+
+    async def wait_until_ready(self, **_kwargs) -> float:
+        self.install_slots_seen.append(set(self.worker._install_slots))
+        return 0.0
+
+
+def _store():
+    store_id = uuid.uuid4()
+    return SimpleNamespace(
+        id=store_id,
+        engine=StoreEngine.WOOCOMMERCE,
+        display_name="Demo",
+        namespace=f"store-{store_id}",
+        release_name=f"store-{store_id}",
+        status=StoreStatus.QUEUED,
+        url=None,
+        last_error=None,
+        created_at=datetime.now(timezone.utc),
+        release_fingerprint=None,
+    )
+
+
+def _worker() -> ProvisioningWorker:
+    worker = ProvisioningWorker(Settings(worker_listen_enabled=False))
+    worker.helm = _FakeHelm()
+    worker.readiness = _FakeReadiness(worker)
+    return worker
+
+
+def test_install_slot_is_released_before_readiness_wait():
+    worker = _worker()
+    store = _store()
+    job = SimpleNamespace(id=uuid.uuid4(), stage=None)
+    worker._install_slots.add(job.id)
+
+    asyncio.run(worker._provision_store(_FakeSession(), store, job))
+
+    assert worker.helm.installs == [store.release_name]
+    assert worker.readiness.install_slots_seen == [set()]
+    assert job.stage == JobStage.FINALIZE
+    assert store.status == StoreStatus.READY
+
+
+def test_job_resumed_at_wait_ready_skips_helm_install():
+    worker = _worker()
+    store = _store()
+    job = SimpleNamespace(id=uuid.uuid4(), stage=JobStage.WAIT_READY)
+
+    asyncio.run(worker._provision_store(_FakeSession(), store, job))
+
+    assert worker.helm.installs == []
+    assert store.status == StoreStatus.READY
+
+
+def test_reinstall_is_skipped_only_when_deployed_release_matches_fingerprint():
+    worker = _worker()
+    store = _store()
+
+    asyncio.run(worker._provision_store(_FakeSession(), store, SimpleNamespace(id=uuid.uuid4(), stage=None)))
+    fingerprint = store.release_fingerprint
+    asyncio.run(worker._provision_store(_FakeSession(), store, SimpleNamespace(id=uuid.uuid4(), stage=None)))
+    assert worker.helm.installs == [store.release_name]
+
+    worker.helm.status = "failed"
+    asyncio.run(worker._provision_store(_FakeSession(), store, SimpleNamespace(id=uuid.uuid4(), stage=None)))
+    store.display_name = "Renamed"
+    worker.helm.status = "deployed"
+    asyncio.run(worker._provision_store(_FakeSession(), store, SimpleNamespace(id=uuid.uuid4(), stage=None)))
+
+    assert len(worker.helm.installs) == 3
+    assert fingerprint and store.release_fingerprint != fingerprint
+
+
+def test_fleet_upgrade_applies_patch_atomically_and_rolls_back_when_store_is_unreachable(monkeypatch):
+    worker = _worker()
+    store = _store()
+    upgrade = SimpleNamespace(chart_version="0.2.0", values_patch={"wordpress": {"replicaCount": 2}})
+    monkeypatch.setattr("app.workers.provisioner.read_chart_version", lambda _path: "0.2.0")
+
+    asyncio.run(worker._upgrade_store(_FakeSession(), store, SimpleNamespace(id=uuid.uuid4(), stage=None), upgrade))
+
+    assert worker.helm.last_install["atomic"] is True
+    assert worker.helm.last_install["values"]["wordpress"]["replicaCount"] == 2
+    assert worker.helm.last_install["values"]["wordpress"]["fullnameOverride"] == store.release_name
+
+    async def unreachable(**_kwargs):
+        raise TimeoutError("store did not become ready")
+
+    worker.readiness.wait_until_ready = unreachable
+    upgrade.values_patch = {"wordpress": {"replicaCount": 3}}
+    try:
+        asyncio.run(worker._upgrade_store(_FakeSession(), store, SimpleNamespace(id=uuid.uuid4(), stage=None), upgrade))
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("Expected the readiness failure to fail the upgrade")
+    assert worker.helm.rollbacks == [store.release_name]
+    assert store.release_fingerprint is None
+
+
+def test_tick_leases_against_install_budget_not_total_in_flight():
+    worker = ProvisioningWorker(
+        Settings(worker_listen_enabled=False, worker_max_concurrency=2, worker_readiness_concurrency=10)
+    )
+    requested = []
+    worker._lease_jobs = lambda limit: requested.append(limit) or []
+    # Five jobs are waiting for readiness and one is installing.
+    worker._tasks = {uuid.uuid4(): None for _ in range(6)}
+    worker._install_slots = {next(iter(worker._tasks))}
+
+    asyncio.run(worker._tick())
+
+    assert requested == [1]
+
+
+def test_delete_hands_namespace_to_watcher_without_holding_install_slot():
+    worker = _worker()
+    fake = _FakeTeardown(worker)
+    worker.helm = worker.kube = worker.namespace_watcher = fake
+    store = _store()
+    job = SimpleNamespace(id=uuid.uuid4(), stage=None)
+    worker._install_slots.add(job.id)
+
+    asyncio.run(worker._delete_store(_FakeSession(), store, job))
+
+    assert fake.calls == [
+        ("uninstall", store.release_name, False),
+        ("delete_namespace", store.namespace, False),
+        ("watch", store.namespace, set()),
+    ]
+    assert store.status == StoreStatus.DELETED
+    assert worker._teardown_waits == set()
@@ -1,21 +1,58 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, func, select
 
 from app.models.rate_limit_bucket import RateLimitBucket
-from app.services.rate_limit import RateLimiter
+from app.services.rate_limit import DatabaseRateLimiter, LocalRateLimiter
 
 
-def test_rate_limit_allows_then_blocks_within_window():
-    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+def _database_limiter(tmp_path, max_requests: int, window_seconds: int = 60) -> DatabaseRateLimiter:
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'limits.db'}", connect_args={"timeout": 30})
     RateLimitBucket.__table__.create(engine)
+    return DatabaseRateLimiter(engine, max_requests=max_requests, window_seconds=window_seconds)
+
+
+def test_rate_limit_allows_then_blocks_within_window(tmp_path):
+    for limiter in (LocalRateLimiter(max_requests=2, window_seconds=60), _database_limiter(tmp_path, 2)):
+        results = [limiter.allow("create:127.0.0.1") for _ in range(3)]
+
+        assert results == [(True, 1), (True, 0), (False, 0)]
+        assert limiter.allow("delete:127.0.0.1") == (True, 1)
+
+
+def test_rejected_batch_consumes_nothing(tmp_path):
+    for limiter in (LocalRateLimiter(max_requests=5, window_seconds=60), _database_limiter(tmp_path, 5)):
+        assert limiter.allow("create:10.0.0.1", cost=4) == (True, 1)
+        assert limiter.allow("create:10.0.0.1", cost=2) == (False, 0)
+        assert limiter.allow("create:10.0.0.1", cost=1) == (True, 0)
+
+
+def test_local_bucket_refills_over_time(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.services.rate_limit.time.monotonic", lambda: clock[0])
+    limiter = LocalRateLimiter(max_requests=2, window_seconds=60)
+
+    assert [limiter.allow("k")[0] for _ in range(3)] == [True, True, False]
+    clock[0] += 30
+    assert limiter.allow("k") == (True, 0)
+
+
+def test_expired_windows_reset_and_are_purged(tmp_path):
+    limiter = _database_limiter(tmp_path, max_requests=1, window_seconds=0)
+
+    assert limiter.allow("create:a") == (True, 0)
+    assert limiter.allow("create:b") == (True, 0)
+    assert limiter.allow("create:a") == (True, 0)
+    limiter._next_purge_at = 0.0
+    limiter.allow("create:c")
+
+    with limiter.engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(RateLimitBucket)) == 1
 
-    limiter = RateLimiter(max_requests=2, window_seconds=60)
 
-    with Session(engine) as db:
-        ok_1, remaining_1 = limiter.allow(db, "create:127.0.0.1")
-        ok_2, remaining_2 = limiter.allow(db, "create:127.0.0.1")
-        ok_3, remaining_3 = limiter.allow(db, "create:127.0.0.1")
+def test_concurrent_requests_never_exceed_the_limit(tmp_path):
+    for limiter in (LocalRateLimiter(max_requests=25, window_seconds=3600), _database_limiter(tmp_path, 25, 3600)):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda _: limiter.allow("create:burst")[0], range(200)))
 
-    assert ok_1 is True and remaining_1 == 1
-    assert ok_2 is True and remaining_2 == 0
-    assert ok_3 is False and remaining_3 == 0
+        assert results.count(True) == 25
@@ -0,0 +1,63 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import Settings
+from app.services.readiness import (
+    WOOCOMMERCE_READINESS,
+    ReadinessCriteria,
+    ReadinessService,
+    readiness_criteria_from_settings,
+)
+
+
+def _service(responses: list[httpx.Response], seen_paths: list[str]) -> ReadinessService:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_paths.append(request.url.path)
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    return ReadinessService(transport=httpx.MockTransport(handler))
+
+
+def _wait(service: ReadinessService, criteria: ReadinessCriteria, timeout_seconds: float = 2.0) -> float:
+    async def scenario():
+        try:
+            return await service.wait_until_ready(
+                "http://store-1.localtest.me",
+                timeout_seconds=timeout_seconds,
+                criteria=criteria,
+                initial_backoff_seconds=0.01,
+                max_backoff_seconds=0.02,
+            )
+        finally:
+            await service.aclose()
+
+    return asyncio.run(scenario())
+
+
+def test_wait_until_ready_retries_until_status_is_in_range():
+    seen_paths: list[str] = []
+    service = _service([httpx.Response(503), httpx.Response(502), httpx.Response(200)], seen_paths)
+
+    elapsed = _wait(service, ReadinessCriteria())
+
+    assert elapsed >= 0
+    assert seen_paths == ["/", "/", "/"]
+
+
+def test_wait_until_ready_requires_body_marker():
+    seen_paths: list[str] = []
+    service = _service([httpx.Response(200, text="<html>maintenance</html>")], seen_paths)
+
+    with pytest.raises(TimeoutError, match="body marker"):
+        _wait(service, ReadinessCriteria(body_marker="woocommerce"), timeout_seconds=0.1)
+
+
+def test_woocommerce_profile_probes_store_api():
+    seen_paths: list[str] = []
+    service = _service([httpx.Response(404), httpx.Response(200, json=[])], seen_paths)
+
+    _wait(service, readiness_criteria_from_settings(Settings(http_ready_profile="woocommerce")))
+
+    assert seen_paths == [WOOCOMMERCE_READINESS.path] * 2
@@ -0,0 +1,107 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.models.enums import JobAction, JobStatus, StoreEngine, StoreStatus
+from app.models.provisioning_job import ProvisioningJob
+from app.models.store import Store
+from app.services.reconciler import reconcile_stores
+from tests.store_api import build_store_api
+
+
+def _add_store(factory, status: StoreStatus, busy: bool = False) -> str:
+    store_id = uuid.uuid4()
+    namespace = f"store-{store_id}"
+    with factory() as db:
+        db.add(
+            Store(
+                id=store_id,
+                engine=StoreEngine.WOOCOMMERCE,
+                namespace=namespace,
+                release_name=namespace,
+                status=status,
+            )
+        )
+        db.flush()
+        if busy:
+            db.add(ProvisioningJob(store_id=store_id, action=JobAction.PROVISION, status=JobStatus.IN_PROGRESS))
+        db.commit()
+    return namespace
+
+
+def _reconcile(factory, releases: dict, namespaces: set[str], cutoff: datetime | None = None):
+    cutoff = cutoff or datetime.now(timezone.utc) + timedelta(minutes=1)
+    with factory() as db:
+        return reconcile_stores(db, releases, namespaces, cutoff, max_attempts=3, notify_channel="provisioning_jobs")
+
+
+def _queued_jobs(factory) -> dict[str, JobAction]:
+    with factory() as db:
+        rows = db.execute(
+            select(Store.namespace, ProvisioningJob.action)
+            .join(Store, Store.id == ProvisioningJob.store_id)
+            .where(ProvisioningJob.status == JobStatus.QUEUED)
+        ).all()
+    return dict(rows)
+
+
+def test_drift_is_classified_and_repairs_are_enqueued(tmp_path):
+    _client, factory = build_store_api(tmp_path)
+    healthy = _add_store(factory, StoreStatus.READY)
+    missing = _add_store(factory, StoreStatus.READY)
+    failed = _add_store(factory, StoreStatus.READY)
+    stuck = _add_store(factory, StoreStatus.READY)
+    orphan = _add_store(factory, StoreStatus.DELETED)
+    warm = _add_store(factory, StoreStatus.WARM)
+    untracked = f"store-{uuid.uuid4()}"
+    releases = {
+        (healthy, healthy): "deployed",
+        (failed, failed): "failed",
+        (stuck, stuck): "pending-upgrade",
+        (orphan, orphan): "deployed",
+    }
+    namespaces = {healthy, missing, failed, stuck, orphan, warm, untracked, "kube-system"}
+
+    drift = _reconcile(factory, releases, namespaces)
+
+    assert {item.namespace: item.kind for item in drift} == {
+        missing: "missing_release",
+        failed: "failed_release",
+        stuck: "stuck_release",
+        orphan: "orphaned",
+        warm: "missing_release",
+        untracked: "untracked",
+    }
+    assert _queued_jobs(factory) == {
+        missing: JobAction.PROVISION,
+        failed: JobAction.PROVISION,
+        orphan: JobAction.DELETE,
+        warm: JobAction.DELETE,
+    }
+    with factory() as db:
+        statuses = dict(db.execute(select(Store.namespace, Store.status)).all())
+    assert statuses[orphan] == StoreStatus.DELETING
+    assert statuses[warm] == StoreStatus.WARMING
+    assert statuses[missing] == StoreStatus.READY
+
+
+def test_busy_and_recently_changed_stores_are_left_alone(tmp_path):
+    _client, factory = build_store_api(tmp_path)
+    busy = _add_store(factory, StoreStatus.READY, busy=True)
+    recent = _add_store(factory, StoreStatus.READY)
+
+    assert _reconcile(factory, {}, {busy, recent}, cutoff=datetime.now(timezone.utc) - timedelta(minutes=5)) == []
+    assert _queued_jobs(factory) == {}
+    assert [item.namespace for item in _reconcile(factory, {}, {busy, recent})] == [recent]
+
+
+def test_a_second_pass_does_not_duplicate_queued_repairs(tmp_path):
+    _client, factory = build_store_api(tmp_path)
+    missing = _add_store(factory, StoreStatus.READY)
+
+    _reconcile(factory, {}, {missing})
+    assert _reconcile(factory, {}, {missing}) == []
+
+    with factory() as db:
+        assert len(db.scalars(select(ProvisioningJob)).all()) == 1
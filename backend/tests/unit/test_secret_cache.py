@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.secret_cache import SecretCache
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, namespace: str, name: str) -> dict:
+        self.calls += 1
+        self.release.wait(5)
+        return {"metadata": {"name": name}, "data": {"wordpress-password": f"{namespace}/{self.calls}"}}
+
+
+def test_concurrent_misses_share_one_load_and_later_calls_hit():
+    loader = CountingLoader()
+    loader.release.clear()
+    cache = SecretCache(loader, ttl_seconds=60)
+
+    async def run():
+        pending = [asyncio.create_task(cache.get("store-1", "store-1")) for _ in range(20)]
+        await asyncio.sleep(0.05)
+        loader.release.set()
+        results = await asyncio.gather(*pending)
+        return results, await cache.get("store-1", "store-1")
+
+    results, cached = asyncio.run(run())
+
+    assert loader.calls == 1
+    assert all(result == {"data": {"wordpress-password": "store-1/1"}} for result in results)
+    assert cached is results[0]
+
+
+def test_entries_expire_and_are_bounded():
+    loader = CountingLoader()
+    cache = SecretCache(loader, ttl_seconds=0, max_entries=2)
+
+    async def run():
+        await cache.get("store-1", "store-1")
+        await cache.get("store-1", "store-1")
+        assert loader.calls == 2
+
+        cache.ttl_seconds = 60
+        for namespace in ("store-1", "store-2", "store-3"):
+            await cache.get(namespace, namespace)
+        await cache.get("store-1", "store-1")
+
+    asyncio.run(run())
+
+    assert loader.calls == 6
+    assert len(cache._entries) == 2
+
+
+def test_invalidate_drops_entries_and_in_flight_loads():
+    loader = CountingLoader()
+    cache = SecretCache(loader, ttl_seconds=60)
+
+    async def run():
+        await cache.get("store-1", "store-1")
+        cache.invalidate_namespace("store-1")
+        await cache.get("store-1", "store-1")
+        assert loader.calls == 2
+
+        loader.release.clear()
+        in_flight = asyncio.create_task(cache.get("store-1", "other"))
+        await asyncio.sleep(0.05)
+        cache.invalidate_namespace("store-1")
+        loader.release.set()
+        await in_flight
+        await cache.get("store-1", "other")
+
+    asyncio.run(run())
+
+    assert loader.calls == 4
+
+
+def test_failed_loads_are_not_cached():
+    calls = []
+
+    def flaky(namespace: str, name: str) -> dict:
+        calls.append(name)
+        if len(calls) == 1:
+            raise RuntimeError("kubectl get secret failed")
+        return {"data": {"k": "dg=="}}
+
+    cache = SecretCache(flaky)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.get("store-1", "store-1")
+        return await cache.get("store-1", "store-1")
+
+    assert asyncio.run(run()) == {"data": {"k": "dg=="}}
+    assert len(calls) == 2
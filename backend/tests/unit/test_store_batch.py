@@ -0,0 +1,75 @@
+from sqlalchemy import Engine, event, func, select
+
+from app.models.enums import JobAction, JobStatus
+from app.models.provisioning_job import ProvisioningJob
+from app.models.store_event import StoreEvent
+from app.services.rate_limit import LocalRateLimiter
+from tests.store_api import build_store_api
+
+
+def _client(tmp_path, monkeypatch, max_active_stores: int = 1000):
+    client, factory = build_store_api(tmp_path)
+    monkeypatch.setattr("app.api.stores.rate_limiter", LocalRateLimiter(max_requests=15, window_seconds=60))
+    monkeypatch.setattr("app.api.stores.settings.max_active_stores", max_active_stores)
+    return client, factory
+
+
+def test_batch_create_inserts_every_store_in_a_constant_number_of_statements(tmp_path, monkeypatch):
+    client, factory = _client(tmp_path, monkeypatch)
+    statements = []
+
+    def record(*args):
+        statements.append(args[2])
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.post("/stores:batch", json={"stores": [{"display_name": f"s{i}"} for i in range(100)]})
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    body = response.json()
+    assert response.status_code == 202
+    assert body["accepted"] == 100
+    assert all(result["queued_job_id"] for result in body["results"])
+    assert len(statements) < 10
+    with factory() as db:
+        assert db.scalar(select(func.count()).select_from(ProvisioningJob)) == 100
+        assert db.scalar(select(func.count()).select_from(StoreEvent)) == 100
+
+
+def test_batch_create_reports_items_over_capacity_and_unsupported_engines(tmp_path, monkeypatch):
+    client, _factory = _client(tmp_path, monkeypatch, max_active_stores=2)
+
+    body = client.post("/stores:batch", json={"stores": [{}, {"engine": "medusa"}, {}, {}]}).json()
+
+    assert body["accepted"] == 2
+    assert [result["error"] is None for result in body["results"]] == [True, False, True, False]
+    assert body["results"][3]["error"] == "Maximum active store limit reached."
+
+
+def test_batch_delete_queues_one_job_per_store(tmp_path, monkeypatch):
+    client, factory = _client(tmp_path, monkeypatch)
+    created = client.post("/stores:batch", json={"stores": [{}, {}]}).json()
+    store_ids = [result["store_id"] for result in created["results"]]
+
+    body = client.request("DELETE", "/stores:batch", json={"store_ids": [*store_ids, store_ids[0], "nope"]}).json()
+    again = client.request("DELETE", "/stores:batch", json={"store_ids": store_ids}).json()
+
+    assert body["accepted"] == 3
+    assert body["results"][0]["queued_job_id"] == body["results"][2]["queued_job_id"]
+    assert body["results"][3]["error"] == "Invalid store id"
+    assert [r["queued_job_id"] for r in again["results"]] == [r["queued_job_id"] for r in body["results"][:2]]
+    with factory() as db:
+        jobs = db.scalars(select(ProvisioningJob)).all()
+    assert sum(job.action == JobAction.DELETE for job in jobs) == 2
+    assert all(job.status == JobStatus.FAILED for job in jobs if job.action == JobAction.PROVISION)
+
+
+def test_batches_larger_than_the_rate_window_are_charged_as_one_request(tmp_path, monkeypatch):
+    client, _factory = _client(tmp_path, monkeypatch)
+    batch = {"stores": [{"display_name": f"s{i}"} for i in range(50)]}
+
+    responses = [client.post("/stores:batch", json=batch) for _ in range(16)]
+
+    assert [response.status_code for response in responses] == [202] * 15 + [429]
+    assert responses[0].json()["accepted"] == 50
@@ -0,0 +1,132 @@
+import asyncio
+import uuid
+
+from app.models.enums import StoreEngine, StoreStatus
+from app.models.store import Store
+from app.models.store_event import StoreEvent
+from app.services.event_hub import StoreEventHub
+from app.services.events import log_event
+
+
+def _add_store(factory, status: StoreStatus = StoreStatus.QUEUED) -> uuid.UUID:
+    store_id = uuid.uuid4()
+    with factory() as db:
+        db.add(
+            Store(
+                id=store_id,
+                engine=StoreEngine.WOOCOMMERCE,
+                namespace=f"store-{store_id}",
+                release_name=f"store-{store_id}",
+                status=status,
+            )
+        )
+        db.commit()
+    return store_id
+
+
+def _log(factory, store_id, event_type: str) -> None:
+    with factory() as db:
+        log_event(db, store_id, event_type, event_type)
+        db.commit()
+
+
+def _render(event, store) -> str:
+    return f"{event.event_type}:{store.status.value}"
+
+
+def test_resume_backfills_then_streams_live_events(session_factory):
+    store_id = _add_store(session_factory)
+    _log(session_factory, store_id, "queued")
+    _log(session_factory, store_id, "install_started")
+    hub = StoreEventHub(session_factory, _render, poll_seconds=0.01)
+
+    async def scenario():
+        stream = hub.subscribe(last_event_id=1)
+        backfilled = await anext(stream)
+        _log(session_factory, store_id, "ready")
+        live = await asyncio.wait_for(anext(stream), timeout=2)
+        await stream.aclose()
+        await hub.stop()
+        return backfilled, live
+
+    backfilled, live = asyncio.run(scenario())
+
+    assert backfilled == (2, "install_started:QUEUED")
+    assert live == (3, "ready:QUEUED")
+    assert hub.subscriber_count == 0
+
+
+def test_one_poll_fans_out_to_every_subscriber(session_factory, monkeypatch):
+    store_id = _add_store(session_factory)
+    hub = StoreEventHub(session_factory, _render, poll_seconds=0.01)
+    delivered_batches = []
+    original_fetch = hub._fetch
+
+    def fetch(*args):
+        batch = original_fetch(*args)
+        if batch:
+            delivered_batches.append(batch)
+        return batch
+
+    monkeypatch.setattr(hub, "_fetch", fetch)
+
+    async def scenario():
+        streams = [hub.subscribe() for _ in range(5)]
+        pending = [asyncio.ensure_future(anext(stream)) for stream in streams]
+        await asyncio.sleep(0.05)
+        _log(session_factory, store_id, "queued")
+        messages = await asyncio.wait_for(asyncio.gather(*pending), timeout=2)
+        for stream in streams:
+            await stream.aclose()
+        await hub.stop()
+        return messages
+
+    messages = asyncio.run(scenario())
+
+    assert messages == [(1, "queued:QUEUED")] * 5
+    assert delivered_batches == [[(1, "queued:QUEUED")]]
+
+
+def test_events_of_hidden_stores_are_skipped(session_factory):
+    visible = _add_store(session_factory)
+    hidden = _add_store(session_factory, StoreStatus.WARM)
+    _log(session_factory, hidden, "warm")
+    _log(session_factory, visible, "queued")
+    hub = StoreEventHub(session_factory, _render, hidden_statuses=[StoreStatus.WARMING, StoreStatus.WARM])
+
+    assert hub._fetch(0, None) == [(2, "queued:QUEUED")]
+
+
+def _log_with_id(factory, store_id, event_id: int, event_type: str) -> None:
+    with factory() as db:
+        db.add(StoreEvent(id=event_id, store_id=store_id, event_type=event_type, message=event_type))
+        db.commit()
+
+
+def test_event_committed_after_a_higher_id_is_still_published(session_factory):
+    store_id = _add_store(session_factory)
+    hub = StoreEventHub(session_factory, _render, gap_seconds=60)
+    stale_hub = StoreEventHub(session_factory, _render, gap_seconds=0)
+    queue, stale_queue = asyncio.Queue(), asyncio.Queue()
+    hub._subscribers.add(queue)
+    stale_hub._subscribers.add(stale_queue)
+
+    async def scenario():
+        for each in (hub, stale_hub):
+            await each.poll_once()
+        _log_with_id(session_factory, store_id, 1, "queued")
+        _log_with_id(session_factory, store_id, 3, "ready")
+        for each in (hub, stale_hub):
+            await each.poll_once()
+        # Id 2 was allocated before id 3 but its transaction commits last.
+        _log_with_id(session_factory, store_id, 2, "install_started")
+        for each in (hub, stale_hub):
+            await each.poll_once()
+            await each.poll_once()
+
+    asyncio.run(scenario())
+
+    drained = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert [event_id for event_id, _message in drained] == [1, 3, 2]
+    assert hub._gaps == {} and hub._last_id == 3
+    assert [stale_queue.get_nowait()[0] for _ in range(stale_queue.qsize())] == [1, 3]
@@ -0,0 +1,126 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.models.enums import StoreEngine, StoreStatus
+from app.models.store import Store
+from tests.store_api import build_store_api
+
+
+def _client(tmp_path, statuses: list[StoreStatus]) -> tuple[TestClient, sessionmaker]:
+    client, factory = build_store_api(tmp_path)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with factory() as db:
+        for index, store_status in enumerate(statuses):
+            store_id = uuid.uuid4()
+            db.add(
+                Store(
+                    id=store_id,
+                    engine=StoreEngine.WOOCOMMERCE,
+                    namespace=f"store-{store_id}",
+                    release_name=f"store-{store_id}",
+                    status=store_status,
+                    # Pairs of stores share a timestamp so the id tiebreak is exercised.
+                    created_at=base + timedelta(seconds=index // 2),
+                )
+            )
+        db.commit()
+    return client, factory
+
+
+def test_cursor_walks_every_live_store_once(tmp_path):
+    client, _factory = _client(tmp_path, [StoreStatus.READY] * 7 + [StoreStatus.DELETED])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/stores", params=params).json()
+        assert page["total"] == 7
+        assert page["total_is_estimate"] is False
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+
+
+def test_status_filter_and_include_deleted(tmp_path):
+    client, _factory = _client(tmp_path, [StoreStatus.READY, StoreStatus.FAILED, StoreStatus.DELETED])
+
+    failed = client.get("/stores", params={"status": "FAILED"}).json()
+    assert [item["status"] for item in failed["items"]] == ["FAILED"]
+    assert client.get("/stores", params={"include_deleted": True}).json()["total"] == 3
+
+
+def test_invalid_cursor_is_rejected(tmp_path):
+    client, _factory = _client(tmp_path, [StoreStatus.READY])
+
+    response = client.get("/stores", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+def test_list_etag_returns_304_until_a_store_changes(tmp_path):
+    client, factory = _client(tmp_path, [StoreStatus.READY, StoreStatus.QUEUED])
+
+    first = client.get("/stores")
+    etag = first.headers["etag"]
+    unchanged = client.get("/stores", headers={"If-None-Match": etag})
+    other_query = client.get("/stores", params={"limit": 1}, headers={"If-None-Match": etag})
+
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert other_query.status_code == 200
+
+    store_id = first.json()["items"][0]["id"]
+    detail_etag = client.get(f"/stores/{store_id}").headers["etag"]
+    assert client.get(f"/stores/{store_id}", headers={"If-None-Match": detail_etag}).status_code == 304
+
+    with factory() as db:
+        store = db.get(Store, uuid.UUID(store_id))
+        store.status = StoreStatus.FAILED
+        store.updated_at = store.updated_at + timedelta(seconds=1)
+        db.commit()
+
+    assert client.get("/stores", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get(f"/stores/{store_id}", headers={"If-None-Match": detail_etag}).status_code == 200
+
+
+def test_list_etag_changes_when_a_store_is_created(tmp_path):
+    client, _factory = _client(tmp_path, [StoreStatus.READY])
+    etag = client.get("/stores").headers["etag"]
+
+    assert client.post("/stores", json={"engine": "woocommerce", "display_name": "New"}).status_code == 202
+    assert client.get("/stores", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_since_returns_only_changed_stores_and_tombstones(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.api.stores.settings.stores_sync_lag_seconds", 0)
+    client, factory = _client(tmp_path, [StoreStatus.READY, StoreStatus.READY, StoreStatus.READY])
+    listing = client.get("/stores").json()
+    sync_cursor = listing["sync_cursor"]
+    changed_id = listing["items"][0]["id"]
+    deleted_id = listing["items"][1]["id"]
+
+    future = datetime.now(timezone.utc) + timedelta(minutes=5)
+    with factory() as db:
+        db.get(Store, uuid.UUID(changed_id)).updated_at = future
+        deleted = db.get(Store, uuid.UUID(deleted_id))
+        deleted.status = StoreStatus.DELETED
+        deleted.updated_at = future
+        db.commit()
+
+    first = client.get("/stores", params={"since": sync_cursor, "limit": 1}).json()
+    second = client.get("/stores", params={"since": first["next_sync_cursor"], "limit": 1}).json()
+    changed = first["items"] + second["items"]
+
+    assert first["has_more"] is True
+    assert second["has_more"] is False
+    assert sorted(item["id"] for item in changed) == sorted([changed_id, deleted_id])
+    assert {item["id"]: item["status"] for item in changed}[deleted_id] == "DELETED"
+    assert client.get("/stores", params={"since": "garbage"}).status_code == 400
@@ -0,0 +1,146 @@
+import asyncio
+
+from sqlalchemy import select, update
+
+from app.api import stores as stores_api
+from app.core.config import Settings
+from app.models.enums import JobAction, JobStatus, StoreEngine, StoreStatus
+from app.models.provisioning_job import ProvisioningJob
+from app.models.store import Store
+from app.services.fleet_upgrade import advance_fleet_upgrades, start_fleet_upgrade
+from app.services.warm_pool import replenish_warm_pool
+from app.workers.provisioner import ProvisioningWorker
+from tests.store_api import build_store_api
+
+
+class _FailingHelm:
+    async def upgrade_install(self, **_kwargs) -> None:
+        raise RuntimeError("helm upgrade failed")
+
+
+class _RecordingHelm:
+    def __init__(self):
+        self.installs = []
+
+    async def release_status(self, _release_name, _namespace) -> str | None:
+        return "deployed"
+
+    async def upgrade_install(self, **kwargs) -> None:
+        self.installs.append(kwargs)
+
+
+class _ReadyReadiness:
+    async def wait_until_ready(self, **_kwargs) -> float:
+        return 0.0
+
+
+def _replenish(factory, size: int = 2) -> int:
+    with factory() as db:
+        return replenish_warm_pool(db, size, max_attempts=1, notify_channel="provisioning_jobs")
+
+
+def _warm_up(factory) -> None:
+    with factory() as db:
+        db.execute(update(Store).values(status=StoreStatus.WARM, url="http://warm"))
+        db.execute(update(ProvisioningJob).values(status=JobStatus.SUCCEEDED))
+        db.commit()
+
+
+def test_pool_is_topped_up_to_size_once(tmp_path):
+    _client, factory = build_store_api(tmp_path)
+
+    assert _replenish(factory) == 2
+    assert _replenish(factory) == 0
+    _warm_up(factory)
+    assert _replenish(factory, size=3) == 1
+
+    with factory() as db:
+        statuses = sorted(db.scalars(select(Store.status)).all())
+        jobs = db.scalars(select(ProvisioningJob)).all()
+    assert statuses == [StoreStatus.WARM, StoreStatus.WARM, StoreStatus.WARMING]
+    assert len(jobs) == 3 and {job.action for job in jobs} == {JobAction.PROVISION}
+
+
+def test_create_claims_a_warm_store_and_falls_back_to_cold_provisioning(tmp_path, monkeypatch):
+    client, factory = build_store_api(tmp_path)
+    monkeypatch.setattr(stores_api.settings, "warm_pool_size", 1)
+    _replenish(factory, size=1)
+    _warm_up(factory)
+    assert client.get("/stores").json()["total"] == 0
+
+    claimed = client.post("/stores", json={"engine": "woocommerce", "display_name": "Claimed"}).json()
+    cold = client.post("/stores", json={"engine": "woocommerce", "display_name": "Cold"}).json()
+
+    assert claimed["status"] == "READY" and claimed["queued_job_id"]
+    assert cold["status"] == "QUEUED" and cold["queued_job_id"]
+    listing = client.get("/stores").json()
+    assert {item["display_name"]: item["status"] for item in listing["items"]} == {"Claimed": "READY", "Cold": "QUEUED"}
+    events = client.get(f"/stores/{claimed['store_id']}").json()["events"]
+    assert "claimed" in [event["event_type"] for event in events]
+
+
+def test_pool_store_that_fails_to_install_is_torn_down(tmp_path, monkeypatch):
+    _client, factory = build_store_api(tmp_path)
+    monkeypatch.setattr("app.workers.provisioner.SessionLocal", factory)
+    _replenish(factory, size=1)
+    worker = ProvisioningWorker(Settings(worker_id="worker-test", worker_listen_enabled=False))
+    worker.helm = _FailingHelm()
+
+    [job_id] = worker._lease_jobs(1)
+    asyncio.run(worker._process_job(job_id))
+
+    with factory() as db:
+        store = db.scalars(select(Store)).one()
+        jobs = {job.action: job.status for job in db.scalars(select(ProvisioningJob))}
+    assert store.status == StoreStatus.WARMING and store.engine == StoreEngine.WOOCOMMERCE
+    assert jobs == {JobAction.PROVISION: JobStatus.FAILED, JobAction.DELETE: JobStatus.QUEUED}
+
+
+def test_claimed_store_is_relabelled_by_an_upgrade_job(tmp_path, monkeypatch):
+    client, factory = build_store_api(tmp_path)
+    monkeypatch.setattr(stores_api.settings, "warm_pool_size", 1)
+    monkeypatch.setattr("app.workers.provisioner.SessionLocal", factory)
+    _replenish(factory, size=1)
+    _warm_up(factory)
+    claimed = client.post("/stores", json={"engine": "woocommerce", "display_name": "Claimed"}).json()
+    worker = ProvisioningWorker(Settings(worker_id="worker-test", worker_listen_enabled=False))
+    worker.helm = _RecordingHelm()
+    worker.readiness = _ReadyReadiness()
+
+    [job_id] = worker._lease_jobs(1)
+    assert str(job_id) == claimed["queued_job_id"]
+    asyncio.run(worker._process_job(job_id))
+
+    [install] = worker.helm.installs
+    assert install["atomic"] is True
+    assert install["values"]["wordpress"]["wordpressBlogName"] == "Claimed"
+    with factory() as db:
+        store = db.scalars(select(Store)).one()
+        job = db.get(ProvisioningJob, job_id)
+    assert job.action == JobAction.UPGRADE and job.status == JobStatus.SUCCEEDED
+    assert store.status == StoreStatus.READY
+
+
+def test_relabel_keeps_the_running_fleet_upgrade_already_applied_to_the_store(tmp_path, monkeypatch):
+    client, factory = build_store_api(tmp_path)
+    monkeypatch.setattr(stores_api.settings, "warm_pool_size", 1)
+    monkeypatch.setattr("app.workers.provisioner.SessionLocal", factory)
+    _replenish(factory, size=1)
+    _warm_up(factory)
+    with factory() as db:
+        start_fleet_upgrade(db, "0.2.0", {"wordpress": {"replicaCount": 2}}, 5, 0, 20)
+        db.commit()
+    with factory() as db:
+        advance_fleet_upgrades(db, max_attempts=1, notify_channel="provisioning_jobs")
+    _warm_up(factory)
+    client.post("/stores", json={"engine": "woocommerce", "display_name": "Claimed"})
+    worker = ProvisioningWorker(Settings(worker_id="worker-test", worker_listen_enabled=False))
+    worker.helm = _RecordingHelm()
+    worker.readiness = _ReadyReadiness()
+
+    [job_id] = worker._lease_jobs(1)
+    asyncio.run(worker._process_job(job_id))
+
+    [install] = worker.helm.installs
+    assert install["values"]["wordpress"]["replicaCount"] == 2
+    assert install["values"]["wordpress"]["wordpressBlogName"] == "Claimed"
@@ -0,0 +1,49 @@
+import asyncio
+import os
+
+from app.core.config import Settings
+from app.workers.provisioner import ProvisioningWorker, resolve_worker_id
+
+
+def test_explicit_worker_id_is_kept():
+    assert resolve_worker_id(Settings(worker_id="worker-local-1")) == "worker-local-1"
+
+
+def test_worker_id_is_derived_per_pod(monkeypatch):
+    monkeypatch.setenv("POD_NAME", "platform-worker-7d9f-abcde")
+    assert resolve_worker_id(Settings(worker_id="")) == f"platform-worker-7d9f-abcde-{os.getpid()}"
+
+
+def test_drain_stops_leasing_and_waits_for_in_flight_jobs():
+    worker = ProvisioningWorker(Settings(worker_listen_enabled=False))
+    finished = []
+
+    async def fake_job():
+        await asyncio.sleep(0.05)
+        finished.append(True)
+
+    async def scenario():
+        worker._running = True
+        worker._tasks = {"job-1": asyncio.create_task(fake_job())}
+        await worker.drain(timeout_seconds=5)
+
+    asyncio.run(scenario())
+
+    assert finished == [True]
+    assert worker._running is False
+
+
+def test_drain_cancels_and_requeues_jobs_after_timeout():
+    worker = ProvisioningWorker(Settings(worker_listen_enabled=False))
+    released = []
+    worker._release_leases = lambda job_ids: released.extend(job_ids)
+
+    async def scenario():
+        task = asyncio.create_task(asyncio.sleep(10))
+        worker._tasks = {"job-1": task}
+        await worker.drain(timeout_seconds=0.01)
+        assert task.cancelled()
+
+    asyncio.run(scenario())
+
+    assert released == ["job-1"]
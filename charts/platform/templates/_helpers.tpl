@@ -0,0 +1,23 @@
+{{- define "platform.backendEnv" -}}
+- name: DATABASE_URL
+  valueFrom:
+    secretKeyRef:
+      name: {{ .Values.backend.existingSecret | default (.Values.backend.secretName | default "platform-backend-secret") }}
+      key: {{ .Values.backend.secretKey | default "DATABASE_URL" }}
+- name: HELM_CHART_PATH
+  value: {{ .Values.backend.env.HELM_CHART_PATH | quote }}
+- name: LOCAL_DOMAIN
+  value: {{ .Values.backend.env.LOCAL_DOMAIN | quote }}
+- name: WORKER_MAX_CONCURRENCY
+  value: {{ .Values.backend.env.WORKER_MAX_CONCURRENCY | quote }}
+- name: STORE_INGRESS_CLASS
+  value: {{ .Values.backend.env.STORE_INGRESS_CLASS | quote }}
+- name: STORE_GUEST_CACHE_ENABLED
+  value: {{ .Values.backend.env.STORE_GUEST_CACHE_ENABLED | quote }}
+- name: STORE_GUEST_CACHE_TTL_SECONDS
+  value: {{ .Values.backend.env.STORE_GUEST_CACHE_TTL_SECONDS | quote }}
+- name: STORE_GUEST_CACHE_ZONE
+  value: {{ .Values.backend.env.STORE_GUEST_CACHE_ZONE | quote }}
+- name: WARM_POOL_SIZE
+  value: {{ .Values.backend.env.WARM_POOL_SIZE | default "0" | quote }}
+{{- end -}}
@@ -1,16 +1,21 @@
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useMemo, useRef, useState } from "react";
 
-import { api } from "@/api/client";
+import { api, storeEventsUrl } from "@/api/client";
 import { AdminCredentialsDialog } from "@/components/admin-credentials-dialog";
 import { CreateStoreDialog } from "@/components/create-store-dialog";
 import { StoreEventsPanel } from "@/components/store-events-panel";
 import { StoresTable } from "@/components/stores-table";
 import { Toast } from "@/components/ui/toast";
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
-import type { Store, StoreAdminCredentials, StoreDetail } from "@/types";
+import type { Store, StoreAdminCredentials, StoreDetail, StoreListPage, StoreStreamEvent } from "@/types";
 
 function App() {
   const [stores, setStores] = useState<Store[]>([]);
+  const [storeTotal, setStoreTotal] = useState(0);
+  const knownStoreIds = useRef(new Set<string>());
+  const syncCursor = useRef<string | null>(null);
+  // created_at of the oldest loaded store when the list holds only the first page; null when it holds every store.
+  const pageFloor = useRef<string | null>(null);
   const [loading, setLoading] = useState(false);
   const [selectedStore, setSelectedStore] = useState<StoreDetail | null>(null);
   const [credentialsOpen, setCredentialsOpen] = useState(false);
@@ -20,17 +25,27 @@ function App() {
 
   const counts = useMemo(() => {
     return {
-      total: stores.length,
+      total: storeTotal,
       ready: stores.filter((s) => s.status === "READY").length,
       failed: stores.filter((s) => s.status === "FAILED").length
     };
+  }, [stores, storeTotal]);
+
+  useEffect(() => {
+    knownStoreIds.current = new Set(stores.map((s) => s.id));
   }, [stores]);
 
+  const loadPage = (page: StoreListPage) => {
+    setStores(page.items);
+    setStoreTotal(page.total);
+    syncCursor.current = page.sync_cursor;
+    pageFloor.current = page.next_cursor && page.items.length ? page.items[page.items.length - 1].created_at : null;
+  };
+
   const refreshStores = async () => {
     setLoading(true);
     try {
-      const next = await api.listStores();
-      setStores(next);
+      loadPage(await api.listStores());
     } catch (error) {
       setToast({ title: "Refresh failed", message: String(error), type: "error" });
     } finally {
@@ -89,15 +104,75 @@ function App() {
 
   useEffect(() => {
     let cancelled = false;
+    let streaming = false;
     let delay = 2500;
+    let source: EventSource | null = null;
+
+    // Upserts one changed store; DELETED tombstones drop it, matching the list endpoint's default view. Changes to
+    // stores older than the loaded page are ignored: they are not new, and the total already counts them.
+    const applyStoreChange = (store: Store) => {
+      const beyondPage = pageFloor.current !== null && Date.parse(store.created_at) <= Date.parse(pageFloor.current);
+      if (store.status === "DELETED") {
+        if (knownStoreIds.current.delete(store.id)) {
+          setStores((prev) => prev.filter((s) => s.id !== store.id));
+          setStoreTotal((total) => total - 1);
+        }
+      } else if (knownStoreIds.current.has(store.id)) {
+        setStores((prev) => prev.map((s) => (s.id === store.id ? store : s)));
+      } else if (!beyondPage) {
+        knownStoreIds.current.add(store.id);
+        setStores((prev) => [store, ...prev]);
+        setStoreTotal((total) => total + 1);
+      }
+    };
+
+    const syncStores = async () => {
+      if (!syncCursor.current) {
+        const page = await api.listStores();
+        if (!cancelled) {
+          loadPage(page);
+        }
+        return;
+      }
+      let delta;
+      do {
+        delta = await api.syncStores(syncCursor.current);
+        if (cancelled) {
+          return;
+        }
+        delta.items.forEach(applyStoreChange);
+        syncCursor.current = delta.next_sync_cursor;
+      } while (delta.has_more);
+    };
+
+    if (typeof EventSource !== "undefined") {
+      // The browser reconnects on its own and resends Last-Event-ID, so the server backfills missed changes.
+      source = new EventSource(storeEventsUrl);
+      source.onopen = () => {
+        streaming = true;
+      };
+      source.onerror = () => {
+        streaming = false;
+      };
+      source.addEventListener("store", (message) => {
+        const { event, store } = JSON.parse((message as MessageEvent<string>).data) as StoreStreamEvent;
+        applyStoreChange(store);
+        setSelectedStore((prev) =>
+          prev?.id === store.id && !prev.events.some((e) => e.id === event.id)
+            ? { ...prev, ...store, events: [event, ...prev.events] }
+            : prev
+        );
+      });
+    }
 
     const poll = async () => {
       while (!cancelled) {
+        if (streaming) {
+          await new Promise((resolve) => setTimeout(resolve, delay));
+          continue;
+        }
         try {
-          const next = await api.listStores();
-          if (!cancelled) {
-            setStores(next);
-          }
+          await syncStores();
           delay = 2500;
         } catch {
           delay = Math.min(delay * 2, 15000);
@@ -110,6 +185,7 @@ function App() {
 
     return () => {
       cancelled = true;
+      source?.close();
     };
   }, []);
 
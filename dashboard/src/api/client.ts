@@ -1,16 +1,25 @@
-import type { Store, StoreAdminCredentials, StoreDetail } from "@/types";
+import type { StoreAdminCredentials, StoreDeltaPage, StoreDetail, StoreListPage } from "@/types";
 
 const API_BASE = import.meta.env.VITE_API_BASE_URL ?? "http://localhost:8000";
 
+// Last body and validator per GET path; a 304 reuses the body instead of re-downloading it.
+const etagCache = new Map<string, { etag: string; body: unknown }>();
+
 async function request<T>(path: string, init?: RequestInit): Promise<T> {
+  const cached = !init?.method || init.method === "GET" ? etagCache.get(path) : undefined;
   const response = await fetch(`${API_BASE}${path}`, {
+    ...init,
     headers: {
       "Content-Type": "application/json",
+      ...(cached ? { "If-None-Match": cached.etag } : {}),
       ...(init?.headers ?? {})
-    },
-    ...init
+    }
   });
 
+  if (response.status === 304 && cached) {
+    return cached.body as T;
+  }
+
   if (!response.ok) {
     const text = await response.text();
     throw new Error(text || `Request failed (${response.status})`);
@@ -20,11 +29,19 @@ async function request<T>(path: string, init?: RequestInit): Promise<T> {
     return undefined as T;
   }
 
-  return (await response.json()) as T;
+  const body = (await response.json()) as T;
+  const etag = response.headers.get("ETag");
+  if (etag && (!init?.method || init.method === "GET")) {
+    etagCache.set(path, { etag, body });
+  }
+  return body;
 }
 
+export const storeEventsUrl = `${API_BASE}/stores/events`;
+
 export const api = {
-  listStores: () => request<Store[]>("/stores"),
+  listStores: () => request<StoreListPage>("/stores?limit=200"),
+  syncStores: (since: string) => request<StoreDeltaPage>(`/stores?limit=200&since=${encodeURIComponent(since)}`),
   getStore: (storeId: string) => request<StoreDetail>(`/stores/${storeId}`),
   getStoreAdminCredentials: (storeId: string) =>
     request<StoreAdminCredentials>(`/stores/${storeId}/admin-credentials`),
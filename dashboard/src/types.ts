@@ -4,7 +4,9 @@ export type StoreStatus =
   | "READY"
   | "FAILED"
   | "DELETING"
-  | "DELETED";
+  | "DELETED"
+  | "WARMING"
+  | "WARM";
 
 export interface Store {
   id: string;
@@ -19,6 +21,20 @@ export interface Store {
   updated_at: string;
 }
 
+export interface StoreListPage {
+  items: Store[];
+  next_cursor: string | null;
+  total: number;
+  total_is_estimate: boolean;
+  sync_cursor: string;
+}
+
+export interface StoreDeltaPage {
+  items: Store[];
+  next_sync_cursor: string;
+  has_more: boolean;
+}
+
 export interface StoreEvent {
   id: number;
   event_type: string;
@@ -36,3 +52,8 @@ export interface StoreAdminCredentials {
   password: string;
   admin_url: string;
 }
+
+export interface StoreStreamEvent {
+  event: StoreEvent;
+  store: Store;
+}